@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -29,7 +29,9 @@ This script
 
 import os
 import re
+import threading
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import click
@@ -38,12 +40,34 @@ from aea.cli.utils.click_utils import PackagesSource, PyPiDependency
 from aea.configurations.constants import PACKAGES, PACKAGE_TYPE_TO_CONFIG_FILE
 from aea.configurations.data_types import Dependency
 from aea.helpers.logging import setup_logger
-from aea.helpers.yaml_utils import yaml_dump, yaml_dump_all, yaml_load, yaml_load_all
+from aea.helpers.yaml_utils import yaml_dump, yaml_dump_all, yaml_load
 from aea.package_manager.v1 import PackageManagerV1
 
 from autonomy.cli.helpers.ipfs_hash import load_configuration
 
 
+try:
+    from scripts.config_tokenizer import (
+        ConfigDocument,
+        PIPFILE_FORMAT,
+        PYPROJECT_FORMAT,
+        TOX_FORMAT,
+    )
+    from scripts.package_cache import CACHE_FILE, PackageConfigCache, read_config_file
+except ImportError:  # pragma: nocover  # run as a standalone script
+    from config_tokenizer import (  # type: ignore
+        ConfigDocument,
+        PIPFILE_FORMAT,
+        PYPROJECT_FORMAT,
+        TOX_FORMAT,
+    )
+    from package_cache import (  # type: ignore
+        CACHE_FILE,
+        PackageConfigCache,
+        read_config_file,
+    )
+
+
 BUMP_BRANCH = "chore/bump"
 PIPFILE = Path.cwd() / "Pipfile"
 PYPROJECT_TOML = Path.cwd() / "pyproject.toml"
@@ -96,9 +120,14 @@ DEPENDENCY_SPECS = {
     },
 }
 
+# number of threads fetching versions, each keeps a connection to a host alive
+MAX_WORKERS = 8
+
 _cache_file = Path.home() / ".aea" / ".gitcache"
-_version_cache = {}
+_version_cache: t.Dict[str, str] = {}
 _logger = setup_logger("bump")
+# sessions are not thread safe, each thread keeps its own connections alive
+_sessions = threading.local()
 
 
 def load_git_cache() -> None:
@@ -115,12 +144,20 @@ def dump_git_cache() -> None:
         yaml_dump(data=_version_cache, stream=stream)
 
 
+def get_session() -> requests.Session:
+    """Get the session of the current thread, created on first use."""
+    session = getattr(_sessions, "session", None)
+    if session is None:
+        session = _sessions.session = requests.Session()
+    return session
+
+
 def make_git_request(url: str) -> requests.Response:
-    """Make git request"""
+    """Make git request, over the connections of the current thread's session"""
     auth = os.environ.get("GITHUB_AUTH")
     if auth is None:
-        return requests.get(url=url)
-    return requests.get(url=url, headers={"Authorization": f"Bearer {auth}"})
+        return get_session().get(url=url)
+    return get_session().get(url=url, headers={"Authorization": f"Bearer {auth}"})
 
 
 def get_latest_tag(repo: str) -> str:
@@ -159,20 +196,38 @@ def get_dependency_version(repo: str, file: str) -> str:
     return f"=={version}"
 
 
-def get_dependencies() -> t.Dict:
-    """Get dependency->version mapping."""
-    dependencies = {}
-    for dependency, specs in DEPENDENCY_SPECS.items():
-        version = _version_cache.get(
-            dependency,
-            get_dependency_version(
-                repo=specs["repo"],
-                file=specs["file"],
-            ),
-        )
-        dependencies[dependency] = version
-    _version_cache.update(dependencies)
-    return dependencies
+def get_dependencies(workers: int = MAX_WORKERS) -> t.Dict:
+    """
+    Get dependency->version mapping.
+
+    Only the versions missing from the cache are fetched, concurrently, once
+    the latest tag of each of their repos has been fetched.
+
+    :param workers: number of threads fetching the versions.
+    :return: the version specifier of each dependency.
+    """
+    missing = {
+        dependency: specs
+        for dependency, specs in DEPENDENCY_SPECS.items()
+        if dependency not in _version_cache
+    }
+    if missing:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # the dependencies of a repo share its tag, fetch it only once
+            list(
+                executor.map(
+                    get_latest_tag,
+                    sorted({specs["repo"] for specs in missing.values()}),
+                )
+            )
+            versions = executor.map(
+                lambda specs: get_dependency_version(
+                    repo=specs["repo"], file=specs["file"]
+                ),
+                missing.values(),
+            )
+            _version_cache.update(zip(missing, versions))
+    return {dependency: _version_cache[dependency] for dependency in DEPENDENCY_SPECS}
 
 
 def bump_pipfile_or_pyproject(file: Path, dependencies: t.Dict[str, str]) -> None:
@@ -181,24 +236,23 @@ def bump_pipfile_or_pyproject(file: Path, dependencies: t.Dict[str, str]) -> Non
         return
 
     _logger.info(f"Updating {file.name}")
-    updated = ""
-    content = file.read_text(encoding="utf-8")
-    for line in content.split("\n"):
-        try:
-            spec = Dependency.from_pipfile_string(line)
-            update = dependencies.get(spec.name)
-            if update is None:
-                updated += line + "\n"
-                continue
-            spec = Dependency(
-                name=spec.name,
-                version=update,
-                extras=spec.extras,
-            )
-            updated += spec.to_pipfile_string() + "\n"
-        except ValueError:
-            updated += line + "\n"
-    file.write_text(updated[:-1], encoding="utf-8")
+    document = ConfigDocument.parse(
+        content=file.read_text(encoding="utf-8"),
+        file_format=PIPFILE_FORMAT if file.name == "Pipfile" else PYPROJECT_FORMAT,
+    )
+    replacements = []
+    for entry in document.entries:
+        update = dependencies.get(entry.name)
+        if update is None:
+            continue
+        spec = Dependency.from_pipfile_string(entry.text)
+        spec = Dependency(
+            name=spec.name,
+            version=update,
+            extras=spec.extras,
+        )
+        replacements.append((entry, spec.to_pipfile_string()))
+    file.write_text(document.patch(replacements=replacements), encoding="utf-8")
 
 
 def bump_tox(dependencies: t.Dict[str, str]) -> None:
@@ -207,29 +261,41 @@ def bump_tox(dependencies: t.Dict[str, str]) -> None:
         return
 
     _logger.info("Updating tox.ini")
-    updated = ""
-    content = TOX_INI.read_text(encoding="utf-8")
-    for line in content.split("\n"):
-        try:
-            spec = Dependency.from_string(line.lstrip().rstrip())
-            update = dependencies.get(spec.name)
-            if update is None:
-                updated += line + "\n"
-                continue
-            spec = Dependency(
-                name=spec.name,
-                version=update,
-                extras=spec.extras,
-            )
-            updated += "    " + spec.to_pip_string() + "\n"
-        except ValueError:
-            updated += line + "\n"
-    TOX_INI.write_text(updated[:-1], encoding="utf-8")
+    document = ConfigDocument.parse(
+        content=TOX_INI.read_text(encoding="utf-8"), file_format=TOX_FORMAT
+    )
+    replacements = []
+    for entry in document.entries:
+        update = dependencies.get(entry.name)
+        if update is None:
+            continue
+        spec = Dependency.from_string(entry.text)
+        spec = Dependency(
+            name=spec.name,
+            version=update,
+            extras=spec.extras,
+        )
+        replacements.append((entry, spec.to_pip_string()))
+    TOX_INI.write_text(document.patch(replacements=replacements), encoding="utf-8")
+
+
+def _is_up_to_date(
+    current: t.Dict[str, t.Dict], dependencies: t.Dict[str, str]
+) -> bool:
+    """Check whether the dependencies of a package config have the given versions."""
+    return all(
+        current[name].get("version", "") == dependencies.get(name, "")
+        for name in current
+        if name in dependencies
+    )
 
 
-def bump_packages(dependencies: t.Dict[str, str]) -> None:
+def bump_packages(
+    dependencies: t.Dict[str, str], config_cache: t.Optional[PackageConfigCache] = None
+) -> None:
     """Bump packages."""
     _logger.info("Updating packages")
+    config_cache = config_cache or PackageConfigCache(file=None)
     manager = PackageManagerV1.from_dir(Path(PACKAGES))
     for package_id in manager.dev_packages:
         path = (
@@ -238,8 +304,15 @@ def bump_packages(dependencies: t.Dict[str, str]) -> None:
             )
             / PACKAGE_TYPE_TO_CONFIG_FILE[package_id.package_type.value]
         )
-        with path.open("r", encoding="utf-8") as stream:
-            config, *extra = yaml_load_all(stream=stream)
+        # only the loaders validating configurations fill the cache, it is
+        # used here to skip reading the configs that are already up to date
+        entry = config_cache.get(path)
+        if entry is not None and _is_up_to_date(entry["dependencies"], dependencies):
+            continue
+
+        config, *extra = read_config_file(path)
+        if _is_up_to_date(config.get("dependencies") or {}, dependencies):
+            continue
 
         for name in config.get("dependencies", {}):
             update = dependencies.get(name)
@@ -249,6 +322,7 @@ def bump_packages(dependencies: t.Dict[str, str]) -> None:
 
         with path.open("w", encoding="utf-8") as stream:
             yaml_dump_all([config, *extra], stream=stream)
+        config_cache.invalidate(path)
 
 
 @click.command(name="bump")
@@ -293,7 +367,10 @@ def main(
     bump_pipfile_or_pyproject(PIPFILE, dependencies=dependencies)
     bump_pipfile_or_pyproject(PYPROJECT_TOML, dependencies=dependencies)
     bump_tox(dependencies=dependencies)
-    bump_packages(dependencies=dependencies)
+    bump_packages(
+        dependencies=dependencies,
+        config_cache=PackageConfigCache(file=None if no_cache else CACHE_FILE),
+    )
     dump_git_cache()
 
     if sync:
@@ -302,8 +379,8 @@ def main(
         )
         pm.sync(
             sources=[
-                f"{OPEN_AEA_REPO}:{_version_cache[OPEN_AEA_REPO]}",
-                f"{OPEN_AUTONOMY_REPO}:{_version_cache[OPEN_AUTONOMY_REPO]}",
+                f"{OPEN_AEA_REPO}:{get_latest_tag(OPEN_AEA_REPO)}",
+                f"{OPEN_AUTONOMY_REPO}:{get_latest_tag(OPEN_AUTONOMY_REPO)}",
                 *sources,
             ],
             update_packages=True,
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -29,18 +29,58 @@ It is assumed the script is run from the repository root.
 import itertools
 import logging
 import re
+import subprocess  # nosec
 import sys
+import time
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 from typing import OrderedDict as OrderedDictType
-from typing import Tuple, cast
+from typing import Set, Tuple, Union, cast
 
 import click
 import toml
-from aea.configurations.data_types import Dependency
-from aea.package_manager.base import load_configuration
+from aea.configurations.constants import PACKAGE_TYPE_TO_CONFIG_FILE
+from aea.configurations.data_types import Dependency, PackageType
 from aea.package_manager.v1 import PackageManagerV1
+from packaging.specifiers import SpecifierSet
+
+
+try:
+    from scripts.config_tokenizer import (
+        ConfigDocument,
+        PIPFILE_FORMAT,
+        PYPROJECT_FORMAT,
+        TOX_FORMAT,
+        apply_edits,
+    )
+    from scripts.file_watcher import FileWatcher
+    from scripts.lock_index import LockedPackage, normalize_name, read_lock
+    from scripts.package_cache import (
+        CACHE_FILE,
+        PackageConfigCache,
+        get_dependencies,
+        parse_config_file,
+    )
+    from scripts.report import Finding, REPORT_FORMATS, Report
+except ImportError:  # pragma: nocover  # run as a standalone script
+    from config_tokenizer import (  # type: ignore
+        ConfigDocument,
+        PIPFILE_FORMAT,
+        PYPROJECT_FORMAT,
+        TOX_FORMAT,
+        apply_edits,
+    )
+    from file_watcher import FileWatcher  # type: ignore
+    from lock_index import LockedPackage, normalize_name, read_lock  # type: ignore
+    from package_cache import (  # type: ignore
+        CACHE_FILE,
+        PackageConfigCache,
+        get_dependencies,
+        parse_config_file,
+    )
+    from report import Finding, REPORT_FORMATS, Report  # type: ignore
 
 
 ANY_SPECIFIER = "*"
@@ -71,23 +111,29 @@ class Pipfile:
 
     def __init__(
         self,
-        sources: List[str],
         packages: OrderedDictType[str, Dependency],
         dev_packages: OrderedDictType[str, Dependency],
         file: Path,
+        document: Optional[ConfigDocument] = None,
     ) -> None:
         """Initialize object."""
-        self.sources = sources
         self.packages = packages
         self.dev_packages = dev_packages
         self.file = file
+        self.document = document or ConfigDocument.parse(
+            content="", file_format=PIPFILE_FORMAT
+        )
+        self._loaded = {
+            "[packages]": OrderedDict(packages),
+            "[dev-packages]": OrderedDict(dev_packages),
+        }
 
     def __iter__(self) -> Iterator[Dependency]:
         """Iterate dependencies as from aea.configurations.data_types.Dependency object."""
         for name, dependency in itertools.chain(
             self.packages.items(), self.dev_packages.items()
         ):
-            if name.startswith("comment_") or name in self.ignore:
+            if name in self.ignore:
                 continue
             yield dependency
 
@@ -102,6 +148,14 @@ class Pipfile:
         else:
             self.dev_packages[dependency.name] = dependency
 
+    def get(self, name: str) -> Optional[Dependency]:
+        """Get the dependency specifier for a name."""
+        return self.packages.get(name, self.dev_packages.get(name))
+
+    def line(self, name: str) -> Optional[int]:
+        """Get the line number of the entry for a dependency."""
+        return self.document.line(name)
+
     def check(self, dependency: Dependency) -> Tuple[Optional[str], int]:
         """Check dependency specifier"""
         if dependency.name in self.ignore:
@@ -131,69 +185,49 @@ class Pipfile:
     @classmethod
     def parse(
         cls, content: str
-    ) -> Tuple[List[str], OrderedDictType[str, OrderedDictType[str, Dependency]]]:
+    ) -> Tuple[ConfigDocument, OrderedDictType[str, OrderedDictType[str, Dependency]]]:
         """Parse from string."""
-        sources = []
+        document = ConfigDocument.parse(content=content, file_format=PIPFILE_FORMAT)
         sections: OrderedDictType = OrderedDict()
-        lines = content.split("\n")
-        comments = 0
-        while len(lines) > 0:
-            line = lines.pop(0)
-            if "[[source]]" in line:
-                source = line + "\n"
-                while True:
-                    line = lines.pop(0)
-                    if line == "":
-                        break
-                    source += line + "\n"
-                sources.append(source)
-            if "[dev-packages]" in line or "[packages]" in line:
-                section = line
-                sections[section] = OrderedDict()
-                while len(lines) > 0:
-                    line = lines.pop(0).strip()
-                    if line == "":
-                        break
-                    if line.startswith("#"):
-                        sections[section][f"comment_{comments}"] = line
-                        comments += 1
-                    else:
-                        dep = Dependency.from_pipfile_string(line)
-                        sections[section][dep.name] = dep
-        return sources, sections
+        for entry in document.entries:
+            dep = Dependency.from_pipfile_string(entry.text)
+            sections.setdefault(entry.section, OrderedDict())[dep.name] = dep
+        return document, sections
 
     def compile(self) -> str:
         """Compile to Pipfile string."""
-        content = ""
-        for source in self.sources:
-            content += source + "\n"
-
-        content += "[packages]\n"
-        for package, dep in self.packages.items():
-            if package.startswith("comment"):
-                content += str(dep) + "\n"
-            else:
-                content += dep.to_pipfile_string() + "\n"
+        sections = {
+            "[packages]": self.packages,
+            "[dev-packages]": self.dev_packages,
+        }
+        replacements = []
+        for entry in self.document.entries:
+            dep = sections[entry.section].get(entry.name)
+            if dep is None or dep == self._loaded[entry.section].get(entry.name):
+                continue
+            replacements.append((entry, dep.to_pipfile_string()))
 
-        content += "\n[dev-packages]\n"
-        for package, dep in self.dev_packages.items():
-            if package.startswith("comment"):
-                content += str(dep) + "\n"
-            else:
-                content += dep.to_pipfile_string() + "\n"
-        return content
+        insertions = {
+            section: [
+                dep.to_pipfile_string()
+                for name, dep in packages.items()
+                if name not in self._loaded[section]
+            ]
+            for section, packages in sections.items()
+        }
+        return self.document.patch(replacements=replacements, insertions=insertions)
 
     @classmethod
     def load(cls, file: Path) -> "Pipfile":
         """Load from file."""
-        sources, sections = cls.parse(
+        document, sections = cls.parse(
             content=file.read_text(encoding="utf-8"),
         )
         return cls(
-            sources=sources,
             packages=sections.get("[packages]", OrderedDict()),
             dev_packages=sections.get("[dev-packages]", OrderedDict()),
             file=file,
+            document=document,
         )
 
     def dump(self) -> None:
@@ -214,10 +248,12 @@ class ToxFile:
         self,
         dependencies: Dict[str, Dict[str, Any]],
         file: Path,
+        document: Optional[ConfigDocument] = None,
     ) -> None:
         """Initialize object."""
         self.dependencies = dependencies
         self.file = file
+        self.document = document
         self.extra: Dict[str, Dependency] = {}
 
     def __iter__(self) -> Iterator[Dependency]:
@@ -236,6 +272,14 @@ class ToxFile:
             return
         self.extra[dependency.name] = dependency
 
+    def get(self, name: str) -> Optional[Dependency]:
+        """Get the dependency specifier for a name."""
+        return self.dependencies.get(name, {}).get("dep")
+
+    def line(self, name: str) -> Optional[int]:
+        """Get the line number of the entry for a dependency."""
+        return None if self.document is None else self.document.line(name)
+
     def check(self, dependency: Dependency) -> Tuple[Optional[str], int]:
         """Check dependency specifier"""
         if dependency.name in self.skip:
@@ -255,76 +299,71 @@ class ToxFile:
         return f"{dependency.name} not found in tox.ini", logging.ERROR
 
     @classmethod
-    def parse(cls, content: str) -> Dict[str, Dict[str, Any]]:
+    def parse(cls, content: str) -> Tuple[ConfigDocument, Dict[str, Dict[str, Any]]]:
         """Parse file content."""
-        deps = {}
-        lines = content.split("\n")
-        while len(lines) > 0:
-            line = lines.pop(0)
-            if line.startswith("deps"):
-                while True:
-                    line = lines.pop(0)
-                    if not line.startswith("    "):
-                        break
-                    if (
-                        line.startswith("    {")
-                        or line.startswith("    ;")
-                        or line.strip() == ""
-                    ):
-                        continue
-                    dep = Dependency.from_string(line.lstrip())
-                    deps[dep.name] = {
-                        "original": line,
-                        "dep": dep,
-                    }
-        return deps
+        document = ConfigDocument.parse(content=content, file_format=TOX_FORMAT)
+        deps: Dict[str, Dict[str, Any]] = {}
+        for entry in document.entries:
+            dep = Dependency.from_string(entry.text)
+            # the last line defines the dependency, with every identical line
+            entries = deps.get(dep.name, {}).get("entries", [])
+            if entries and entries[0].text != entry.text:
+                entries = []
+            deps[dep.name] = {"dep": dep, "entries": [*entries, entry]}
+        return document, deps
 
     @classmethod
     def load(cls, file: Path) -> "ToxFile":
         """Load tox.ini file."""
         content = file.read_text(encoding="utf-8")
-        dependencies = cls.parse(content=content)
+        document, dependencies = cls.parse(content=content)
         return cls(
             dependencies=dependencies,
             file=file,
+            document=document,
         )
 
-    def _include_extra(self, content: str) -> str:
-        """Include extra dependencies."""
-        lines = content.split("\n")
-        extra = []
-        for dep in self.extra.values():
-            extra.append(f"    {dep.get_pip_install_args()[0]}")
-
-        if "[extra-deps]" in lines:
-            start_idx = lines.index("[extra-deps]") + 2
-            end_idx = lines.index("; end-extra")
-            extra = list(sorted(set(extra + lines[start_idx:end_idx])))
-            lines = lines[:start_idx] + extra + lines[end_idx:]
-        else:
-            idx = lines.index("[testenv]")
-            lines = [
-                *lines[:idx],
-                "[extra-deps]",
-                "deps = ",
-                *list(sorted(extra)),
-                "; end-extra\n",
-                *lines[idx:],
-            ]
-
-        return "\n".join(lines)
+    def _extra_deps_edit(
+        self, document: ConfigDocument, edits: List[Tuple[int, int, str]]
+    ) -> Tuple[int, int, str]:
+        """Get the edit including the extra dependencies in the `[extra-deps]` block."""
+        extra = [f"    {dep.get_pip_install_args()[0]}" for dep in self.extra.values()]
+
+        if "[extra-deps]" not in document.sections:
+            position = document.headers.get("[testenv]", len(document.content))
+            block = "".join(f"{line}\n" for line in sorted(extra))
+            return position, position, f"[extra-deps]\ndeps = \n{block}; end-extra\n\n"
+
+        # merge with the existing block, taking the edits that fall inside it
+        start, end = document.sections["[extra-deps]"]
+        inner = [edit for edit in edits if start <= edit[0] < end]
+        for edit in inner:
+            edits.remove(edit)
+        existing = apply_edits(
+            document.content[start:end],
+            ((s - start, e - start, text) for s, e, text in inner),
+        ).splitlines()
+        block = "".join(f"{line}\n" for line in sorted(set(extra + existing)))
+        return start, end, block
 
     def write(self) -> None:
         """Dump config."""
-        content = self.file.read_text(encoding="utf-8")
+        document = self.document or ConfigDocument.parse(
+            content=self.file.read_text(encoding="utf-8"), file_format=TOX_FORMAT
+        )
+        edits = []
         for obj in self.dependencies.values():
-            replace = "    " + cast(Dependency, obj["dep"]).get_pip_install_args()[0]
-            content = re.sub(obj["original"], replace, content)
+            replace = cast(Dependency, obj["dep"]).get_pip_install_args()[0]
+            edits += [
+                (entry.start, entry.end, replace)
+                for entry in obj.get("entries", [])
+                if entry.text != replace
+            ]
 
         if len(self.extra) > 0:
-            content = self._include_extra(content=content)
+            edits.append(self._extra_deps_edit(document=document, edits=edits))
 
-        self.file.write_text(content, encoding="utf-8")
+        self.file.write_text(apply_edits(document.content, edits), encoding="utf-8")
 
 
 class PyProjectToml:
@@ -339,11 +378,14 @@ class PyProjectToml:
         dependencies: OrderedDictType[str, Dependency],
         config: Dict[str, Dict],
         file: Path,
+        document: Optional[ConfigDocument] = None,
     ) -> None:
         """Initialize object."""
         self.dependencies = dependencies
         self.config = config
         self.file = file
+        self.document = document
+        self._loaded = OrderedDict(dependencies)
 
     def __iter__(self) -> Iterator[Dependency]:
         """Iterate dependencies as from aea.configurations.data_types.Dependency object."""
@@ -359,6 +401,14 @@ class PyProjectToml:
             return
         self.dependencies[dependency.name] = dependency
 
+    def get(self, name: str) -> Optional[Dependency]:
+        """Get the dependency specifier for a name."""
+        return self.dependencies.get(name)
+
+    def line(self, name: str) -> Optional[int]:
+        """Get the line number of the entry for a dependency."""
+        return None if self.document is None else self.document.line(name)
+
     def check(self, dependency: Dependency) -> Tuple[Optional[str], int]:
         """Check dependency specifier"""
         if dependency.name in self.ignore:
@@ -379,7 +429,8 @@ class PyProjectToml:
     @classmethod
     def load(cls, pyproject_path: Path) -> Optional["PyProjectToml"]:
         """Load pyproject.yaml dependencies"""
-        config = toml.load(pyproject_path)
+        content = pyproject_path.read_text(encoding="utf-8")
+        config = toml.loads(content)
         dependencies = OrderedDict()
         try:
             config["tool"]["poetry"]["dependencies"]
@@ -408,53 +459,373 @@ class PyProjectToml:
             dependencies=dependencies,
             config=config,
             file=pyproject_path,
+            document=ConfigDocument.parse(
+                content=content, file_format=PYPROJECT_FORMAT
+            ),
         )
 
     def dump(self) -> None:
         """Dump to file."""
-        update = ""
-        content = self.file.read_text(encoding="utf-8")
-        for line in content.split("\n"):
-            if " = " not in line:
-                update += f"{line}\n"
+        document = ConfigDocument.parse(
+            content=self.file.read_text(encoding="utf-8"), file_format=PYPROJECT_FORMAT
+        )
+        replacements = []
+        for entry in document.entries:
+            if entry.section != "[tool.poetry.dependencies]":
                 continue
-            package, *_ = line.split(" = ")
-            dep = self.dependencies.get(package)
-            if dep is None:
-                update += f"{line}\n"
+            dep = self.dependencies.get(entry.name)
+            if dep is None or dep == self._loaded.get(entry.name):
                 continue
-            update += f"{dep.to_pipfile_string()}\n"
-        self.file.write_text(update[:-1], encoding="utf-8")
+            replacements.append((entry, dep.to_pipfile_string()))
+        self.file.write_text(
+            document.patch(replacements=replacements), encoding="utf-8"
+        )
 
 
-def load_packages_dependencies(packages_dir: Path) -> List[Dependency]:
-    """Returns a list of package dependencies."""
-    package_manager = PackageManagerV1.from_dir(packages_dir=packages_dir)
-    dependencies: Dict[str, Dependency] = {}
-    for package in package_manager.iter_dependency_tree():
-        if package.package_type.value == "service":
-            continue
-        _dependencies = load_configuration(  # type: ignore
-            package_type=package.package_type,
-            package_path=package_manager.package_path_from_package_id(
-                package_id=package
-            ),
-        ).dependencies
-        for key, value in _dependencies.items():
-            if key not in dependencies:
-                dependencies[key] = value
-            else:
-                if value.version == "":
-                    continue
-                if dependencies[key].version == "":
-                    dependencies[key] = value
-                if value == dependencies[key]:
+class PoetryLock:
+    """Class to represent poetry.lock file."""
+
+    def __init__(self, packages: Dict[str, LockedPackage], file: Path) -> None:
+        """Initialize object."""
+        self.packages = packages
+        self.file = file
+
+    def __contains__(self, name: str) -> bool:
+        """Check whether a dependency is locked."""
+        return normalize_name(name) in self.packages
+
+    def get(self, name: str) -> Optional[Dependency]:
+        """Get the locked version of a dependency."""
+        locked = self.packages.get(normalize_name(name))
+        if locked is None:
+            return None
+        return Dependency(name=locked.name, version=f"=={locked.version}")
+
+    def line(self, name: str) -> Optional[int]:
+        """Get the line number of the `[[package]]` table of a dependency."""
+        locked = self.packages.get(normalize_name(name))
+        return None if locked is None else locked.line
+
+    def check(self, dependency: Dependency) -> Tuple[Optional[str], int]:
+        """Check that the locked version satisfies a dependency specifier"""
+        if dependency.version == "" or dependency.git is not None:
+            return None, 0
+
+        locked = self.packages.get(normalize_name(dependency.name))
+        if locked is None:
+            return f"{dependency.name} not found in poetry.lock", logging.WARNING
+
+        if not SpecifierSet(dependency.version).contains(
+            locked.version, prereleases=True
+        ):
+            return (
+                f"in poetry.lock {locked.name}=={locked.version}; "
+                f"got {dependency.get_pip_install_args()[0]}"
+            ), logging.ERROR
+
+        return None, 0
+
+    @classmethod
+    def load(cls, file: Path) -> "PoetryLock":
+        """Load poetry.lock file."""
+        return cls(packages=read_lock(file), file=file)
+
+
+class ConfigPaths:  # pylint: disable=too-few-public-methods
+    """Paths to the dependency config files of a repository."""
+
+    def __init__(self, tox: Path, pipfile: Path, pyproject: Path, lock: Path) -> None:
+        """
+        Initialize object.
+
+        :param tox: path to the tox.ini file.
+        :param pipfile: path to the Pipfile, it may not exist.
+        :param pyproject: path to the pyproject.toml file, it may not exist.
+        :param lock: path to the poetry.lock file, it may not exist.
+        """
+        self.tox = tox
+        self.pipfile = pipfile
+        self.pyproject = pyproject
+        self.lock = lock
+
+    @classmethod
+    def at(cls, root: Path) -> "ConfigPaths":
+        """Get the paths to the config files at the root of a repository."""
+        return cls(
+            tox=root / "tox.ini",
+            pipfile=root / "Pipfile",
+            pyproject=root / "pyproject.toml",
+            lock=root / "poetry.lock",
+        )
+
+
+class DependencyIndex:
+    """Index of the PyPI dependencies required by each package."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.requirements: Dict[str, List[Tuple[str, Dependency]]] = {}
+
+    def add(self, package_id: str, dependencies: Dict[str, Dependency]) -> None:
+        """Add the dependencies required by a package."""
+        for name, dependency in dependencies.items():
+            self.requirements.setdefault(name, []).append((package_id, dependency))
+
+    @staticmethod
+    def _specifier(dependency: Dependency) -> str:
+        """Get a key identifying a dependency specifier."""
+        return " ".join(dependency.get_pip_install_args())
+
+    def dependencies(self) -> List[Dependency]:
+        """
+        Get the resolved dependencies.
+
+        For each dependency the first specifier with a version is used, or the
+        first specifier if none of the packages pins a version.
+
+        :return: the resolved dependencies, in the order they were first seen.
+        """
+        resolved = []
+        for requirements in self.requirements.values():
+            _, dependency = next(
+                (
+                    requirement
+                    for requirement in requirements
+                    if requirement[1].version != ""
+                ),
+                requirements[0],
+            )
+            resolved.append(dependency)
+        return resolved
+
+    def conflicts(self) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Get the dependencies required with different specifiers.
+
+        Packages that do not pin a version are compatible with any specifier and
+        never take part in a conflict.
+
+        :return: mapping of dependency name to the packages requiring each specifier.
+        """
+        conflicts = {}
+        for name in sorted(self.requirements):
+            specifiers: Dict[str, List[str]] = {}
+            for package_id, dependency in self.requirements[name]:
+                if dependency.version == "" and dependency.git is None:
                     continue
-                print(
-                    f"Non-matching dependency versions for {key}: {value} vs {dependencies[key]}"
+                specifiers.setdefault(self._specifier(dependency), []).append(
+                    package_id
                 )
+            if len(specifiers) > 1:
+                conflicts[name] = {
+                    specifier: sorted(package_ids)
+                    for specifier, package_ids in specifiers.items()
+                }
+        return conflicts
+
+    def report(self) -> List[str]:
+        """Get a message for each conflicting dependency."""
+        return [
+            f"Non-matching dependency versions for {name}:"
+            + "".join(
+                f"\n\t{specifier} required by {', '.join(package_ids)}"
+                for specifier, package_ids in specifiers.items()
+            )
+            for name, specifiers in self.conflicts().items()
+        ]
+
+
+def get_changed_packages(packages_dir: Path, since: str) -> Set[str]:
+    """
+    Get the packages with files changed since a git reference.
+
+    :param packages_dir: path to the packages directory.
+    :param since: the git reference to compare the working tree against.
+    :return: the changed packages, as `author/type/name` paths.
+    """
+    changed = subprocess.run(  # nosec
+        ["git", "diff", "--name-only", "--relative", since, "--", "."],
+        cwd=packages_dir,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.splitlines()
+    changed += subprocess.run(  # nosec
+        ["git", "ls-files", "--others", "--exclude-standard"],
+        cwd=packages_dir,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.splitlines()
+    return {
+        "/".join(Path(file).parts[:3]) for file in changed if len(Path(file).parts) > 3
+    }
+
+
+def _files_changed(since: str, files: List[Path]) -> bool:
+    """Check whether any of the given files changed since a git reference."""
+    return (
+        subprocess.run(  # nosec
+            ["git", "diff", "--quiet", since, "--", *map(str, files)],
+            check=False,
+        ).returncode
+        != 0
+    )
+
+
+def get_affected_packages(entries: List[Dict], changed: Set[str]) -> Set[str]:
+    """
+    Get the packages whose effective dependencies may be affected by a change.
+
+    These are the changed packages and, walking the reverse dependency graph,
+    every package that depends on one of them directly or transitively.
+
+    :param entries: config cache entries of all the packages in the tree.
+    :param changed: the changed packages, as `author/type/name` paths.
+    :return: the ids of the affected packages.
+    """
+
+    def _key(package_id: str) -> str:
+        """Strip the version from a package id."""
+        return package_id.rsplit("/", 1)[0]
 
-    return list(dependencies.values())
+    dependents: Dict[str, List[str]] = {}
+    to_visit = []
+    for entry in entries:
+        package_id = _key(entry["package_id"])
+        for dependency in entry["package_dependencies"]:
+            dependents.setdefault(_key(dependency), []).append(package_id)
+        package_type, author, name = package_id.split("/")
+        if f"{author}/{package_type}s/{name}" in changed:
+            to_visit.append(package_id)
+
+    affected = set(to_visit)
+    while to_visit:
+        for dependent in dependents.get(to_visit.pop(), []):
+            if dependent not in affected:
+                affected.add(dependent)
+                to_visit.append(dependent)
+    return affected
+
+
+def _get_packages(packages_dir: Path) -> List[Tuple[PackageType, Path]]:
+    """Get the type and path of the packages to check, in dependency tree order."""
+    package_manager = PackageManagerV1.from_dir(packages_dir=packages_dir)
+    return [
+        (
+            package.package_type,
+            package_manager.package_path_from_package_id(package_id=package),
+        )
+        for package in package_manager.iter_dependency_tree()
+        if package.package_type.value != "service"
+    ]
+
+
+def _load_entries(
+    packages: List[Tuple[PackageType, Path]],
+    workers: int,
+    cache: PackageConfigCache,
+) -> List[Dict]:
+    """
+    Load config cache entries for packages.
+
+    Configurations missing from the cache are loaded once per distinct content,
+    so packages vendored in several places are only parsed once.
+
+    :param packages: the type and path of each package.
+    :param workers: number of processes used to load the package configurations.
+    :param cache: config cache to read parsed configurations from.
+    :return: the entries, in the same order as the packages.
+    """
+    config_files = [
+        package_path / PACKAGE_TYPE_TO_CONFIG_FILE[package_type.value]
+        for package_type, package_path in packages
+    ]
+    entries = [cache.get(config_file) for config_file in config_files]
+    missing: Dict[str, List[int]] = {}
+    for i, entry in enumerate(entries):
+        if entry is None:
+            missing.setdefault(cache.digest(config_files[i]), []).append(i)
+    to_load = [config_files[indexes[0]] for indexes in missing.values()]
+
+    if workers <= 1 or len(to_load) <= 1:
+        loaded: Iterable[Dict] = map(parse_config_file, to_load)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            loaded = list(executor.map(parse_config_file, to_load))
+
+    for indexes, entry in zip(missing.values(), loaded):
+        for i in indexes:
+            cache.set(config_files[i], entry)
+            entries[i] = entry
+    cache.dump()
+    return cast(List[Dict], entries)
+
+
+def _index_entries(entries: List[Dict]) -> DependencyIndex:
+    """Index the dependencies of config cache entries."""
+    # entries are indexed in dependency tree order whichever way they were
+    # loaded, so the index does not depend on the number of workers
+    index = DependencyIndex()
+    for entry in entries:
+        index.add(entry["package_id"], get_dependencies(entry))
+    return index
+
+
+def load_dependency_index(
+    packages_dir: Path,
+    workers: int = 1,
+    cache: Optional[PackageConfigCache] = None,
+    since: Optional[str] = None,
+) -> DependencyIndex:
+    """
+    Returns an index of package dependencies.
+
+    :param packages_dir: path to the packages directory.
+    :param workers: number of processes used to load the package configurations.
+    :param cache: config cache to read parsed configurations from.
+    :param since: only index dependencies of packages affected by changes since this git reference.
+    :return: the dependency index.
+    """
+    entries = _load_entries(
+        packages=_get_packages(packages_dir=packages_dir),
+        workers=workers,
+        cache=cache or PackageConfigCache(file=None),
+    )
+
+    if since is not None:
+        affected = get_affected_packages(
+            entries=entries,
+            changed=get_changed_packages(packages_dir=packages_dir, since=since),
+        )
+        entries = [
+            entry
+            for entry in entries
+            if entry["package_id"].rsplit("/", 1)[0] in affected
+        ]
+        print(f"Checking {len(entries)} package(s) affected by changes since {since}")
+
+    return _index_entries(entries)
+
+
+def load_packages_dependencies(
+    packages_dir: Path,
+    workers: int = 1,
+    cache: Optional[PackageConfigCache] = None,
+    since: Optional[str] = None,
+) -> List[Dependency]:
+    """
+    Returns a list of package dependencies.
+
+    :param packages_dir: path to the packages directory.
+    :param workers: number of processes used to load the package configurations.
+    :param cache: config cache to read parsed configurations from.
+    :param since: only return dependencies of packages affected by changes since this git reference.
+    :return: the resolved list of dependencies.
+    """
+    return load_dependency_index(
+        packages_dir=packages_dir, workers=workers, cache=cache, since=since
+    ).dependencies()
 
 
 def _update(
@@ -462,9 +833,13 @@ def _update(
     tox: ToxFile,
     pipfile: Optional[Pipfile] = None,
     pyproject: Optional[PyProjectToml] = None,
+    conflicts: Optional[List[str]] = None,
 ) -> None:
     """Update dependencies."""
 
+    for conflict in conflicts or []:
+        logging.warning(conflict)
+
     if pipfile is not None:
         for dependency in packages_dependencies:
             pipfile.update(dependency=dependency)
@@ -492,66 +867,124 @@ def _update(
     tox.write()
 
 
-def _check(
+def _compare(  # pylint: disable=too-many-arguments
     packages_dependencies: List[Dependency],
     tox: ToxFile,
     pipfile: Optional[Pipfile] = None,
     pyproject: Optional[PyProjectToml] = None,
-) -> None:
-    """Update dependencies."""
+    conflicts: Optional[List[str]] = None,
+    packages_dir: Optional[Path] = None,
+    lock: Optional[PoetryLock] = None,
+) -> Iterator[Tuple[str, List[Finding]]]:
+    """Compare dependencies, yielding the issues found at each stage."""
+
+    def _issues(
+        dependencies: Iterable[Dependency],
+        config: Union[Pipfile, PyProjectToml, ToxFile, PoetryLock],
+    ) -> List[Finding]:
+        """Check dependencies against a config."""
+        findings = []
+        for dependency in dependencies:
+            error, level = config.check(dependency)
+            if error is None:
+                continue
+            expected = config.get(dependency.name)
+            findings.append(
+                Finding(
+                    message=error,
+                    level=level,
+                    file=config.file,
+                    line=config.line(dependency.name),
+                    expected=(
+                        None if expected is None else expected.get_pip_install_args()[0]
+                    ),
+                    actual=dependency.get_pip_install_args()[0],
+                )
+            )
+        return findings
 
-    fail_check = 0
+    if conflicts:
+        yield "Comparing dependencies across packages", [
+            Finding(message=conflict, level=logging.WARNING, file=packages_dir)
+            for conflict in conflicts
+        ]
 
     if pipfile is not None:
-        print("Comparing dependencies from Pipfile and packages")
-        for dependency in packages_dependencies:
-            error, level = pipfile.check(dependency=dependency)
-            if error is not None:
-                logging.log(level=level, msg=error)
-                fail_check = level or fail_check
+        yield "Comparing dependencies from Pipfile and packages", _issues(
+            packages_dependencies, pipfile
+        )
+        yield "Comparing dependencies from tox and Pipfile", _issues(pipfile, tox)
+        yield "Comparing dependencies from Pipfile and tox", _issues(tox, pipfile)
 
-        print("Comparing dependencies from tox and Pipfile")
-        for dependency in pipfile:
-            error, level = tox.check(dependency=dependency)
-            if error is not None:
-                logging.log(level=level, msg=error)
-                fail_check = level or fail_check
+    if pyproject is not None:
+        yield "Comparing dependencies from pyproject.toml and packages", _issues(
+            packages_dependencies, pyproject
+        )
+        yield "Comparing dependencies from pyproject.toml and tox", _issues(
+            pyproject, tox
+        )
+        yield "Comparing dependencies from tox and pyproject.toml", _issues(
+            tox, pyproject
+        )
 
-        print("Comparing dependencies from Pipfile and tox")
-        for dependency in tox:
-            error, level = pipfile.check(dependency=dependency)
-            if error is not None:
-                logging.log(level=level, msg=error)
-                fail_check = level or fail_check
+    yield "Comparing dependencies from tox and packages", _issues(
+        packages_dependencies, tox
+    )
 
-    if pyproject is not None:
-        print("Comparing dependencies from pyproject.toml and packages")
-        for dependency in packages_dependencies:
-            error, level = pyproject.check(dependency=dependency)
-            if error is not None:
-                logging.log(level=level, msg=error)
-                fail_check = level or fail_check
+    if lock is not None:
+        yield "Comparing dependencies from poetry.lock and packages", _issues(
+            packages_dependencies, lock
+        )
+        # tox environments also install tools which are not locked
+        yield "Comparing dependencies from poetry.lock and tox", _issues(
+            (dependency for dependency in tox if dependency.name in lock), lock
+        )
 
-        print("Comparing dependencies from pyproject.toml and tox")
-        for dependency in pyproject:
-            error, level = tox.check(dependency=dependency)
-            if error is not None:
-                logging.log(level=level, msg=error)
-                fail_check = level or fail_check
 
-        print("Comparing dependencies from tox and pyproject.toml")
-        for dependency in tox:
-            error, level = pyproject.check(dependency=dependency)
-            if error is not None:
-                logging.log(level=level, msg=error)
-                fail_check = level or fail_check
-
-    print("Comparing dependencies from tox and packages")
-    for dependency in packages_dependencies:
-        error, level = tox.check(dependency=dependency)
-        if error is not None:
-            logging.log(level=level, msg=error)
-            fail_check = level or fail_check
+def _log_stages(
+    stages: Iterable[Tuple[str, List[Finding]]], report: Optional[Report] = None
+) -> int:
+    """Log the findings of each comparison stage, returning the level to exit with."""
+    fail_check = 0
+    for stage, findings in stages:
+        print(stage)
+        for finding in findings:
+            logging.log(level=finding.level, msg=finding.message)
+            if report is not None:
+                report.add(finding)
+            # a later warning must not hide an earlier error
+            fail_check = max(fail_check, finding.level)
+    return fail_check
+
+
+def _check(  # pylint: disable=too-many-arguments
+    packages_dependencies: List[Dependency],
+    tox: ToxFile,
+    pipfile: Optional[Pipfile] = None,
+    pyproject: Optional[PyProjectToml] = None,
+    conflicts: Optional[List[str]] = None,
+    packages_dir: Optional[Path] = None,
+    report: Optional[Report] = None,
+    lock: Optional[PoetryLock] = None,
+) -> None:
+    """Update dependencies."""
+
+    report = report or Report(check="dependencies")
+
+    with report.phase("scan"):
+        stages = list(
+            _compare(
+                packages_dependencies=packages_dependencies,
+                tox=tox,
+                pipfile=pipfile,
+                pyproject=pyproject,
+                conflicts=conflicts,
+                packages_dir=packages_dir,
+                lock=lock,
+            )
+        )
+
+    fail_check = _log_stages(stages, report=report)
 
     if fail_check == logging.ERROR:
         print("Dependencies check failed")
@@ -564,6 +997,321 @@ def _check(
     print("No issues found")
 
 
+def read_manifest(manifest: Path) -> List[Path]:
+    """
+    Read repository roots from a manifest file.
+
+    The manifest lists one repository root per line, relative paths are
+    resolved against the directory of the manifest. Blank lines and lines
+    starting with `#` are ignored.
+
+    :param manifest: path to the manifest file.
+    :return: the repository roots.
+    """
+    roots = []
+    for line in manifest.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line == "" or line.startswith("#"):
+            continue
+        roots.append(manifest.parent / line)
+    return roots
+
+
+def _load_configs(paths: ConfigPaths, lock: bool = True) -> Dict[str, Any]:
+    """
+    Load the dependency config files of a repository.
+
+    :param paths: paths to the config files, only tox.ini has to exist.
+    :param lock: whether to load the poetry.lock file.
+    :return: the configs, keyed by the name of the `_compare` argument they are passed as.
+    """
+    return {
+        "tox": ToxFile.load(paths.tox),
+        "pipfile": Pipfile.load(paths.pipfile) if paths.pipfile.exists() else None,
+        "pyproject": (
+            PyProjectToml.load(paths.pyproject) if paths.pyproject.exists() else None
+        ),
+        "lock": (PoetryLock.load(paths.lock) if lock and paths.lock.exists() else None),
+    }
+
+
+def check_repositories(
+    roots: List[Path],
+    workers: int = 1,
+    cache: Optional[PackageConfigCache] = None,
+    report: Optional[Report] = None,
+) -> Dict[Path, List[Tuple[str, List[Finding]]]]:
+    """
+    Check the dependencies of several repositories in a single process.
+
+    The dependency trees are resolved across the worker pool, and the package
+    configurations of all repositories are loaded together, so a third party
+    package vendored in many repositories is only parsed once.
+
+    :param roots: the repository roots, each with a `packages` directory and a `tox.ini`.
+    :param workers: number of processes used to load the package configurations.
+    :param cache: config cache to read parsed configurations from.
+    :param report: report recording the time spent in each phase.
+    :return: the issues found at each comparison stage, for each repository.
+    """
+    cache = cache or PackageConfigCache(file=None)
+    report = report or Report(check="dependencies")
+    packages_dirs = [root / "packages" for root in roots]
+    with report.phase("registry load"):
+        if workers <= 1 or len(roots) <= 1:
+            repo_packages = [
+                _get_packages(packages_dir) for packages_dir in packages_dirs
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                repo_packages = list(executor.map(_get_packages, packages_dirs))
+
+        entries = _load_entries(
+            packages=list(itertools.chain.from_iterable(repo_packages)),
+            workers=workers,
+            cache=cache,
+        )
+
+    reports = {}
+    offset = 0
+    for root, packages, packages_dir in zip(roots, repo_packages, packages_dirs):
+        with report.phase("registry load"):
+            index = _index_entries(entries[offset : offset + len(packages)])
+            offset += len(packages)
+        with report.phase("config load"):
+            configs = _load_configs(ConfigPaths.at(root))
+        with report.phase("scan"):
+            reports[root] = list(
+                _compare(
+                    packages_dependencies=index.dependencies(),
+                    conflicts=index.report(),
+                    packages_dir=packages_dir,
+                    **configs,
+                )
+            )
+    return reports
+
+
+def _check_repositories(
+    reports: Dict[Path, List[Tuple[str, List[Finding]]]],
+    report: Optional[Report] = None,
+) -> None:
+    """Report the issues found in several repositories."""
+
+    results = {}
+    for root, stages in reports.items():
+        print(f"Checking {root}")
+        results[root] = _log_stages(stages, report=report)
+
+    print("Summary")
+    for root, fail_check in results.items():
+        if fail_check == logging.ERROR:
+            print(f"- {root}: dependencies check failed")
+        elif fail_check == logging.WARNING:
+            print(f"- {root}: please address warnings to avoid errors")
+        else:
+            print(f"- {root}: no issues found")
+
+    if logging.ERROR in results.values():
+        sys.exit(1)
+
+
+class WatchedDependencies:
+    """Dependency configs and package entries kept in memory between checks."""
+
+    def __init__(
+        self, packages_dir: Path, paths: ConfigPaths, cache: PackageConfigCache
+    ) -> None:
+        """
+        Initialize object.
+
+        :param packages_dir: path to the packages directory.
+        :param paths: paths to the dependency config files.
+        :param cache: config cache to read parsed configurations from.
+        """
+        self.packages_dir = packages_dir
+        self.packages_json = packages_dir / "packages.json"
+        self.paths = paths
+        self.cache = cache
+        self.loaders: Dict[Path, Callable[[Path], Any]] = {
+            paths.tox: ToxFile.load,
+            paths.pipfile: Pipfile.load,
+            paths.pyproject: PyProjectToml.load,
+            paths.lock: PoetryLock.load,
+        }
+        self.configs: Dict[Path, Any] = {}
+        self.entries: Dict[Path, Dict] = {}
+        for path in self.loaders:
+            self._load_config(path)
+        self._load_packages()
+
+    @property
+    def files(self) -> List[Path]:
+        """The files the checked dependencies are read from."""
+        return [*self.loaders, self.packages_json, *self.entries]
+
+    def _load_config(self, path: Path) -> None:
+        """Load a dependency config file, `None` if it does not exist."""
+        self.configs[path] = self.loaders[path](path) if path.exists() else None
+
+    def _load_packages(self) -> None:
+        """Load the entries of the packages listed in `packages.json`."""
+        packages = _get_packages(packages_dir=self.packages_dir)
+        self.entries = dict(
+            zip(
+                (
+                    package_path / PACKAGE_TYPE_TO_CONFIG_FILE[package_type.value]
+                    for package_type, package_path in packages
+                ),
+                _load_entries(packages=packages, workers=1, cache=self.cache),
+            )
+        )
+
+    def update(self, changed: Set[Path]) -> None:
+        """
+        Reload changed files, leaving everything else as it is.
+
+        :param changed: the changed files.
+        """
+        for path in changed:
+            self.cache.invalidate(path)
+
+        if self.packages_json in changed:
+            self._load_packages()
+        for path in changed:
+            if path in self.loaders:
+                self._load_config(path)
+            elif path in self.entries and not path.exists():
+                # the package was removed, `packages.json` may not be updated yet
+                del self.entries[path]
+            elif path in self.entries:
+                self.entries[path] = self.cache.get_or_parse(path)
+
+    def index(self) -> DependencyIndex:
+        """Index the dependencies of the packages."""
+        return _index_entries(list(self.entries.values()))
+
+    def check(self) -> int:
+        """
+        Check the dependencies.
+
+        :return: the level to exit with.
+        :raises ValueError: if the tox.ini file does not exist.
+        """
+        if self.configs[self.paths.tox] is None:
+            raise ValueError(f"{self.paths.tox} not found")
+        index = self.index()
+        return _log_stages(
+            _compare(
+                packages_dependencies=index.dependencies(),
+                tox=self.configs[self.paths.tox],
+                pipfile=self.configs[self.paths.pipfile],
+                pyproject=self.configs[self.paths.pyproject],
+                conflicts=index.report(),
+                packages_dir=self.packages_dir,
+                lock=self.configs[self.paths.lock],
+            )
+        )
+
+
+def _manage_dependencies(  # pylint: disable=too-many-arguments
+    packages_dir: Path,
+    paths: ConfigPaths,
+    report: Report,
+    check: bool,
+    workers: int,
+    cache: PackageConfigCache,
+    since: Optional[str] = None,
+) -> None:
+    """
+    Check or update the dependencies of a repository.
+
+    :param packages_dir: path to the packages directory.
+    :param paths: paths to the dependency config files.
+    :param report: report recording the findings and the time spent in each phase.
+    :param check: check the dependencies rather than updating the configs.
+    :param workers: number of processes used to load the package configurations.
+    :param cache: config cache to read parsed configurations from.
+    :param since: only check packages affected by changes since this git reference.
+    """
+    with report.phase("config load"):
+        configs = _load_configs(paths, lock=check)
+
+    if since is not None and _files_changed(
+        since, [paths.tox, paths.pipfile, paths.pyproject, paths.lock]
+    ):
+        print(f"Dependency configs changed since {since}, checking all packages")
+        since = None
+
+    with report.phase("registry load"):
+        index = load_dependency_index(
+            packages_dir=packages_dir, workers=workers, cache=cache, since=since
+        )
+        packages_dependencies = index.dependencies()
+
+    if check:
+        _check(
+            packages_dependencies=packages_dependencies,
+            conflicts=index.report(),
+            packages_dir=packages_dir,
+            report=report,
+            **configs,
+        )
+        return
+
+    with report.phase("write"):
+        _update(
+            packages_dependencies=packages_dependencies,
+            tox=configs["tox"],
+            pipfile=configs["pipfile"],
+            pyproject=configs["pyproject"],
+            conflicts=index.report(),
+        )
+
+
+def watch_dependencies(dependencies: WatchedDependencies) -> None:
+    """
+    Check the dependencies every time one of the files they are read from changes.
+
+    Only the changed files are parsed again, the rest of the models are kept in
+    memory, so the time to report is that of the comparison itself. Runs until
+    interrupted.
+
+    :param dependencies: the dependencies to watch.
+    """
+    watcher = FileWatcher(
+        directories={path.parent for path in dependencies.loaders},
+        recursive=[dependencies.packages_dir],
+    )
+    changed: Set[Path] = set()
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                dependencies.update(changed)
+                fail_check = dependencies.check()
+            except Exception as e:  # pylint: disable=broad-except
+                logging.error(f"Could not check dependencies: {e}")
+            else:
+                if fail_check == logging.ERROR:
+                    print("Dependencies check failed")
+                elif fail_check == logging.WARNING:
+                    print("Please address warnings to avoid errors")
+                else:
+                    print("No issues found")
+            print(
+                f"Checked in {(time.perf_counter() - start) * 1000:.1f} ms, "
+                f"watching for changes{' (polling)' if watcher.polling else ''}"
+            )
+            watcher.watch(dependencies.files)
+            changed = watcher.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+        dependencies.cache.dump()
+
+
 @click.command(name="dm")
 @click.option(
     "--check",
@@ -610,43 +1358,150 @@ def _check(
     ),
     help="Pipfile path.",
 )
-def main(
+@click.option(
+    "--lock",
+    "lock_path",
+    type=PathArgument(
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+    ),
+    help="poetry.lock path.",
+)
+@click.option(
+    "-j",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of processes used to load the package configurations.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Do not persist parsed package configurations.",
+)
+@click.option(
+    "--since",
+    "since",
+    type=str,
+    help="Only check packages affected by changes since this git reference.",
+)
+@click.option(
+    "--repo",
+    "repos",
+    type=PathArgument(
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+    ),
+    multiple=True,
+    help="Check the repository at this root, can be used multiple times.",
+)
+@click.option(
+    "--manifest",
+    type=PathArgument(
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+    ),
+    help="File listing the roots of the repositories to check.",
+)
+@click.option(
+    "--report",
+    "report_format",
+    type=click.Choice(REPORT_FORMATS),
+    default="text",
+    show_default=True,
+    help="Output format, `json` writes the findings and phase timings to stdout.",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Keep running and check again every time a dependency source changes.",
+)
+def main(  # pylint: disable=too-many-arguments
     check: bool = False,
     packages_dir: Optional[Path] = None,
     tox_path: Optional[Path] = None,
     pipfile_path: Optional[Path] = None,
     pyproject_path: Optional[Path] = None,
+    lock_path: Optional[Path] = None,
+    workers: int = 1,
+    no_cache: bool = False,
+    since: Optional[str] = None,
+    repos: Tuple[Path, ...] = (),
+    manifest: Optional[Path] = None,
+    report_format: str = "text",
+    watch: bool = False,
 ) -> None:
     """Check dependencies across packages, tox.ini, pyproject.toml and setup.py"""
 
     logging.basicConfig(format="- %(levelname)s: %(message)s")
 
-    tox_path = tox_path or Path.cwd() / "tox.ini"
-    tox = ToxFile.load(tox_path)
+    if (repos or manifest is not None) and (not check or since is not None):
+        raise click.UsageError(
+            "Checking multiple repositories only supports `--check` without `--since`."
+        )
 
-    pipfile_path = pipfile_path or Path.cwd() / "Pipfile"
-    pipfile = Pipfile.load(pipfile_path) if pipfile_path.exists() else None
+    # the configs are read from each repository root, the paths would be ignored
+    if (repos or manifest is not None) and any(
+        path is not None
+        for path in (packages_dir, tox_path, pipfile_path, pyproject_path, lock_path)
+    ):
+        raise click.UsageError(
+            "`--packages`, `--tox`, `--pipfile`, `--pyproject` and `--lock` can not "
+            "be used with `--repo` or `--manifest`, the configs of each repository are checked."
+        )
 
-    pyproject_path = pyproject_path or Path.cwd() / "pyproject.toml"
-    pyproject = PyProjectToml.load(pyproject_path) if pyproject_path.exists() else None
+    if watch and (
+        repos or manifest is not None or since is not None or report_format != "text"
+    ):
+        raise click.UsageError(
+            "`--watch` can not be used with `--repo`, `--manifest`, `--since` or `--report json`."
+        )
 
     packages_dir = packages_dir or Path.cwd() / "packages"
-    packages_dependencies = load_packages_dependencies(packages_dir=packages_dir)
+    paths = ConfigPaths(
+        tox=tox_path or Path.cwd() / "tox.ini",
+        pipfile=pipfile_path or Path.cwd() / "Pipfile",
+        pyproject=pyproject_path or Path.cwd() / "pyproject.toml",
+        lock=lock_path or Path.cwd() / "poetry.lock",
+    )
 
-    if check:
-        return _check(
-            tox=tox,
-            pipfile=pipfile,
-            pyproject=pyproject,
-            packages_dependencies=packages_dependencies,
+    if watch:
+        return watch_dependencies(
+            WatchedDependencies(
+                packages_dir=packages_dir,
+                paths=paths,
+                cache=PackageConfigCache(file=None if no_cache else CACHE_FILE),
+            )
         )
 
-    return _update(
-        tox=tox,
-        pipfile=pipfile,
-        pyproject=pyproject,
-        packages_dependencies=packages_dependencies,
-    )
+    report = Report(check="dependencies")
+    with report.output(report_format):
+        if repos or manifest is not None:
+            return _check_repositories(
+                check_repositories(
+                    roots=[*repos, *(read_manifest(manifest) if manifest else [])],
+                    workers=workers,
+                    cache=PackageConfigCache(file=None if no_cache else CACHE_FILE),
+                    report=report,
+                ),
+                report=report,
+            )
+
+        return _manage_dependencies(
+            packages_dir=packages_dir,
+            paths=paths,
+            report=report,
+            check=check,
+            workers=workers,
+            cache=PackageConfigCache(file=None if no_cache else CACHE_FILE),
+            since=since,
+        )
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2022-2024 Valory AG
+#   Copyright 2022-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -22,18 +22,57 @@
 """This module contains the tools for autoupdating ipfs hashes in the documentation."""
 
 import argparse
+import io
 import itertools
+import json
+import logging
+import mmap
+import os
 import re
+import shutil
+import subprocess  # nosec
 import sys
+import tempfile
+import tokenize
+from contextlib import closing, contextmanager, nullcontext, redirect_stdout
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Optional
-
-import yaml
-from aea.cli.packages import get_package_manager
-from aea.configurations.data_types import PackageId
-from aea.helpers.base import IPFS_HASH_REGEX, SIMPLE_ID_REGEX
+from typing import (
+    Any,
+    BinaryIO,
+    ContextManager,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Match,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 
+try:
+    from scripts.config_tokenizer import apply_edits
+    from scripts.doc_cache import DOC_CACHE_FILE, DocScanCache
+    from scripts.hash_history import HASH_HISTORY_FILE, HashHistory, PACKAGES_FILE
+    from scripts.report import Finding, REPORT_FORMATS, Report
+except ImportError:  # pragma: nocover  # run as a standalone script
+    from config_tokenizer import apply_edits  # type: ignore
+    from doc_cache import DOC_CACHE_FILE, DocScanCache  # type: ignore
+    from hash_history import (  # type: ignore
+        HASH_HISTORY_FILE,
+        HashHistory,
+        PACKAGES_FILE,
+    )
+    from report import Finding, REPORT_FORMATS, Report  # type: ignore
+
+
+# same as `aea.helpers.base`, importing `aea` would take most of a `--staged` run
+IPFS_HASH_REGEX = r"((Qm[a-zA-Z0-9]{44})|(ba[a-zA-Z0-9]{57}))"
+SIMPLE_ID_REGEX = r"[a-z_][a-z0-9_]{0,127}"
 CLI_REGEX = r"(?P<cli>aea|autonomy)"
 # CMD_REGEX should be r"(?P<cmd>(\S+\s(\s--\S+)*)+)",
 # but python implementation differs from others and does not match it properly
@@ -48,10 +87,134 @@ PACKAGE_TYPE_REGEX = (
 
 AEA_COMMAND_REGEX = rf"(?P<full_cmd>{CLI_REGEX} {CMD_REGEX} (?:{VENDOR_REGEX}\/{PACKAGE_REGEX}:{VERSION_REGEX}?:?)?(?P<hash>{IPFS_HASH_REGEX}){FLAGS_REGEX})"
 FULL_PACKAGE_REGEX = rf"(?P<full_package>(?:{VENDOR_REGEX}\/{PACKAGE_REGEX}:{VERSION_REGEX}?:?)?(?P<hash>{IPFS_HASH_REGEX}))"
+AEA_COMMAND_PATTERN = re.compile(AEA_COMMAND_REGEX)
+CID_TOKEN_PATTERN = re.compile(IPFS_HASH_REGEX)
+CLI_TOKENS = ("aea ", "autonomy ")
+# the command and CID token patterns, newline, flags prefix and CLI names, to
+# search strings and buffers
+COMMAND_SYNTAX: Dict[type, Tuple[Any, ...]] = {
+    str: (AEA_COMMAND_PATTERN, CID_TOKEN_PATTERN, "\n", "--", CLI_TOKENS),
+    bytes: (
+        re.compile(AEA_COMMAND_REGEX.encode()),
+        re.compile(IPFS_HASH_REGEX.encode()),
+        b"\n",
+        b"--",
+        tuple(cli.encode() for cli in CLI_TOKENS),
+    ),
+}
+# a whole `vendor/name:version:hash` id, not a bare CID nor a part of a longer
+# alphanumeric string, e.g. a transaction hash
+PACKAGE_REFERENCE_PATTERN = re.compile(
+    rf"(?<![a-zA-Z0-9_/])(?P<full_package>{VENDOR_REGEX}\/{PACKAGE_REGEX}:{VERSION_REGEX}:(?P<hash>{IPFS_HASH_REGEX}))(?![a-zA-Z0-9])"
+)
 PACKAGE_TABLE_REGEX = rf"\|\s*{PACKAGE_TYPE_REGEX}\/{VENDOR_REGEX}\/{PACKAGE_REGEX}\/{VERSION_REGEX}\s*\|\s*`(?P<hash>{IPFS_HASH_REGEX})`\s*\|"
 
 ROOT_DIR = Path(__file__).parent.parent
 HASH_SKIPS = ()
+# doc files from this size on are memory-mapped and scanned in chunks
+MMAP_THRESHOLD = 1 << 20
+MMAP_CHUNK_SIZE = 1 << 20
+# the tokens of string literals, and of the literal parts of f-strings (python>=3.12)
+STRING_TOKENS = {tokenize.STRING, getattr(tokenize, "FSTRING_MIDDLE", tokenize.STRING)}
+
+
+def _line_of(content: str, offset: int) -> int:
+    """Get the 1-based line number of an offset in a string."""
+    return content.count("\n", 0, offset) + 1
+
+
+def find_commands(content: Union[str, bytes, mmap.mmap]) -> Iterator[Match[Any]]:
+    """
+    Find the matches of `AEA_COMMAND_REGEX` in a string or a buffer.
+
+    A command and its hash are always on the same line, only the flags may run
+    into the next line when it starts with `--`. So instead of running the regex,
+    whose command group is `.*`, over the whole content, it only runs on the
+    lines containing both a CID-looking token and a CLI name. The matches are
+    the same as those of `re.finditer(AEA_COMMAND_REGEX, content)`.
+
+    :param content: the content to search, buffers are searched with the bytes patterns.
+    :yield: the matches, in order.
+    """
+    text: Any = content
+    command_pattern, token_pattern, newline, flags, cli_tokens = COMMAND_SYNTAX[
+        str if isinstance(content, str) else bytes
+    ]
+
+    scanned = 0
+    last_end = 0
+    for token in token_pattern.finditer(text):
+        if token.start() < scanned:
+            continue
+        line_start = text.rfind(newline, 0, token.start()) + 1
+        line_end = text.find(newline, token.end())
+        line_end = len(text) if line_end == -1 else line_end
+        scanned = line_end
+        if not any(cli in text[line_start:line_end] for cli in cli_tokens):
+            continue
+
+        end = line_end
+        if text[line_end + 1 : line_end + 3] == flags:
+            end = text.find(newline, line_end + 1)
+            end = len(text) if end == -1 else end
+        for match in command_pattern.finditer(text, max(line_start, last_end), end):
+            last_end = match.end()
+            yield match
+
+
+def count_newlines(buffer: mmap.mmap, start: int, end: int) -> int:
+    """Count the newlines in a span of a buffer, without copying it whole."""
+    return sum(
+        buffer[i : min(i + MMAP_CHUNK_SIZE, end)].count(b"\n")
+        for i in range(start, end, MMAP_CHUNK_SIZE)
+    )
+
+
+@contextmanager
+def open_doc(md_file: Path) -> Generator[Union[str, mmap.mmap], None, None]:
+    """
+    Open a doc file for scanning.
+
+    Files larger than `MMAP_THRESHOLD` are memory-mapped rather than read, so
+    the memory used does not depend on their size.
+
+    :param md_file: the doc file.
+    :yield: the content of small files, or a read-only map of large ones.
+    """
+    size = md_file.stat().st_size
+    if size < MMAP_THRESHOLD or size == 0:
+        yield read_file(str(md_file))
+        return
+    with open(md_file, "rb") as file_, mmap.mmap(
+        file_.fileno(), 0, access=mmap.ACCESS_READ
+    ) as buffer:
+        yield buffer
+
+
+def doc_commands(
+    content: Union[str, mmap.mmap]
+) -> Iterator[Tuple[int, Tuple[int, int], Dict[str, Any]]]:
+    """
+    Find the commands in the content of a doc file.
+
+    The groups of the matches in a buffer are decoded, but the offsets are not.
+
+    :param content: the content, or a map of it, as opened by `open_doc`.
+    :yield: the line number, span and groups of each command.
+    """
+    if isinstance(content, str):
+        for m in find_commands(content):
+            yield _line_of(content, m.start()), m.span("full_cmd"), m.groupdict()
+        return
+
+    line, offset = 1, 0
+    for m in find_commands(content):
+        line += count_newlines(content, offset, m.start())
+        offset = m.start()
+        yield line, m.span("full_cmd"), {
+            key: None if value is None else value.decode("utf-8", "replace")
+            for key, value in m.groupdict().items()
+        }
 
 
 def read_file(filepath: str) -> str:
@@ -61,9 +224,111 @@ def read_file(filepath: str) -> str:
     return file_str
 
 
+def write_file(filepath: str, content: str) -> None:
+    """
+    Write a string to a file atomically.
+
+    The content is written to a temporary file in the same directory, which
+    then replaces the file, so an interrupted run never leaves it half-written.
+
+    :param filepath: the file path.
+    :param content: the new content.
+    """
+    with _replace_file(filepath) as file_:
+        file_.write(content.encode("utf-8"))
+
+
+def write_edits(filepath: str, edits: List[Tuple[int, int, str]]) -> None:
+    """
+    Replace byte spans of a file atomically, streaming the rest of its content.
+
+    :param filepath: the file path.
+    :param edits: triples of start offset, end offset and replacement text.
+    """
+    # the original is closed before it is replaced, which Windows requires
+    with _replace_file(filepath) as file_:
+        with open(filepath, "rb") as original, mmap.mmap(
+            original.fileno(), 0, access=mmap.ACCESS_READ
+        ) as buffer:
+            position = 0
+            for start, end, text in sorted(edits, key=lambda edit: edit[:2]):
+                for i in range(position, start, MMAP_CHUNK_SIZE):
+                    file_.write(buffer[i : min(i + MMAP_CHUNK_SIZE, start)])
+                file_.write(text.encode("utf-8"))
+                position = end
+            for i in range(position, len(buffer), MMAP_CHUNK_SIZE):
+                file_.write(buffer[i : i + MMAP_CHUNK_SIZE])
+
+
+@contextmanager
+def _replace_file(filepath: str) -> Generator[BinaryIO, None, None]:
+    """
+    Write the new content of a file to a temporary file, which then replaces it.
+
+    :param filepath: the file path.
+    :yield: the temporary file, opened for writing.
+    """
+    directory, name = os.path.split(filepath)
+    fd, tmp = tempfile.mkstemp(dir=directory or ".", prefix=f".{name}.")
+    try:
+        with os.fdopen(fd, "wb") as file_:
+            yield file_
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, tmp)
+        else:  # the mode `open` would create the file with
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, filepath)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def read_version(yaml_file: Path) -> Optional[str]:
+    """
+    Read the version of a package configuration.
+
+    Only the parser events are read, up to the first top-level `version` key,
+    so the rest of the file is neither loaded nor parsed.
+
+    :param yaml_file: path to the package configuration.
+    :return: the version in the first document defining one, if any.
+    """
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    # the libyaml parser, unless pyyaml was built without it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    depth = 0
+    key: Optional[str] = None
+    with open(yaml_file, "r", encoding="utf-8") as file:
+        for event in yaml.parse(file, Loader=loader):
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                depth += 1
+                if depth == 2:  # the value of `key` is a collection
+                    key = None
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+            elif depth == 1 and isinstance(event, yaml.ScalarEvent) and key is None:
+                key = event.value
+            elif depth == 1 and isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)):
+                if key == "version" and isinstance(event, yaml.ScalarEvent):
+                    return event.value
+                key = None
+    return None
+
+
 def get_packages() -> Dict[str, str]:
     """Get packages."""
-    data = get_package_manager(Path("packages").relative_to(".")).json
+    from aea.cli.packages import (  # pylint: disable=import-outside-toplevel
+        get_package_manager,
+    )
+
+    return flatten_packages(get_package_manager(Path("packages").relative_to(".")).json)
+
+
+def flatten_packages(data: Dict[str, Any]) -> Dict[str, str]:
+    """Get the hash of each package, of both sections of a `packages.json`."""
     if "dev" in data:
         return {**data["dev"], **data["third_party"]}
     return data
@@ -72,14 +337,23 @@ def get_packages() -> Dict[str, str]:
 class Package:  # pylint: disable=too-few-public-methods
     """Class that represents a package in packages.json"""
 
-    def __init__(self, package_id_str: str, package_hash: str) -> None:
-        """Constructor"""
+    def __init__(
+        self, package_id_str: str, package_hash: str, root: Optional[Path] = None
+    ) -> None:
+        """
+        Constructor
+
+        :param package_id_str: the package id, as in `packages.json`.
+        :param package_hash: the package hash.
+        :param root: the repository root the package is in, that of this repository by default.
+        """
 
-        self.package_id = PackageId.from_uri_path(package_id_str)
-        self.vendor = self.package_id.author
-        self.type = self.package_id.package_type.to_plural()
-        self.name = self.package_id.name
+        # split by hand, importing `aea` for `PackageId` is slow
+        self.package_id = package_id_str
+        package_type, self.vendor, self.name, _ = package_id_str.split("/")
+        self.type = package_type + "s"
         self.hash = package_hash
+        self.yaml_file: Optional[Path] = None
 
         if self.name == "scaffold":
             return
@@ -101,21 +375,19 @@ class Package:  # pylint: disable=too-few-public-methods
             )
         self.type = self.type[:-1]  # remove last s
 
-        self.last_version = None
-        yaml_file_path = Path(
-            ROOT_DIR,
+        self.yaml_file = Path(
+            root or ROOT_DIR,
             "packages",
             self.vendor,
             self.type + "s",
             self.name,
             f"{'aea-config' if self.type == 'agent' else self.type}.yaml",
         )
-        with open(yaml_file_path, "r", encoding="utf-8") as file:
-            content = yaml.load_all(file, Loader=yaml.FullLoader)
-            for resource in content:
-                if "version" in resource:
-                    self.last_version = resource["version"]
-                    break
+
+    @cached_property
+    def last_version(self) -> Optional[str]:
+        """The package version, read on first access."""
+        return None if self.yaml_file is None else read_version(self.yaml_file)
 
     def get_command(
         self, cmd: str, include_version: bool = True, flags: str = ""
@@ -137,28 +409,63 @@ class Package:  # pylint: disable=too-few-public-methods
 class PackageHashManager:
     """Class that represents the packages in packages.json"""
 
-    def __init__(self) -> None:
-        """Constructor"""
-        packages = get_packages()
-        self.packages = [Package(key, value) for key, value in packages.items()]
+    def __init__(
+        self,
+        history: Optional[Union[Dict[str, str], HashHistory]] = None,
+        packages: Optional[Dict[str, str]] = None,
+        root: Optional[Path] = None,
+    ) -> None:
+        """
+        Constructor
 
-        self.package_tree: Dict = {}
+        :param history: the package id of each hash ever published, see `HashHistory`.
+        :param packages: the hash of each package, read from `packages.json` if not given.
+        :param root: the repository root the packages are in, that of this repository by default.
+        """
+        packages = get_packages() if packages is None else packages
+        self.package_hashes = packages
+        self.history = history or {}
+        self.packages = [Package(key, value, root) for key, value in packages.items()]
+
+        # index the packages once, so lookups do not depend on the registry size
+        self.packages_by_hash: Dict[str, Package] = {}
+        self.packages_by_id: Dict[Tuple[str, str, str], Package] = {}
+        self.package_types: Dict[str, Dict[str, List[str]]] = {}
+        self.duplicate_hashes: Set[str] = set()
         for p in self.packages:
-            self.package_tree.setdefault(p.vendor, {})
-            self.package_tree[p.vendor].setdefault(p.type, {})
-            self.package_tree[p.vendor][p.type].setdefault(p.name, p)
             assert re.match(IPFS_HASH_REGEX, p.hash)  # detect wrong regexes
+            if p.hash in self.packages_by_hash:
+                self.duplicate_hashes.add(p.hash)
+            self.packages_by_hash.setdefault(p.hash, p)
+            if (p.vendor, p.type, p.name) not in self.packages_by_id:
+                self.packages_by_id[(p.vendor, p.type, p.name)] = p
+                self.package_types.setdefault(p.vendor, {}).setdefault(
+                    p.name, []
+                ).append(p.type)
 
     def get_package_by_hash(self, package_hash: str) -> Optional[Package]:
         """Get a package given its hash"""
-        packages = list(filter(lambda p: p.hash == package_hash, self.packages))
-        if not packages:
-            return None
-        if len(packages) > 1:
+        if package_hash in self.duplicate_hashes:
             raise ValueError(
                 f"PackageHashManager: hash search for {package_hash} returned more than 1 result in packages.json"
             )
-        return packages[0]
+        return self.packages_by_hash.get(package_hash)
+
+    def get_published_package(self, package_hash: str) -> Optional[str]:
+        """Get the `vendor/name:version` a hash was published for, if it is in the history."""
+        package_id = self.history.get(package_hash)
+        if package_id is None:
+            return None
+        _, vendor, name, version = package_id.split("/")
+        return f"{vendor}/{name}:{version}"
+
+    def get_current_package(self, package_hash: str) -> Optional[Package]:
+        """Get the current version of the package a hash was published for."""
+        package_id = self.history.get(package_hash)
+        if package_id is None:
+            return None
+        package_type, vendor, name, _ = package_id.split("/")
+        return self.packages_by_id.get((vendor, package_type, name))
 
     def get_hash_by_package_line(
         self, package_line: str, target_file: str
@@ -187,6 +494,11 @@ class PackageHashManager:
                 if package:
                     return package.hash
 
+                # This hash was published for a previous version of a package
+                package = self.get_current_package(d["hash"])
+                if package:
+                    return package.hash
+
                 # This hash does not exist in packages.json
                 print(
                     f"[{target_file}]: unknown IPFS hash in line '{package_line!r}'. Can't fix because this command just uses the hash"
@@ -195,11 +507,10 @@ class PackageHashManager:
 
             # Complete command, succesfully retrieved or complete packages
 
-            # Guess the package type (agent, service, contract...). First try to find the package in the package_tree
-            potential_package_types = []
-            for package_type, packages in self.package_tree[d["vendor"]].items():
-                if d["package"] in packages.keys():
-                    potential_package_types.append(package_type)
+            # Guess the package type (agent, service, contract...). First try to find the package in the package index
+            potential_package_types = self.package_types[d["vendor"]].get(
+                d["package"], []
+            )
 
             # If only 1 match has been found we can be sure about the package type
             if len(potential_package_types) == 1:
@@ -227,7 +538,9 @@ class PackageHashManager:
                         f"[{target_file}]: could not infer the package type for line '{package_line!r}'\nPlease update the hash manually."
                     )
 
-            return self.package_tree[d["vendor"]][package_type][d["package"]].hash
+            return self.packages_by_id[
+                (d["vendor"], cast(str, package_type), d["package"])
+            ].hash
 
         # Otherwise log the error
         except KeyError:
@@ -240,111 +553,604 @@ class PackageHashManager:
         self, package_type: str, vendor: str, package_name: str
     ) -> str:
         """Get a package hash give the package information"""
-        return self.package_tree[vendor][package_type][package_name].hash
+        return self.packages_by_id[(vendor, package_type, package_name)].hash
 
 
-def check_ipfs_hashes(  # pylint: disable=too-many-locals,too-many-statements
-    paths: Optional[List[Path]] = None, fix: bool = False
-) -> None:
-    """Fix ipfs hashes in the docs"""
+class DocReferences:  # pylint: disable=too-few-public-methods
+    """The package references found in a doc or Python file."""
 
-    if paths is None:
-        paths = [Path("docs")]
+    __slots__ = ("count", "hashes", "packages")
 
-    all_md_files = itertools.chain.from_iterable([path.rglob("*.md") for path in paths])
-    errors = False
-    hash_mismatches = False
-    old_to_new_hashes = {}
-    package_manager = PackageHashManager()
-    matches = 0
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.count = 0
+        # the hashes and `vendor/name` packages the references point to
+        self.hashes: Set[str] = set()
+        self.packages: Set[str] = set()
 
-    # Fix full commands in docs
-    for md_file in all_md_files:
-        content = read_file(str(md_file))
-        for match in [m.groupdict() for m in re.finditer(AEA_COMMAND_REGEX, content)]:
-            matches += 1
-            doc_full_cmd = match["full_cmd"]
-            doc_cmd = match["cmd"]
-            doc_hash = match["hash"]
-            flags = match["flags"]
-
-            if doc_hash in HASH_SKIPS:
-                continue
 
-            expected_hash = package_manager.get_hash_by_package_line(
-                doc_full_cmd, str(md_file)
+class DocFixes:  # pylint: disable=too-few-public-methods
+    """The outdated hashes of a doc or Python file, and their fixes."""
+
+    __slots__ = ("old_to_new_hashes", "content", "edits")
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.old_to_new_hashes: Dict[str, str] = {}
+        # the content with every fix applied in one pass, if any hash was fixed
+        self.content: Optional[str] = None
+        # the byte spans to fix in a memory-mapped file, see `write_edits`
+        self.edits: List[Tuple[int, int, str]] = []
+
+    @property
+    def applied(self) -> bool:
+        """Whether any hash was fixed."""
+        return self.content is not None or bool(self.edits)
+
+
+class DocScan:
+    """The result of scanning a doc or Python file."""
+
+    __slots__ = (
+        "file",
+        "errors",
+        "hash_mismatches",
+        "findings",
+        "output",
+        "references",
+        "fixes",
+    )
+
+    def __init__(self, file: Path) -> None:
+        """
+        Initialize object.
+
+        :param file: the scanned file.
+        """
+        self.file = file
+        self.errors = False
+        self.hash_mismatches = False
+        self.findings: List[Finding] = []
+        self.output = ""
+        self.references = DocReferences()
+        self.fixes = DocFixes()
+
+    def to_json(self) -> Dict[str, Any]:
+        """Transform the result of a check, without fixes, to JSON."""
+        return {
+            "matches": self.references.count,
+            "errors": self.errors,
+            "hash_mismatches": self.hash_mismatches,
+            "findings": [finding.to_json() for finding in self.findings],
+            "output": self.output,
+            "old_to_new_hashes": self.fixes.old_to_new_hashes,
+        }
+
+    @classmethod
+    def from_json(cls, file: Path, data: Dict[str, Any]) -> "DocScan":
+        """Make the result of a check from its JSON form."""
+        scan = cls(file=file)
+        scan.references.count = data["matches"]
+        scan.errors = data["errors"]
+        scan.hash_mismatches = data["hash_mismatches"]
+        scan.findings = [Finding.from_json(finding) for finding in data["findings"]]
+        scan.output = data["output"]
+        scan.fixes.old_to_new_hashes = data["old_to_new_hashes"]
+        return scan
+
+
+def _check_reference(  # pylint: disable=too-many-arguments
+    scan: DocScan,
+    package_manager: PackageHashManager,
+    match: Dict[str, str],
+    reference: str,
+    line: int,
+    fix: bool,
+) -> Optional[Package]:
+    """
+    Check a package reference found in a file.
+
+    :param scan: the result of the scan of the file, updated with the findings.
+    :param package_manager: the package index.
+    :param match: the groups of the reference match.
+    :param reference: the package reference, i.e. a command or a package id and hash.
+    :param line: the 1-based line number of the reference.
+    :param fix: whether the mismatching hashes are fixed.
+    :return: the package the reference should point to, if its hash is outdated.
+    """
+    scan.references.count += 1
+    reference_hash = match["hash"]
+    if reference_hash in HASH_SKIPS:
+        return None
+
+    scan.references.hashes.add(reference_hash)
+    if match["vendor"] and match["package"]:
+        scan.references.packages.add(f"{match['vendor']}/{match['package']}")
+    expected_hash = package_manager.get_hash_by_package_line(reference, str(scan.file))
+    expected_package = (
+        package_manager.get_package_by_hash(expected_hash) if expected_hash else None
+    )
+    if not expected_package:
+        scan.errors = True
+        scan.findings.append(
+            Finding(
+                message=f"Could not resolve the package of '{reference}'",
+                level=logging.ERROR,
+                file=scan.file,
+                line=line,
+                expected=expected_hash,
+                actual=reference_hash,
+            )
+        )
+        return None
+
+    if reference_hash == expected_hash:
+        return None
+
+    scan.hash_mismatches = True
+    published = package_manager.get_published_package(reference_hash)
+    scan.findings.append(
+        Finding(
+            message=f"IPFS hash mismatch in '{reference}'"
+            + (
+                f": stale hash for {published}, current is {expected_package.hash}"
+                if published
+                else ""
+            ),
+            level=logging.INFO if fix else logging.ERROR,
+            file=scan.file,
+            line=line,
+            expected=expected_hash,
+            actual=reference_hash,
+        )
+    )
+    scan.fixes.old_to_new_hashes[reference_hash] = expected_package.hash
+    return expected_package
+
+
+def _fix_doc_command(
+    md_file: Path,
+    package_manager: PackageHashManager,
+    match: Dict[str, str],
+    expected_package: Package,
+    fix: bool,
+) -> Optional[str]:
+    """
+    Report a doc command referencing an outdated hash.
+
+    :param md_file: the doc file.
+    :param package_manager: the package index.
+    :param match: the groups of the command match.
+    :param expected_package: the package the command should point to.
+    :param fix: whether to fix the command.
+    :return: the fixed command, if fixing.
+    """
+    doc_full_cmd = match["full_cmd"]
+    if not fix:
+        published = package_manager.get_published_package(match["hash"])
+        print(
+            f"IPFS hash mismatch in doc file {md_file}.\n"
+            f"\tCommand string: {doc_full_cmd}\n"
+            f"\tExpected: {expected_package.hash}\n"
+            f"\tFound: {match['hash']}\n"
+            + (f"\tStale hash for: {published}\n" if published else "")
+        )
+        return None
+
+    new_command = (
+        expected_package.get_command(cmd=match["cmd"], flags=match["flags"])
+        if match["vendor"]
+        # commands only using the hash keep their form
+        else doc_full_cmd.replace(match["hash"], expected_package.hash)
+    )
+    print(f"Fixed an IPFS hash in doc file {md_file}")
+    return new_command
+
+
+def scan_doc(
+    md_file: Path,
+    package_manager: PackageHashManager,
+    fix: bool = False,
+    content: Optional[str] = None,
+) -> DocScan:
+    """
+    Check the commands in a doc file.
+
+    Nothing is printed nor written, the output and fixed content are returned
+    so the results of files scanned in parallel can be merged in order.
+
+    :param md_file: the doc file.
+    :param package_manager: the package index.
+    :param fix: whether to fix the mismatching hashes.
+    :param content: the content to check instead of the file's, e.g. a staged one.
+    :return: the result of the scan.
+    """
+    scan = DocScan(file=md_file)
+    output = io.StringIO()
+    edits: List[Tuple[int, int, str]] = []
+    doc: ContextManager[Union[str, mmap.mmap]] = (
+        nullcontext(content) if content is not None else open_doc(md_file)
+    )
+    with doc as doc_content, redirect_stdout(output):
+        for line, span, match in doc_commands(doc_content):
+            expected_package = _check_reference(
+                scan=scan,
+                package_manager=package_manager,
+                match=match,
+                reference=match["full_cmd"],
+                line=line,
+                fix=fix,
             )
-            if not expected_hash:
-                errors = True
+            if expected_package is None:
                 continue
-            expected_package = package_manager.get_package_by_hash(expected_hash)
-            if not expected_package:
-                errors = True
+            new_command = _fix_doc_command(
+                md_file=md_file,
+                package_manager=package_manager,
+                match=match,
+                expected_package=expected_package,
+                fix=fix,
+            )
+            if new_command is not None:
+                edits.append((*span, new_command))
+        if edits and isinstance(doc_content, str):
+            scan.fixes.content = apply_edits(doc_content, edits)
+        elif edits:
+            scan.fixes.edits = edits
+    scan.output = output.getvalue()
+    return scan
+
+
+def find_package_references(content: str) -> Iterator[Tuple[int, Match[str]]]:
+    """
+    Find the package ids in the string literals of Python code.
+
+    Only whole package ids are matched, see `PACKAGE_REFERENCE_PATTERN`, and
+    comments and identifiers never are. Files without any CID-looking token are
+    not tokenized.
+
+    :param content: the Python source code.
+    :yield: the offset of each string literal in the content and the matches in it.
+    :raises SyntaxError: if the code cannot be tokenized.
+    """
+    if CID_TOKEN_PATTERN.search(content) is None:
+        return
+    line_offsets = [0] + [m.end() for m in re.finditer("\n", content)]
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(content).readline):
+            if token.type not in STRING_TOKENS:
                 continue
-
-            new_command = expected_package.get_command(cmd=doc_cmd, flags=flags)
-
-            # Overwrite with new hash
-            if doc_hash == expected_hash:
+            row, column = token.start
+            offset = line_offsets[row - 1] + column
+            # f-string parts may differ from the source, e.g. for `{{`
+            if not content.startswith(token.string, offset):
+                continue
+            for match in PACKAGE_REFERENCE_PATTERN.finditer(token.string):
+                yield offset, match
+    except tokenize.TokenError as e:
+        raise SyntaxError(str(e)) from e
+
+
+def scan_source(
+    py_file: Path,
+    package_manager: PackageHashManager,
+    fix: bool = False,
+    content: Optional[str] = None,
+) -> DocScan:
+    """
+    Check the package references in the string literals of a Python file.
+
+    :param py_file: the Python file.
+    :param package_manager: the package index.
+    :param fix: whether to fix the mismatching hashes.
+    :param content: the content to check instead of the file's, e.g. an unsaved one.
+    :return: the result of the scan.
+    """
+    scan = DocScan(file=py_file)
+    output = io.StringIO()
+    content = read_file(str(py_file)) if content is None else content
+    edits: List[Tuple[int, int, str]] = []
+    with redirect_stdout(output):
+        try:
+            references = list(find_package_references(content))
+        except SyntaxError as e:
+            print(f"Could not tokenize {py_file}, skipping it: {e}")
+            references = []
+
+        for offset, m in references:
+            full_package = m.group("full_package")
+            expected_package = _check_reference(
+                scan=scan,
+                package_manager=package_manager,
+                match=m.groupdict(),
+                reference=full_package,
+                line=_line_of(content, offset + m.start()),
+                fix=fix,
+            )
+            if expected_package is None:
                 continue
-
-            hash_mismatches = True
 
             if fix:
-                content = content.replace(doc_full_cmd, new_command)
-
-                with open(str(md_file), "w", encoding="utf-8") as qs_file:
-                    qs_file.write(content)
-                print(f"Fixed an IPFS hash in doc file {md_file}")
-                old_to_new_hashes[doc_hash] = expected_hash
+                new_package = ":".join(
+                    full_package.split(":")[:-1] + [expected_package.hash]
+                )
+                edits.append(
+                    (
+                        offset + m.start("full_package"),
+                        offset + m.end("full_package"),
+                        new_package,
+                    )
+                )
+                print(f"Fixed an IPFS hash in file {py_file}")
             else:
                 print(
-                    f"IPFS hash mismatch in doc file {md_file}.\n"
-                    f"\tCommand string: {doc_full_cmd}\n"
-                    f"\tExpected: {expected_hash}\n"
-                    f"\tFound: {doc_hash}\n"
+                    f"IPFS hash mismatch in file {py_file}.\n"
+                    f"\tPackage: {full_package}\n"
+                    f"\tExpected: {expected_package.hash}\n"
+                    f"\tFound: {m.group('hash')}\n"
                 )
+    if edits:
+        scan.fixes.content = apply_edits(content, edits)
+    scan.output = output.getvalue()
+    return scan
+
+
+def scan_file(
+    file: Path,
+    package_manager: PackageHashManager,
+    fix: bool = False,
+    content: Optional[str] = None,
+) -> DocScan:
+    """Check a doc or Python file, or the given content of it, depending on its extension."""
+    scanner = scan_source if file.suffix == ".py" else scan_doc
+    return scanner(file, package_manager, fix, content)
+
+
+# read-only snapshot of the package index in each scanning process
+_worker_package_manager: Optional[PackageHashManager] = None
+
+
+def _init_worker(package_manager: PackageHashManager) -> None:
+    """Store the package index of a scanning process."""
+    global _worker_package_manager  # pylint: disable=global-statement
+    _worker_package_manager = package_manager
+
+
+def _scan_file_in_worker(file: Path, fix: bool) -> DocScan:
+    """Check a file against the package index of the scanning process."""
+    return scan_file(
+        file=file,
+        package_manager=cast(PackageHashManager, _worker_package_manager),
+        fix=fix,
+    )
+
+
+def scan_files(
+    files: List[Path],
+    package_manager: PackageHashManager,
+    fix: bool = False,
+    workers: int = 1,
+) -> Generator[DocScan, None, None]:
+    """
+    Check the package references in doc and Python files.
+
+    :param files: the files.
+    :param package_manager: the package index.
+    :param fix: whether to fix the mismatching hashes.
+    :param workers: number of processes used to scan the files.
+    :yield: the result of each scan, in the same order as the files.
+    """
+    if workers <= 1 or len(files) <= 1:
+        for file in files:
+            yield scan_file(file=file, package_manager=package_manager, fix=fix)
+        return
+
+    # imported here, like `yaml`, to keep the startup of `--staged` runs short
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor,
+    )
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(package_manager,)
+    ) as executor:
+        # small chunks keep the workers busy when the file sizes vary a lot
+        yield from executor.map(
+            _scan_file_in_worker,
+            files,
+            itertools.repeat(fix),
+            chunksize=max(1, len(files) // (workers * 8)),
+        )
+
+
+def export_hash_map(file: Path, old_to_new_hashes: Dict[str, str]) -> None:
+    """
+    Export the outdated hashes found and their current hash, for `rewrite_hashes.py`.
+
+    :param file: the JSON file to write the map to.
+    :param old_to_new_hashes: the current hash of each outdated hash.
+    """
+    write_file(
+        str(file), json.dumps(dict(sorted(old_to_new_hashes.items())), indent=2) + "\n"
+    )
+
+
+def staged_files(paths: List[Path], suffix: str = ".md") -> List[str]:
+    """
+    List the files added, copied, modified or renamed in the git index.
+
+    :param paths: the directories to list the files of.
+    :param suffix: the extension of the files to list.
+    :return: the paths of the files, relative to the repository root.
+    """
+    result = subprocess.run(  # nosec
+        ["git", "diff", "--cached", "--name-only", "--diff-filter=ACMR", "-z"]
+        + ["--", *map(str, paths)],
+        check=True,
+        capture_output=True,
+    )
+    return [
+        name
+        for name in result.stdout.decode("utf-8").split("\0")
+        if name.endswith(suffix)
+    ]
+
+
+def read_staged(files: List[str]) -> Dict[str, bytes]:
+    """
+    Read the content of files from the git index, in a single `git cat-file` call.
+
+    :param files: the paths of the files, relative to the repository root.
+    :return: the content of each file, files missing from the index are left out.
+    """
+    result = subprocess.run(  # nosec
+        ["git", "cat-file", "--batch"],
+        input="".join(f":{file}\n" for file in files).encode("utf-8"),
+        check=True,
+        capture_output=True,
+    )
+    output = result.stdout
+    blobs: Dict[str, bytes] = {}
+    position = 0
+    for file in files:
+        # `<object> blob <size>` followed by the content, or `<name> missing`
+        header_end = output.index(b"\n", position)
+        header = output[position:header_end]
+        position = header_end + 1
+        if header.endswith(b" missing"):
+            continue
+        size = int(header.rsplit(b" ", 1)[1])
+        blobs[file] = output[position : position + size]
+        position += size + 1
+    return blobs
+
+
+def check_staged_hashes(
+    paths: Optional[List[Path]] = None, report: Optional[Report] = None
+) -> None:
+    """
+    Check the hashes in the staged doc files, for a pre-commit hook.
+
+    The docs and `packages.json` are read from the git index, so the content
+    about to be committed is checked rather than the working tree. Neither
+    package configurations nor `aea` are loaded, and nothing is fixed.
+
+    :param paths: the directories of the doc files to check.
+    :param report: the report the findings are added to.
+    """
+    report = report or Report(check="doc-ipfs-hashes")
+    with report.phase("registry load"):
+        files = staged_files(paths or [Path("docs")])
+        if not files:
+            print("No staged doc files to check.")
+            return
+        blobs = read_staged([PACKAGES_FILE.as_posix(), *files])
+        packages_json = blobs.get(PACKAGES_FILE.as_posix())
+        if packages_json is None:  # not tracked, check against the working tree
+            packages_json = PACKAGES_FILE.read_bytes()
+        package_manager = PackageHashManager(
+            packages=flatten_packages(json.loads(packages_json))
+        )
 
-    # Fix packages in python files
-    all_py_files: List[str] = []
-    for py_file in all_py_files:
-        content = read_file(str(py_file))
-        for match in [m.groupdict() for m in re.finditer(FULL_PACKAGE_REGEX, content)]:
-            full_package = match["full_package"]
-            py_hash = match["hash"]
-            expected_hash = package_manager.get_hash_by_package_line(
-                full_package, str(py_file)
+    failed = False
+    with report.phase("scan"):
+        for file in files:
+            scan = scan_doc(
+                Path(file),
+                package_manager,
+                content=blobs[file].decode("utf-8", "replace"),
             )
-            if not expected_hash:
-                errors = True
-                continue
-            expected_package = package_manager.get_package_by_hash(expected_hash)
-            if not expected_package:
-                errors = True
-                continue
+            failed = failed or scan.errors or scan.hash_mismatches
+            for finding in scan.findings:
+                report.add(finding)
+            print(scan.output, end="")
 
-            new_package = (":").join(full_package.split(":")[:-1] + [expected_hash])
+    if failed:
+        print("There are mismatching IPFS hashes in the staged docs.")
+        sys.exit(1)
 
-            # Overwrite with new hash
-            if py_hash == expected_hash:
-                continue
+    print("Checking doc IPFS hashes finished successfully.")
 
-            hash_mismatches = True
 
-            if fix:
-                content = content.replace(full_package, new_package)
+def check_ipfs_hashes(  # pylint: disable=too-many-locals,too-many-statements,too-many-branches,too-many-arguments
+    paths: Optional[List[Path]] = None,
+    fix: bool = False,
+    no_cache: bool = False,
+    report: Optional[Report] = None,
+    workers: int = 1,
+    py_paths: Optional[List[Path]] = None,
+    hash_map: Optional[Path] = None,
+) -> None:
+    """Fix ipfs hashes in the docs and in the string literals of Python files"""
 
-                with open(str(py_file), "w", encoding="utf-8") as qs_file:
-                    qs_file.write(content)
-                print(f"Fixed an IPFS hash in doc file {py_file}")
-                old_to_new_hashes[py_hash] = expected_hash
-            else:
-                print(
-                    f"IPFS hash mismatch on file {py_file}.\n"
-                    f"\tPackage: {full_package}\n"
-                    f"\tExpected: {expected_hash}\n,"
-                    f"\tFound: {py_hash}:\n"
-                )
+    if paths is None:
+        paths = [Path("docs")]
+    if py_paths is None:
+        py_paths = [Path("packages"), Path("scripts")]
+    report = report or Report(check="doc-ipfs-hashes")
+
+    all_files = sorted(
+        itertools.chain.from_iterable([path.rglob("*.md") for path in paths])
+    ) + sorted(itertools.chain.from_iterable([path.rglob("*.py") for path in py_paths]))
+    errors = False
+    hash_mismatches = False
+    old_to_new_hashes = {}
+    with report.phase("registry load"):
+        # the history is only read from git when an unknown hash is looked up
+        history = None if no_cache else HashHistory(file=HASH_HISTORY_FILE)
+        if history is not None and workers > 1:
+            # the workers get a copy of it, so it is updated once beforehand
+            history.update()
+        package_manager = PackageHashManager(history=history)
+        doc_cache = DocScanCache(file=None if no_cache else DOC_CACHE_FILE)
+        doc_cache.set_registry(
+            packages_file=PACKAGES_FILE,
+            packages=package_manager.package_hashes,
+        )
+    matches = 0
+
+    # Fix full commands in docs and packages in python files
+    with report.phase("scan"):
+        cached: Dict[Path, DocScan] = {}
+        for file in all_files:
+            data = doc_cache.get(file)
+            # mismatches are rescanned in fix mode, to be fixed
+            if data is not None and not (fix and data["hash_mismatches"]):
+                cached[file] = DocScan.from_json(file=file, data=data)
+        scanned = scan_files(
+            files=[file for file in all_files if file not in cached],
+            package_manager=package_manager,
+            fix=fix,
+            workers=workers,
+        )
+        # merge the cached and scanned results in file order
+        with closing(scanned):
+            for file in all_files:
+                scan = cached[file] if file in cached else next(scanned)
+                if file not in cached and not scan.fixes.applied:
+                    doc_cache.set(
+                        doc_file=file,
+                        scan=scan.to_json(),
+                        hashes=scan.references.hashes,
+                        packages=scan.references.packages,
+                    )
+                matches += scan.references.count
+                errors = errors or scan.errors
+                hash_mismatches = hash_mismatches or scan.hash_mismatches
+                for finding in scan.findings:
+                    report.add(finding)
+                old_to_new_hashes.update(scan.fixes.old_to_new_hashes)
+                if scan.fixes.content is not None:
+                    with report.phase("write"):
+                        write_file(str(scan.file), scan.fixes.content)
+                elif scan.fixes.edits:
+                    with report.phase("write"):
+                        write_edits(str(scan.file), scan.fixes.edits)
+                print(scan.output, end="")
+        doc_cache.dump()
+        if history is not None:
+            history.dump()
+
+    if hash_map is not None:
+        export_hash_map(hash_map, old_to_new_hashes)
 
     if fix and errors:
         raise ValueError(
@@ -362,9 +1168,51 @@ def check_ipfs_hashes(  # pylint: disable=too-many-locals,too-many-statements
 
 
 if __name__ == "__main__":
-    print("Start checking doc IPFS hashes.")
     parser = argparse.ArgumentParser()
     parser.add_argument("--fix", action="store_true")
     parser.add_argument("-p", "--paths", type=Path, nargs="*", default=[Path("docs")])
+    parser.add_argument(
+        "--py-paths",
+        type=Path,
+        nargs="*",
+        default=[Path("packages"), Path("scripts")],
+        help="Directories of the Python files whose string literals are checked.",
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument(
+        "--hash-map",
+        type=Path,
+        help="Export the map of the outdated hashes found to their current hash to this JSON file.",
+    )
+    parser.add_argument("--report", choices=REPORT_FORMATS, default="text")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes used to scan the files.",
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Only check the doc files staged for commit, as in the git index. "
+        "Run it as `python -m scripts.check_doc_ipfs_hashes --staged` in hooks.",
+    )
     args = parser.parse_args()
-    check_ipfs_hashes(paths=args.paths, fix=args.fix)
+    if args.staged and args.fix:
+        parser.error("--staged only checks the hashes, it cannot be used with --fix")
+    run_report = Report(check="doc-ipfs-hashes")
+    with run_report.output(args.report):
+        print("Start checking doc IPFS hashes.")
+        if args.staged:
+            check_staged_hashes(paths=args.paths, report=run_report)
+        else:
+            check_ipfs_hashes(
+                paths=args.paths,
+                fix=args.fix,
+                no_cache=args.no_cache,
+                report=run_report,
+                workers=args.workers,
+                py_paths=args.py_paths,
+                hash_map=args.hash_map,
+            )
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Round-trip tokenizer for the dependency sections of Pipfile, tox.ini and pyproject.toml.
+
+The content is scanned once, line by line, and the span of every dependency
+entry is recorded. Rewrites only replace those spans, so everything else in the
+file (comments, blank lines, ordering, other sections) is preserved as is.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+PIPFILE_FORMAT = "pipfile"
+PYPROJECT_FORMAT = "pyproject"
+TOX_FORMAT = "tox"
+
+PIPFILE_SECTIONS = ("[packages]", "[dev-packages]")
+PYPROJECT_SECTION_RE = re.compile(
+    r"^\[tool\.poetry\.(dependencies|dev-dependencies|group\.[^\]]+\.dependencies)\]$"
+)
+TOML_ENTRY_RE = re.compile(r"^\"?(?P<name>[A-Za-z0-9_.\-]+)\"?\s*=")
+TOX_DEPS_RE = re.compile(r"^deps\s*=")
+# a comment after a TOML value, outside of any string
+TOML_COMMENT_RE = re.compile(r"\s+#[^\"']*$")
+
+
+class DependencyEntry:  # pylint: disable=too-few-public-methods
+    """A dependency entry located in a config file."""
+
+    __slots__ = ("section", "name", "start", "end", "text")
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, section: str, name: str, start: int, end: int, text: str
+    ) -> None:
+        """
+        Initialize object.
+
+        :param section: the header of the section containing the entry.
+        :param name: the dependency name, for TOML files the key of the entry.
+        :param start: offset of the first character of the entry.
+        :param end: offset after the last character of the entry.
+        :param text: the entry text, without indentation, trailing comment and line break.
+        """
+        self.section = section
+        self.name = name
+        self.start = start
+        self.end = end
+        self.text = text
+
+
+def apply_edits(content: str, edits: Iterable[Tuple[int, int, str]]) -> str:
+    """
+    Replace non-overlapping spans of a string in a single pass.
+
+    :param content: the original content.
+    :param edits: triples of start offset, end offset and replacement text.
+    :return: the edited content.
+    """
+    chunks = []
+    position = 0
+    for start, end, text in sorted(edits, key=lambda edit: edit[:2]):
+        chunks.append(content[position:start])
+        chunks.append(text)
+        position = end
+    chunks.append(content[position:])
+    return "".join(chunks)
+
+
+class ConfigDocument:
+    """Dependency entries located in the content of a config file."""
+
+    def __init__(
+        self,
+        content: str,
+        entries: List[DependencyEntry],
+        sections: Dict[str, Tuple[int, int]],
+        headers: Dict[str, int],
+    ) -> None:
+        """
+        Initialize object.
+
+        :param content: the file content.
+        :param entries: the dependency entries, in file order.
+        :param sections: start and end offsets of the dependency block of each section.
+        :param headers: offset of the header line of each section.
+        """
+        self.content = content
+        self.entries = entries
+        self.sections = sections
+        self.headers = headers
+
+    @classmethod
+    def parse(  # pylint: disable=too-many-locals
+        cls, content: str, file_format: str
+    ) -> "ConfigDocument":
+        """
+        Tokenize the dependency sections of a config file.
+
+        For TOML files the dependency block of a section runs from its header to
+        its last entry, for tox.ini from the `deps` key to its last continuation line.
+
+        :param content: the file content.
+        :param file_format: one of `pipfile`, `pyproject` or `tox`.
+        :return: the tokenized document.
+        """
+        entries = []
+        sections: Dict[str, Tuple[int, int]] = {}
+        headers: Dict[str, int] = {}
+        section = ""
+        in_deps = False
+        offset = 0
+        for line in content.splitlines(keepends=True):
+            start, offset = offset, offset + len(line)
+            stripped = line.strip()
+            if stripped.startswith("["):
+                section = stripped
+                headers.setdefault(section, start)
+                in_deps = file_format != TOX_FORMAT and (
+                    section in PIPFILE_SECTIONS
+                    if file_format == PIPFILE_FORMAT
+                    else PYPROJECT_SECTION_RE.match(section) is not None
+                )
+                if in_deps:
+                    sections[section] = (offset, offset)
+                continue
+
+            if file_format == TOX_FORMAT:
+                if TOX_DEPS_RE.match(line):
+                    in_deps = True
+                    sections[section] = (offset, offset)
+                    continue
+                if in_deps and not line.startswith((" ", "\t")):
+                    in_deps = False
+                if not in_deps:
+                    continue
+                sections[section] = (sections[section][0], offset)
+                if stripped == "" or stripped.startswith(("{", ";", "#")):
+                    continue
+                name = re.split(r"[\[<>=!~;@ ]", stripped, maxsplit=1)[0]
+            else:
+                match = TOML_ENTRY_RE.match(stripped)
+                if not in_deps or match is None:
+                    continue
+                name = match.group("name")
+                sections[section] = (sections[section][0], offset)
+                # edits replace the value and keep the comment after it
+                stripped = TOML_COMMENT_RE.sub("", stripped)
+
+            entry_start = start + len(line) - len(line.lstrip())
+            entries.append(
+                DependencyEntry(
+                    section=section,
+                    name=name,
+                    start=entry_start,
+                    end=entry_start + len(stripped),
+                    text=stripped,
+                )
+            )
+        return cls(content=content, entries=entries, sections=sections, headers=headers)
+
+    def line(self, name: str) -> Optional[int]:
+        """
+        Get the line number of the entry defining a dependency.
+
+        :param name: the dependency name.
+        :return: the 1-based line number of the last entry for the name, if any.
+        """
+        for entry in reversed(self.entries):
+            if entry.name == name:
+                return self.content.count("\n", 0, entry.start) + 1
+        return None
+
+    def patch(
+        self,
+        replacements: Iterable[Tuple[DependencyEntry, str]],
+        insertions: Optional[Dict[str, List[str]]] = None,
+    ) -> str:
+        """
+        Apply edits to the content in a single pass.
+
+        :param replacements: pairs of entry and replacement text for the entry.
+        :param insertions: lines to insert at the end of each section; sections
+                           not present in the file are appended to the content.
+        :return: the updated content.
+        """
+        edits = [(entry.start, entry.end, text) for entry, text in replacements]
+        trailer = []
+        for section, lines in (insertions or {}).items():
+            if not lines:
+                continue
+            block = "".join(f"{line}\n" for line in lines)
+            if section in self.sections:
+                _, position = self.sections[section]
+                if self.content[position - 1 : position] != "\n":
+                    block = "\n" + block
+                edits.append((position, position, block))
+            else:
+                trailer.append(f"\n{section}\n{block}")
+
+        if trailer and not self.content.endswith("\n"):
+            trailer.insert(0, "\n")
+        content_end = len(self.content)
+        edits.append((content_end, content_end, "".join(trailer)))
+        return apply_edits(self.content, edits)
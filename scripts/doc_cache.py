@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Persistent cache of the doc IPFS hash check results.
+
+Each entry stores the size, modification time and sha256 digest of a doc or
+Python file when it was checked, the result of the check and the hashes and
+packages the file references. Entries are kept per repository, together with
+the content of the `packages.json` file the files were checked against.
+
+A cached result is reused when the file did not change. When `packages.json`
+changes, only the results of the files referencing a hash or a package that was
+added, removed or updated in it are dropped. Files whose size and modification
+time did not change are trusted without being read.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+
+
+try:
+    from scripts.json_cache import dump_json_cache, load_json_cache
+except ImportError:  # pragma: nocover
+    from json_cache import dump_json_cache, load_json_cache  # type: ignore
+
+
+DOC_CACHE_FILE = Path.home() / ".aea" / ".doccache"
+DOC_CACHE_FORMAT = 3
+CHUNK_SIZE = 1 << 20
+
+
+def _file_digest(file: Path) -> str:
+    """Get the sha256 digest of a file, reading it in chunks."""
+    digest = hashlib.sha256()
+    with file.open("rb") as stream:
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _package_name(package_id: str) -> str:
+    """Get the `vendor/name` part of a package id like `skill/vendor/name/0.1.0`."""
+    _, vendor, name, *_ = package_id.split("/")
+    return f"{vendor}/{name}"
+
+
+class DocScanCache:
+    """On-disk cache of the doc IPFS hash check results."""
+
+    def __init__(
+        self, file: Optional[Path] = DOC_CACHE_FILE, root: Optional[Path] = None
+    ) -> None:
+        """
+        Initialize object.
+
+        :param file: path to the cache file, use `None` to keep the cache in memory only.
+        :param root: the repository root, the current directory by default.
+        """
+        self.file = file
+        self._repos: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._repos.update(load_json_cache(file, DOC_CACHE_FORMAT).get("repos", {}))
+        self._repo = self._repos.setdefault(
+            str((root or Path.cwd()).resolve()),
+            {"registry": None, "packages": {}, "files": {}},
+        )
+
+    @property
+    def _files(self) -> Dict[str, Dict[str, Any]]:
+        """The entries of the doc files of the repository."""
+        return self._repo["files"]
+
+    def set_registry(self, packages_file: Path, packages: Dict[str, str]) -> None:
+        """
+        Set the registry the docs are checked against.
+
+        :param packages_file: path to `packages.json`.
+        :param packages: the package hashes, by package id.
+        """
+        digest = hashlib.sha256(packages_file.read_bytes()).hexdigest()
+        if digest == self._repo["registry"]:
+            return
+
+        # drop the results of the files referencing a changed package, whether
+        # they are checked in this run or not
+        previous: Dict[str, str] = self._repo["packages"]
+        affected_hashes: Set[str] = set()
+        affected_packages: Set[str] = set()
+        for package_id in previous.keys() | packages.keys():
+            if previous.get(package_id) == packages.get(package_id):
+                continue
+            affected_packages.add(_package_name(package_id))
+            for package_hash in (previous.get(package_id), packages.get(package_id)):
+                if package_hash is not None:
+                    affected_hashes.add(package_hash)
+        for path, entry in list(self._files.items()):
+            if self._repo["registry"] is None or not (
+                affected_hashes.isdisjoint(entry["hashes"])
+                and affected_packages.isdisjoint(entry["packages"])
+            ):
+                del self._files[path]
+
+        self._repo["registry"] = digest
+        self._repo["packages"] = dict(packages)
+        self._dirty = True
+
+    def get(self, doc_file: Path) -> Optional[Dict[str, Any]]:
+        """Get the cached check result of a doc file, if it is still valid."""
+        if not self._files:
+            return None
+        entry = self._files.get(os.path.abspath(doc_file))
+        if entry is None:
+            return None
+
+        stat = doc_file.stat()
+        if (entry["size"], entry["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+            if _file_digest(doc_file) != entry["sha256"]:
+                return None
+            entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+            self._dirty = True
+        return entry["scan"]
+
+    def set(
+        self,
+        doc_file: Path,
+        scan: Dict[str, Any],
+        hashes: Iterable[str],
+        packages: Iterable[str],
+    ) -> None:
+        """
+        Store the check result of the current content of a doc file.
+
+        :param doc_file: the doc file.
+        :param scan: the check result.
+        :param hashes: the hashes referenced in the file.
+        :param packages: the `vendor/name` of the packages referenced in the file.
+        """
+        if self.file is None:  # nothing to reuse it in this run
+            return
+        stat = doc_file.stat()
+        self._files[os.path.abspath(doc_file)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": _file_digest(doc_file),
+            "hashes": sorted(hashes),
+            "packages": sorted(packages),
+            "scan": scan,
+        }
+        self._dirty = True
+
+    def dump(self) -> None:
+        """Write the cache file, dropping the entries of deleted files."""
+        for path in [path for path in self._files if not os.path.exists(path)]:
+            del self._files[path]
+            self._dirty = True
+        if self.file is None or not self._dirty:
+            return
+        dump_json_cache(self.file, DOC_CACHE_FORMAT, {"repos": self._repos})
+        self._dirty = False
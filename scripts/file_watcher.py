@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Wait for changes to a set of files.
+
+When `watchdog` is installed, file system events (inotify on Linux) wake the
+watcher up as soon as a file is written, otherwise the files are polled. In both
+cases the modification time and size of the watched files decide what changed,
+so the bursts of events editors produce while saving are reported only once.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: nocover
+    FileSystemEventHandler = object  # type: ignore
+    Observer = None  # type: ignore
+
+
+POLL_INTERVAL = 0.5
+SETTLE_INTERVAL = 0.05
+
+Stat = Optional[Tuple[int, int]]
+
+
+def _stat(file: Path) -> Stat:
+    """Get the modification time and size of a file, `None` if it does not exist."""
+    try:
+        stat = file.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _WakeUpHandler(FileSystemEventHandler):  # type: ignore
+    """Set an event on any file system event."""
+
+    def __init__(self, event: threading.Event) -> None:
+        """Initialize object."""
+        super().__init__()
+        self.event = event
+
+    def on_any_event(self, event: Any) -> None:
+        """Wake the watcher up."""
+        self.event.set()
+
+
+class FileWatcher:
+    """Wait for changes to a set of files."""
+
+    def __init__(
+        self,
+        directories: Iterable[Path] = (),
+        recursive: Iterable[Path] = (),
+        interval: float = POLL_INTERVAL,
+    ) -> None:
+        """
+        Initialize object.
+
+        :param directories: directories directly containing watched files.
+        :param recursive: directories containing watched files at any depth.
+        :param interval: seconds between polls when file system events are not available.
+        """
+        self.interval = interval
+        self._stats: Dict[Path, Stat] = {}
+        self._event = threading.Event()
+        self._observer = None
+        if Observer is not None:
+            self._observer = Observer()
+            handler = _WakeUpHandler(self._event)
+            for directory in set(directories):
+                self._observer.schedule(handler, str(directory), recursive=False)
+            for directory in set(recursive):
+                self._observer.schedule(handler, str(directory), recursive=True)
+            self._observer.start()
+
+    @property
+    def polling(self) -> bool:
+        """Whether the files are polled."""
+        return self._observer is None
+
+    def watch(self, files: Iterable[Path]) -> None:
+        """Set the watched files, keeping the state of the ones already watched."""
+        files = set(files)
+        self._stats = {
+            file: self._stats[file] if file in self._stats else _stat(file)
+            for file in files
+        }
+
+    def wait(self) -> Set[Path]:
+        """
+        Block until at least one of the watched files changes.
+
+        :return: the changed files, including the removed ones.
+        """
+        while True:
+            if self._event.wait(timeout=self.interval if self.polling else None):
+                # let the writer finish before looking at the files
+                time.sleep(SETTLE_INTERVAL)
+                self._event.clear()
+            changed = self._scan()
+            if changed:
+                return changed
+
+    def _scan(self) -> Set[Path]:
+        """Update the state of the watched files, returning the changed ones."""
+        changed = set()
+        for file, previous in self._stats.items():
+            current = _stat(file)
+            if current != previous:
+                self._stats[file] = current
+                changed.add(file)
+        return changed
+
+    def stop(self) -> None:
+        """Stop listening to file system events."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
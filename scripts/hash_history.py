@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Index of every package hash ever published in the git history of `packages.json`.
+
+Hashes that are no longer in `packages.json` can be mapped back to the package
+id and version they were published for, so outdated references can be reported
+and fixed even when they only consist of a hash.
+
+The index is built from the patches of `packages.json` in a single `git log`
+call and persisted per repository, together with the last indexed commit, so
+later updates only read the new commits.
+"""
+
+import re
+import subprocess  # nosec
+from pathlib import Path
+from typing import Dict, Optional
+
+
+try:
+    from scripts.json_cache import dump_json_cache, load_json_cache
+except ImportError:  # pragma: nocover
+    from json_cache import dump_json_cache, load_json_cache  # type: ignore
+
+
+HASH_HISTORY_FILE = Path.home() / ".aea" / ".hashhistory"
+HASH_HISTORY_FORMAT = 1
+PACKAGES_FILE = Path("packages", "packages.json")
+
+# an entry added or removed by a patch, e.g. `+    "skill/valory/abci/0.1.0": "bafy..."`
+ENTRY_PATTERN = re.compile(
+    r'^[+-]\s*"(?P<package_id>[a-z_]+/[^"/]+/[^"/]+/[^"/]+)"\s*:\s*"(?P<hash>[a-zA-Z0-9]+)"',
+    re.MULTILINE,
+)
+
+
+def _git(root: Path, *args: str) -> subprocess.CompletedProcess:
+    """Run a git command in a repository."""
+    return subprocess.run(  # nosec
+        ["git", *args], cwd=root, check=False, capture_output=True, text=True
+    )
+
+
+class HashHistory:
+    """Index of the package ids of all the hashes published in a repository."""
+
+    def __init__(
+        self, file: Optional[Path] = HASH_HISTORY_FILE, root: Optional[Path] = None
+    ) -> None:
+        """
+        Initialize object.
+
+        :param file: path to the index file, use `None` to keep the index in memory only.
+        :param root: the repository root, the current directory by default.
+        """
+        self.file = file
+        self.root = (root or Path.cwd()).resolve()
+        self._repos: Dict[str, Dict] = {}
+        self._dirty = False
+        self._updated = False
+        self._repos.update(load_json_cache(file, HASH_HISTORY_FORMAT).get("repos", {}))
+        self._repo = self._repos.setdefault(
+            str(self.root), {"head": None, "hashes": {}}
+        )
+
+    @property
+    def hashes(self) -> Dict[str, str]:
+        """The package id each hash was published for."""
+        return self._repo["hashes"]
+
+    def get(self, package_hash: str) -> Optional[str]:
+        """Get the package id a hash was published for, e.g. `skill/valory/abci/0.1.0`."""
+        # unknown hashes may have been published since the last update
+        if package_hash not in self.hashes and not self._updated:
+            self.update()
+        return self.hashes.get(package_hash)
+
+    def update(self) -> None:
+        """Index the commits made since the last update, doing nothing outside git."""
+        self._updated = True
+        head = _git(self.root, "rev-parse", "HEAD")
+        if head.returncode != 0:
+            return
+        commit = head.stdout.strip()
+        indexed = self._repo["head"]
+        if indexed == commit:
+            return
+
+        # the history was rewritten, e.g. by a rebase, so it is indexed again
+        if (
+            indexed is not None
+            and _git(
+                self.root, "merge-base", "--is-ancestor", indexed, commit
+            ).returncode
+            != 0
+        ):
+            indexed = None
+            self.hashes.clear()
+
+        log = _git(
+            self.root,
+            "log",
+            "--reverse",
+            "--format=",
+            "--patch",
+            "--unified=0",
+            commit if indexed is None else f"{indexed}..{commit}",
+            "--",
+            str(PACKAGES_FILE),
+        )
+        if log.returncode != 0:
+            return
+        for match in ENTRY_PATTERN.finditer(log.stdout):
+            self.hashes[match.group("hash")] = match.group("package_id")
+        self._repo["head"] = commit
+        self._dirty = True
+
+    def dump(self) -> None:
+        """Write the index file."""
+        if self.file is None or not self._dirty:
+            return
+        dump_json_cache(self.file, HASH_HISTORY_FORMAT, {"repos": self._repos})
+        self._dirty = False
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Reading and writing of the JSON cache files of the scripts.
+
+Each cache file is a JSON object with a `format` version next to its data, so
+files written by an older version of a cache are ignored instead of misread.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def load_json_cache(file: Optional[Path], cache_format: int) -> Dict[str, Any]:
+    """
+    Load a cache file.
+
+    :param file: path to the cache file, `None` for in-memory caches.
+    :param cache_format: the format version the cache file must have.
+    :return: the data of the cache, empty if the file is missing, unreadable or of another format.
+    """
+    if file is None or not file.exists():
+        return {}
+    try:
+        data = json.loads(file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != cache_format:
+        return {}
+    return data
+
+
+def dump_json_cache(file: Path, cache_format: int, data: Dict[str, Any]) -> None:
+    """
+    Write a cache file.
+
+    The data is written to a temporary file that is then renamed, so scripts
+    running in parallel (e.g. `tox -p`) never read a half-written cache. The
+    temporary file is removed if writing fails.
+
+    :param file: path to the cache file.
+    :param cache_format: the format version of the cache.
+    :param data: the data of the cache.
+    """
+    file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=file.parent, prefix=file.name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as stream:
+            json.dump({"format": cache_format, **data}, stream)
+        os.replace(tmp, file)
+    except BaseException:
+        os.remove(tmp)
+        raise
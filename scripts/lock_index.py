@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Streaming index of the packages locked in a `poetry.lock` file.
+
+The lock file is read line by line and only the name, version, file hashes and
+line number of each locked package are kept, so the whole TOML document is never
+held in memory. Both the current lock format, with the hashes in the `files` key
+of each package, and the older one, with the hashes under `[metadata.files]`, are
+supported.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+PACKAGE_HEADER = "[[package]]"
+METADATA_FILES_HEADER = "[metadata.files]"
+
+KEY_RE = re.compile(r'^(?P<key>name|version)\s*=\s*"(?P<value>[^"]*)"')
+HASH_RE = re.compile(r'hash\s*=\s*"(?P<hash>[^"]+)"')
+FILES_KEY_RE = re.compile(r'^"?(?P<name>[A-Za-z0-9_.\-]+)"?\s*=\s*\[')
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name as described in PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class LockedPackage:  # pylint: disable=too-few-public-methods
+    """A package locked in `poetry.lock`."""
+
+    __slots__ = ("name", "version", "hashes", "line")
+
+    def __init__(self, line: int) -> None:
+        """
+        Initialize object.
+
+        :param line: the 1-based line number of the `[[package]]` table.
+        """
+        self.name = ""
+        self.version = ""
+        self.hashes: List[str] = []
+        self.line = line
+
+
+def read_lock(file: Path) -> Dict[str, LockedPackage]:
+    """
+    Index the packages locked in a `poetry.lock` file.
+
+    :param file: path to the lock file.
+    :return: the locked packages, by normalized name.
+    """
+    packages: Dict[str, LockedPackage] = {}
+    section = ""
+    current: Optional[LockedPackage] = None
+    with file.open("r", encoding="utf-8") as stream:
+        for number, line in enumerate(stream, start=1):
+            stripped = line.strip()
+            if stripped.startswith("["):
+                section = stripped
+                current = (
+                    LockedPackage(line=number) if section == PACKAGE_HEADER else None
+                )
+                continue
+
+            if section == PACKAGE_HEADER and current is not None:
+                match = KEY_RE.match(stripped)
+                if match is not None:
+                    setattr(current, match.group("key"), match.group("value"))
+                    if match.group("key") == "name":
+                        packages[normalize_name(current.name)] = current
+                    continue
+            elif section == METADATA_FILES_HEADER:
+                match = FILES_KEY_RE.match(stripped)
+                if match is not None:
+                    current = packages.get(normalize_name(match.group("name")))
+
+            if current is not None and stripped.startswith("{"):
+                match = HASH_RE.search(stripped)
+                if match is not None:
+                    current.hashes.append(match.group("hash"))
+    return packages
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Persistent cache of parsed package configurations.
+
+Entries are keyed by the sha256 digest of the configuration file content, so an
+entry can never be stale: editing a file changes its digest and the next lookup
+misses. Each entry stores the package id, the version, the ids of the packages it
+depends on and its PyPI dependencies, in the JSON form used by
+`aea.configurations.base`. Only configurations passing the validation of
+`load_configuration` are cached.
+
+The cache is shared by all the scripts in this directory.
+"""
+
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from typing import OrderedDict as OrderedDictType
+
+from aea.configurations.base import dependencies_from_json, dependencies_to_json
+from aea.configurations.constants import CONFIG_FILE_TO_PACKAGE_TYPE
+from aea.configurations.data_types import Dependency, PackageId, PackageType
+from aea.configurations.loader import ConfigLoader
+from aea.helpers.yaml_utils import yaml_load_all
+
+
+try:
+    from scripts.json_cache import dump_json_cache, load_json_cache
+except ImportError:  # pragma: nocover
+    from json_cache import dump_json_cache, load_json_cache  # type: ignore
+
+
+CACHE_FILE = Path.home() / ".aea" / ".configcache"
+CACHE_FORMAT = 3
+MAX_ENTRIES = 20_000
+
+
+def make_entry(
+    package_type: str,
+    config: Dict[str, Any],
+    dependencies: Dict[str, Dependency],
+    package_dependencies: Iterable[PackageId],
+) -> Dict[str, Any]:
+    """
+    Make a cache entry.
+
+    :param package_type: the package type, e.g. `skill`.
+    :param config: the first document of the package configuration.
+    :param dependencies: the PyPI dependencies of the package.
+    :param package_dependencies: the packages this package depends on.
+    :return: the cache entry.
+    """
+    name = config.get("name", config.get("agent_name"))
+    version = config.get("version")
+    return {
+        "package_id": f"{package_type}/{config.get('author')}/{name}/{version}",
+        "version": version,
+        "package_dependencies": sorted(
+            package_id.to_uri_path for package_id in package_dependencies
+        ),
+        "dependencies": dependencies_to_json(dependencies),
+    }
+
+
+def read_config_file(config_file: Path) -> List[Dict[str, Any]]:
+    """
+    Read the YAML documents of a package configuration file.
+
+    :param config_file: path to the package configuration file.
+    :return: the documents, the configuration first and then its overrides.
+    """
+    with config_file.open("r", encoding="utf-8") as stream:
+        return yaml_load_all(stream=stream)
+
+
+def entry_from_documents(
+    package_type: str, documents: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Validate the documents of a package configuration and make its cache entry.
+
+    The validation is that of `aea.package_manager.base.load_configuration`, so
+    only valid configurations are ever cached.
+
+    :param package_type: the package type, e.g. `skill`.
+    :param documents: the documents of the configuration file.
+    :return: the cache entry.
+    """
+    loader = ConfigLoader.from_configuration_type(
+        PackageType(package_type), skip_aea_validation=True
+    )
+    if package_type == PackageType.AGENT.value:
+        configuration = loader.load_agent_config_from_json(documents)
+    else:
+        loader.validate(documents[0])
+        configuration = loader.configuration_class.from_json(documents[0])
+    return make_entry(
+        package_type=package_type,
+        config={
+            "author": configuration.author,
+            "name": configuration.name,
+            "version": configuration.version,
+        },
+        dependencies=configuration.dependencies,
+        package_dependencies=(
+            PackageId(
+                package_type=str(component_id.component_type),
+                public_id=component_id.public_id,
+            )
+            for component_id in configuration.package_dependencies
+        ),
+    )
+
+
+def parse_config_file(config_file: Path) -> Dict[str, Any]:
+    """
+    Parse and validate a package configuration file into a cache entry.
+
+    :param config_file: path to the package configuration file.
+    :return: the cache entry.
+    """
+    return entry_from_documents(
+        package_type=CONFIG_FILE_TO_PACKAGE_TYPE[config_file.name],
+        documents=read_config_file(config_file),
+    )
+
+
+def get_dependencies(entry: Dict[str, Any]) -> Dict[str, Dependency]:
+    """Get the dependencies from a cache entry as `Dependency` objects."""
+    return dependencies_from_json(entry["dependencies"])
+
+
+class PackageConfigCache:
+    """On-disk cache of parsed package configurations."""
+
+    def __init__(
+        self, file: Optional[Path] = CACHE_FILE, max_entries: int = MAX_ENTRIES
+    ) -> None:
+        """
+        Initialize object.
+
+        :param file: path to the cache file, use `None` to keep the cache in memory only.
+        :param max_entries: maximum number of entries kept when dumping the cache.
+        """
+        self.file = file
+        self.max_entries = max_entries
+        self._entries: OrderedDictType[str, Dict[str, Any]] = OrderedDict()
+        self._digests: Dict[Path, str] = {}
+        self._dirty = False
+        self._entries.update(load_json_cache(file, CACHE_FORMAT).get("entries", {}))
+
+    def digest(self, config_file: Path) -> str:
+        """Get the content digest for a configuration file."""
+        path = config_file.resolve()
+        if path not in self._digests:
+            self._digests[path] = hashlib.sha256(path.read_bytes()).hexdigest()
+        return self._digests[path]
+
+    def invalidate(self, config_file: Path) -> None:
+        """Forget the content digest of a configuration file that changed on disk."""
+        self._digests.pop(config_file.resolve(), None)
+
+    def get(self, config_file: Path) -> Optional[Dict[str, Any]]:
+        """Get the cached entry for the current content of a configuration file."""
+        digest = self.digest(config_file)
+        entry = self._entries.get(digest)
+        if entry is not None:
+            self._entries.move_to_end(digest)
+        return entry
+
+    def set(self, config_file: Path, entry: Dict[str, Any]) -> None:
+        """Store an entry for the current content of a configuration file."""
+        self.invalidate(config_file)
+        self._entries[self.digest(config_file)] = entry
+        self._dirty = True
+
+    def get_or_parse(self, config_file: Path) -> Dict[str, Any]:
+        """Get the cached entry for a configuration file, parsing it on a miss."""
+        entry = self.get(config_file)
+        if entry is None:
+            entry = parse_config_file(config_file)
+            self.set(config_file, entry)
+        return entry
+
+    def dump(self) -> None:
+        """Write the cache file, keeping the most recently used entries."""
+        if self.file is None or not self._dirty:
+            return
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        dump_json_cache(self.file, CACHE_FORMAT, {"entries": self._entries})
+        self._dirty = False
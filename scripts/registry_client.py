@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Query the registry daemon of a repository.
+
+The daemon, see `registry_daemon.py`, keeps the package index and the
+dependency model of a repository in memory and answers on a Unix socket.
+Requests and responses are JSON objects, one per line:
+
+    {"query": "resolve_hash", "hash": "bafybei..."}
+    {"query": "expected_hash", "package": "valory/abci", "type": "skill"}
+    {"query": "check", "file": "docs/guide.md", "content": "..."}
+    {"query": "conflicts", "dependency": "requests"}
+
+are answered with `{"ok": true, "result": ...}` or `{"ok": false, "error": "..."}`.
+Only the standard library is used here, so editors and git hooks querying the
+daemon do not pay for importing `aea`.
+"""
+
+import argparse
+import hashlib
+import json
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+SOCKET_DIR = Path.home() / ".aea" / "daemons"
+TIMEOUT = 10.0
+
+
+def socket_path(root: Path) -> Path:
+    """Get the socket the daemon of a repository listens on."""
+    digest = hashlib.sha256(str(root.resolve()).encode("utf-8")).hexdigest()[:16]
+    return SOCKET_DIR / f"registry-{digest}.sock"
+
+
+def query(
+    request: Dict[str, Any], path: Optional[Path] = None, timeout: float = TIMEOUT
+) -> Any:
+    """
+    Send a query to the registry daemon.
+
+    :param request: the query, see the module docstring.
+    :param path: the socket of the daemon, that of the current repository by default.
+    :param timeout: seconds to wait for the answer.
+    :return: the result of the query.
+    :raises ValueError: if the daemon could not answer the query.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(str(path or socket_path(Path.cwd())))
+        connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with connection.makefile("rb") as stream:
+            response = json.loads(stream.readline())
+    if not response["ok"]:
+        raise ValueError(response["error"])
+    return response["result"]
+
+
+def main() -> None:
+    """Send the query given on the command line and print its result."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--socket", type=Path, help="Socket of the daemon.")
+    queries = parser.add_subparsers(dest="query", required=True)
+    queries.add_parser("resolve_hash").add_argument("hash")
+    expected_hash = queries.add_parser("expected_hash")
+    expected_hash.add_argument("package", help="The package, as `vendor/name`.")
+    expected_hash.add_argument("--type", help="The package type, if ambiguous.")
+    queries.add_parser(
+        "check", help="Check the content read from stdin as that of a file."
+    ).add_argument("file")
+    queries.add_parser("conflicts").add_argument("dependency")
+    args = vars(parser.parse_args())
+
+    path = args.pop("socket")
+    if args["query"] == "check":
+        args["content"] = sys.stdin.read()
+    try:
+        result = query(args, path=path)
+    except (OSError, ValueError) as e:
+        print(f"Registry query failed: {e}", file=sys.stderr)
+        sys.exit(2)
+    print(json.dumps(result, indent=2))
+    # findings in a checked buffer fail hooks
+    if args["query"] == "check" and result:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Keep the package registry of a repository warm and answer queries about it.
+
+The package index of `packages.json` and the dependency model of the package
+configurations are loaded once, then reloaded incrementally when files under
+`packages/` or the dependency configs change. Queries are answered on a Unix
+socket, see `registry_client.py` for the protocol, so editors and git hooks get
+answers without starting Python and importing `aea` on each call.
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, cast
+
+
+try:
+    from scripts.check_dependencies import ConfigPaths, WatchedDependencies
+    from scripts.check_doc_ipfs_hashes import (
+        PackageHashManager,
+        flatten_packages,
+        scan_file,
+    )
+    from scripts.file_watcher import FileWatcher
+    from scripts.hash_history import HASH_HISTORY_FILE, HashHistory, PACKAGES_FILE
+    from scripts.package_cache import CACHE_FILE, PackageConfigCache
+    from scripts.registry_client import socket_path
+except ImportError:  # pragma: nocover  # run as a standalone script
+    from check_dependencies import ConfigPaths, WatchedDependencies  # type: ignore
+    from check_doc_ipfs_hashes import (  # type: ignore
+        PackageHashManager,
+        flatten_packages,
+        scan_file,
+    )
+    from file_watcher import FileWatcher  # type: ignore
+    from hash_history import (  # type: ignore
+        HASH_HISTORY_FILE,
+        HashHistory,
+        PACKAGES_FILE,
+    )
+    from package_cache import CACHE_FILE, PackageConfigCache  # type: ignore
+    from registry_client import socket_path  # type: ignore
+
+if not hasattr(socket, "AF_UNIX"):  # pragma: nocover
+    raise ImportError("The registry daemon needs Unix domain sockets, e.g. not Windows")
+
+
+class RegistryState:
+    """The package index and dependency model of a repository, kept up to date."""
+
+    def __init__(
+        self,
+        root: Path,
+        cache: PackageConfigCache,
+        history_file: Optional[Path] = HASH_HISTORY_FILE,
+    ) -> None:
+        """
+        Initialize object.
+
+        :param root: the repository root.
+        :param cache: config cache to read parsed configurations from.
+        :param history_file: path to the hash history index, `None` to keep it in memory only.
+        """
+        self.root = root.resolve()
+        # queries are answered in parallel, reloads must not interleave with them
+        self.lock = threading.Lock()
+        self.dependencies = WatchedDependencies(
+            packages_dir=self.root / "packages",
+            paths=ConfigPaths.at(self.root),
+            cache=cache,
+        )
+        self.history = HashHistory(file=history_file, root=self.root)
+        self.package_manager = self._load_registry()
+        self.index = self.dependencies.index()
+
+    def _load_registry(self) -> PackageHashManager:
+        """Load the package index from `packages.json`, without the package configs."""
+        self.history.update()
+        self.history.dump()
+        packages = json.loads((self.root / PACKAGES_FILE).read_text(encoding="utf-8"))
+        return PackageHashManager(
+            history=self.history.hashes,
+            packages=flatten_packages(packages),
+            root=self.root,
+        )
+
+    def update(self, changed: Set[Path]) -> None:
+        """
+        Reload the changed files, leaving everything else as it is.
+
+        :param changed: the changed files.
+        """
+        with self.lock:
+            self.dependencies.update(changed)
+            if self.dependencies.packages_json in changed:
+                self.package_manager = self._load_registry()
+            self.index = self.dependencies.index()
+
+    def resolve_hash(self, package_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the package a hash was published for.
+
+        :param package_hash: the IPFS hash.
+        :return: the package id, whether the hash is current and the current hash, if the hash is known.
+        """
+        package = self.package_manager.get_package_by_hash(package_hash)
+        if package is not None:
+            return {
+                "package_id": package.package_id,
+                "current": True,
+                "hash": package.hash,
+            }
+        package_id = self.history.get(package_hash)
+        if package_id is None:
+            return None
+        package = self.package_manager.get_current_package(package_hash)
+        return {
+            "package_id": package_id,
+            "current": False,
+            "hash": None if package is None else package.hash,
+        }
+
+    def expected_hash(self, package: str, package_type: Optional[str] = None) -> str:
+        """
+        Get the current hash of a package.
+
+        :param package: the package, as `vendor/name`.
+        :param package_type: the package type, needed if several packages share the name.
+        :return: the hash.
+        :raises ValueError: if the package is unknown or its type ambiguous.
+        """
+        vendor, name = package.split("/")
+        package_types = self.package_manager.package_types.get(vendor, {}).get(name, [])
+        if package_type is None and len(package_types) == 1:
+            package_type = package_types[0]
+        if package_type not in package_types:
+            raise ValueError(
+                f"Unknown package {package}"
+                if not package_types
+                else f"Package {package} is a {' or '.join(package_types)}"
+            )
+        return self.package_manager.get_hash_by_attributes(
+            cast(str, package_type), vendor, name
+        )
+
+    def check(self, file: str, content: str) -> List[Dict[str, Any]]:
+        """
+        Check the package references in the content of a doc or Python file.
+
+        :param file: the file the content is of, its extension selects the scanner.
+        :param content: the content, e.g. an unsaved editor buffer.
+        :return: the findings.
+        """
+        scan = scan_file(Path(file), self.package_manager, content=content)
+        return [finding.to_json() for finding in scan.findings]
+
+    def conflicts(self, dependency: str) -> Dict[str, List[str]]:
+        """Get the packages requiring each specifier of a conflicting dependency."""
+        return self.index.conflicts().get(dependency, {})
+
+    def query(self, request: Dict[str, Any]) -> Any:
+        """
+        Answer a query.
+
+        :param request: the query, see `registry_client.py`.
+        :return: the result.
+        :raises ValueError: if the query is unknown.
+        """
+        with self.lock:
+            if request["query"] == "resolve_hash":
+                return self.resolve_hash(request["hash"])
+            if request["query"] == "expected_hash":
+                return self.expected_hash(request["package"], request.get("type"))
+            if request["query"] == "check":
+                return self.check(request["file"], request["content"])
+            if request["query"] == "conflicts":
+                return self.conflicts(request["dependency"])
+        raise ValueError(f"Unknown query: {request['query']}")
+
+
+class _QueryHandler(socketserver.StreamRequestHandler):
+    """Answer the queries sent on a connection, one JSON object per line."""
+
+    server: "RegistryServer"
+
+    def handle(self) -> None:
+        """Answer each query, errors are answered rather than raised."""
+        for line in self.rfile:
+            try:
+                response = {
+                    "ok": True,
+                    "result": self.server.state.query(json.loads(line)),
+                }
+            except Exception as e:  # pylint: disable=broad-except
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class RegistryServer(socketserver.ThreadingUnixStreamServer):
+    """Answer queries about a registry on a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, state: RegistryState) -> None:
+        """
+        Initialize object.
+
+        :param path: the socket path.
+        :param state: the registry the queries are about.
+        """
+        self.state = state
+        super().__init__(str(path), _QueryHandler)
+
+    def server_bind(self) -> None:
+        """Bind the socket, only the current user can connect to it."""
+        super().server_bind()
+        os.chmod(cast(str, self.server_address), 0o600)
+
+
+def remove_stale_socket(path: Path) -> None:
+    """
+    Remove the socket left behind by a daemon that is no longer running.
+
+    :param path: the socket path.
+    :raises ValueError: if a daemon is still listening on the socket.
+    """
+    if not path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(path))
+        except OSError:
+            path.unlink()
+            return
+    raise ValueError(f"A registry daemon is already listening on {path}")
+
+
+def _reload(state: RegistryState, watcher: FileWatcher) -> None:
+    """Reload the registry every time one of the files it is read from changes."""
+    while True:
+        watcher.watch(state.dependencies.files)
+        changed = watcher.wait()
+        try:
+            state.update(changed)
+        except Exception as e:  # pylint: disable=broad-except
+            logging.error(f"Could not reload the registry: {e}")
+
+
+def serve(state: RegistryState, path: Path) -> None:
+    """
+    Answer queries about a registry until interrupted.
+
+    :param state: the registry.
+    :param path: the socket path.
+    """
+    remove_stale_socket(path)
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    watcher = FileWatcher(
+        directories={file.parent for file in state.dependencies.loaders},
+        recursive=[state.dependencies.packages_dir],
+    )
+    threading.Thread(target=_reload, args=(state, watcher), daemon=True).start()
+    try:
+        with RegistryServer(path, state) as server:
+            print(
+                f"Serving the registry of {state.root} on {path}"
+                f"{' (polling)' if watcher.polling else ''}"
+            )
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+        path.unlink(missing_ok=True)
+        state.dependencies.cache.dump()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--root", type=Path, default=Path.cwd(), help="The repository root."
+    )
+    parser.add_argument(
+        "--socket", type=Path, help="Socket path, one per repository by default."
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(format="- %(levelname)s: %(message)s")
+    serve(
+        state=RegistryState(
+            root=args.root,
+            cache=PackageConfigCache(file=None if args.no_cache else CACHE_FILE),
+            history_file=None if args.no_cache else HASH_HISTORY_FILE,
+        ),
+        path=args.socket or socket_path(args.root),
+    )
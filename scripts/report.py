@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Machine-readable findings and phase timings for the check scripts."""
+
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional, TextIO, Union
+
+
+REPORT_FORMATS = ("text", "json")
+
+
+class Finding:  # pylint: disable=too-few-public-methods
+    """A problem found by a check."""
+
+    __slots__ = ("message", "level", "file", "line", "expected", "actual")
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        message: str,
+        level: int,
+        file: Optional[Union[Path, str]] = None,
+        line: Optional[int] = None,
+        expected: Optional[str] = None,
+        actual: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize object.
+
+        :param message: human readable description of the problem.
+        :param level: the logging level of the problem.
+        :param file: the file the problem was found in.
+        :param line: the 1-based line number of the problem in the file.
+        :param expected: the expected value.
+        :param actual: the value found.
+        """
+        self.message = message
+        self.level = level
+        self.file = file
+        self.line = line
+        self.expected = expected
+        self.actual = actual
+
+    def to_json(self) -> Dict[str, Any]:
+        """Transform the object to JSON."""
+        return {
+            "file": None if self.file is None else str(self.file),
+            "line": self.line,
+            "severity": logging.getLevelName(self.level).lower(),
+            "message": self.message,
+            "expected": self.expected,
+            "actual": self.actual,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Finding":
+        """Make a finding from its JSON form."""
+        return cls(
+            message=data["message"],
+            level=logging.getLevelName(data["severity"].upper()),
+            file=data["file"],
+            line=data["line"],
+            expected=data["expected"],
+            actual=data["actual"],
+        )
+
+
+class Report:
+    """Findings and per-phase wall time of a check run."""
+
+    def __init__(self, check: str) -> None:
+        """Initialize object."""
+        self.check = check
+        self.findings: List[Finding] = []
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Time a phase, the time of repeated phases adds up."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = (
+                self.timings.get(name, 0.0) + time.perf_counter() - start
+            )
+
+    def add(self, finding: Finding) -> None:
+        """Add a finding."""
+        self.findings.append(finding)
+
+    def to_json(self) -> Dict[str, Any]:
+        """Transform the object to JSON."""
+        return {
+            "check": self.check,
+            "summary": {
+                "errors": sum(f.level >= logging.ERROR for f in self.findings),
+                "warnings": sum(f.level == logging.WARNING for f in self.findings),
+            },
+            "timings": {name: round(t, 6) for name, t in self.timings.items()},
+            "findings": [finding.to_json() for finding in self.findings],
+        }
+
+    def dump(self, stream: TextIO = sys.stdout) -> None:
+        """Write the report as JSON."""
+        json.dump(self.to_json(), stream, indent=2)
+        stream.write("\n")
+
+    @contextmanager
+    def output(self, report_format: str) -> Generator[None, None, None]:
+        """
+        Write the report to stdout when leaving the context, in JSON format.
+
+        While the context is active the human readable output is sent to stderr,
+        so stdout only carries the report. The report is also written when the
+        check exits early, e.g. through `sys.exit`.
+
+        :param report_format: one of `text` or `json`, nothing is done for `text`.
+        :yield: None
+        """
+        if report_format != "json":
+            yield
+            return
+
+        stdout = sys.stdout
+        try:
+            with redirect_stdout(sys.stderr):
+                yield
+        finally:
+            self.dump(stdout)
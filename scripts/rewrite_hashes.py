@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+Rewrite outdated package hashes across file trees.
+
+The map of outdated hashes to their current hash is exported by
+`check_doc_ipfs_hashes.py --hash-map`. Every file under the given paths, in any
+format, is scanned once for CID tokens, each of which is looked up in the map,
+so the time does not depend on the number of hashes to replace. The files are
+scanned in parallel and memory-mapped, and each file is rewritten at most once.
+
+Usage:
+
+    python scripts/check_doc_ipfs_hashes.py --fix --hash-map hashes.json
+    python scripts/rewrite_hashes.py --hash-map hashes.json ../other-repo
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+try:
+    from scripts.check_doc_ipfs_hashes import (
+        IPFS_HASH_REGEX,
+        count_newlines,
+        write_edits,
+    )
+    from scripts.report import Finding, REPORT_FORMATS, Report
+except ImportError:  # pragma: nocover  # run as a standalone script
+    from check_doc_ipfs_hashes import (  # type: ignore
+        IPFS_HASH_REGEX,
+        count_newlines,
+        write_edits,
+    )
+    from report import Finding, REPORT_FORMATS, Report  # type: ignore
+
+
+# a whole CID, not a part of a longer alphanumeric string
+HASH_TOKEN_PATTERN = re.compile(
+    rf"(?<![a-zA-Z0-9]){IPFS_HASH_REGEX}(?![a-zA-Z0-9])".encode()
+)
+SKIP_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    ".tox",
+    ".venv",
+    "venv",
+    "node_modules",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+}
+# files with a null byte in their first block are considered binary
+BINARY_CHECK_SIZE = 8192
+
+Rewrite = Tuple[int, int, int, str]
+
+
+def load_hash_map(file: Path) -> Dict[str, str]:
+    """
+    Load a map of outdated hashes to their current hash.
+
+    Chains, e.g. left by merging the maps of several lock runs, are followed to
+    the last hash.
+
+    :param file: the JSON file of the map.
+    :return: the current hash of each outdated hash.
+    """
+    hash_map: Dict[str, str] = json.loads(file.read_text(encoding="utf-8"))
+    resolved = {}
+    for old_hash, new_hash in hash_map.items():
+        seen = {old_hash}
+        while new_hash in hash_map and new_hash not in seen:
+            seen.add(new_hash)
+            new_hash = hash_map[new_hash]
+        if new_hash != old_hash:
+            resolved[old_hash] = new_hash
+    return resolved
+
+
+def iter_files(paths: Iterable[Path]) -> Iterator[Path]:
+    """
+    Walk files, skipping VCS, virtual environment and cache directories.
+
+    :param paths: files and directories.
+    :yield: the files, in a stable order.
+    """
+    for path in paths:
+        if not path.is_dir():
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            for file in sorted(files):
+                yield Path(root, file)
+
+
+def find_outdated_hashes(file: Path, hash_map: Dict[str, str]) -> List[Rewrite]:
+    """
+    Find the outdated hashes in a file.
+
+    :param file: the file.
+    :param hash_map: the current hash of each outdated hash.
+    :return: the start offset, end offset, line number and hash of each outdated hash.
+    """
+    if file.is_symlink() or file.stat().st_size == 0:
+        return []
+    found = []
+    with open(file, "rb") as stream, mmap.mmap(
+        stream.fileno(), 0, access=mmap.ACCESS_READ
+    ) as buffer:
+        if b"\0" in buffer[:BINARY_CHECK_SIZE]:
+            return []
+        line, offset = 1, 0
+        for match in HASH_TOKEN_PATTERN.finditer(buffer):
+            old_hash = match.group().decode()
+            if old_hash not in hash_map:
+                continue
+            line += count_newlines(buffer, offset, match.start())
+            offset = match.start()
+            found.append((match.start(), match.end(), line, old_hash))
+    return found
+
+
+# read-only copy of the hash map in each scanning process
+_worker_hash_map: Dict[str, str] = {}
+
+
+def _init_worker(hash_map: Dict[str, str]) -> None:
+    """Store the hash map of a scanning process."""
+    global _worker_hash_map  # pylint: disable=global-statement
+    _worker_hash_map = hash_map
+
+
+def _find_in_worker(file: Path) -> List[Rewrite]:
+    """Find the outdated hashes in a file, in a scanning process."""
+    return find_outdated_hashes(file, _worker_hash_map)
+
+
+def rewrite_hashes(
+    paths: List[Path],
+    hash_map: Dict[str, str],
+    check: bool = False,
+    workers: int = 1,
+    report: Optional[Report] = None,
+) -> int:
+    """
+    Replace the outdated hashes in files.
+
+    :param paths: the files and directories to rewrite.
+    :param hash_map: the current hash of each outdated hash.
+    :param check: only report the outdated hashes, without rewriting them.
+    :param workers: number of processes used to scan the files.
+    :param report: report recording the outdated hashes and phase timings.
+    :return: the number of outdated hashes found.
+    """
+    report = report or Report(check="rewrite-hashes")
+    with report.phase("walk"):
+        files = list(iter_files(paths))
+
+    with report.phase("scan"):
+        if not hash_map:
+            results: Iterable[List[Rewrite]] = [[] for _ in files]
+        elif workers <= 1 or len(files) <= 1:
+            results = (find_outdated_hashes(file, hash_map) for file in files)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(hash_map,)
+            ) as executor:
+                results = list(
+                    executor.map(
+                        _find_in_worker,
+                        files,
+                        chunksize=max(1, len(files) // (workers * 8)),
+                    )
+                )
+
+    found = 0
+    for file, rewrites in zip(files, results):
+        if not rewrites:
+            continue
+        found += len(rewrites)
+        for _, _, line, old_hash in rewrites:
+            report.add(
+                Finding(
+                    message=f"Outdated hash {old_hash}",
+                    level=logging.ERROR if check else logging.INFO,
+                    file=file,
+                    line=line,
+                    expected=hash_map[old_hash],
+                    actual=old_hash,
+                )
+            )
+        if check:
+            print(f"Found {len(rewrites)} outdated hashes in {file}")
+            continue
+        with report.phase("write"):
+            write_edits(
+                str(file),
+                [
+                    (start, end, hash_map[old_hash])
+                    for start, end, _, old_hash in rewrites
+                ],
+            )
+        print(f"Replaced {len(rewrites)} outdated hashes in {file}")
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("paths", type=Path, nargs="+")
+    parser.add_argument(
+        "--hash-map",
+        type=Path,
+        required=True,
+        help="JSON map of outdated hashes to their current hash.",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report the outdated hashes, and exit with an error if any is found.",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes used to scan the files.",
+    )
+    parser.add_argument("--report", choices=REPORT_FORMATS, default="text")
+    args = parser.parse_args()
+    run_report = Report(check="rewrite-hashes")
+    with run_report.output(args.report):
+        outdated = rewrite_hashes(
+            paths=args.paths,
+            hash_map=load_hash_map(args.hash_map),
+            check=args.check,
+            workers=args.workers,
+            report=run_report,
+        )
+        if args.check and outdated:
+            print(f"Found {outdated} outdated hashes.")
+            sys.exit(1)
+        print(f"{'Found' if args.check else 'Replaced'} {outdated} outdated hashes.")
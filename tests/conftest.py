@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Pytest configuration."""
+
+from pathlib import Path
+from typing import Any, Callable, List
+
+import pytest
+
+from scripts import check_doc_ipfs_hashes
+
+from tests.synthetic_registry import GitRegistry
+
+
+DEFAULT_BENCHMARK_TOLERANCE = 0.5
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark options."""
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=DEFAULT_BENCHMARK_TOLERANCE,
+        help="Fail benchmarks slower or using more memory than the baseline by this fraction.",
+    )
+    group.addoption(
+        "--benchmark-update",
+        action="store_true",
+        default=False,
+        help="Store the benchmark results as the new baseline.",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: List[pytest.Item]
+) -> None:
+    """Skip the benchmarks unless they are selected with `-m benchmark`."""
+    if "benchmark" in (config.getoption("markexpr") or ""):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with `-m benchmark`")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def git_registry(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Callable[..., GitRegistry]:
+    """
+    Make a synthetic registry in a git repository, with everything committed.
+
+    The repository is the working directory of the test and the root of the
+    scripts. The keyword arguments are those of `SyntheticRegistry`.
+    """
+
+    def make(**kwargs: Any) -> GitRegistry:
+        registry = GitRegistry(tmp_path, **kwargs)
+        registry.generate()
+        registry.git("init", "-q")
+        registry.commit("initial")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", tmp_path)
+        return registry
+
+    return make
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Generate synthetic package registries for scale-testing the scripts.
+
+The generated root holds a `packages` tree with valid package configurations,
+a matching `packages/packages.json`, a `tox.ini` pinning every PyPI dependency
+used by the packages, and a `docs` tree referencing the package hashes the way
+the documentation does. Everything is derived from a seed, so the same
+parameters always produce the same registry.
+
+Usage: `python tests/synthetic_registry.py <root> --vendors 10 --packages 20 --docs 100`
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import subprocess  # nosec
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import yaml
+from aea.helpers.yaml_utils import yaml_dump
+
+
+VERSION = "0.1.0"
+AEA_VERSION = ">=1.0.0, <2.0.0"
+LICENSE = "Apache-2.0"
+
+# package types in dependency order, a package only depends on earlier types
+PACKAGE_TYPES = ("protocol", "contract", "connection", "skill", "agent")
+CONFIG_FILES = {
+    "protocol": "protocol.yaml",
+    "contract": "contract.yaml",
+    "connection": "connection.yaml",
+    "skill": "skill.yaml",
+    "agent": "aea-config.yaml",
+}
+
+PYPI_DEPENDENCIES = {
+    "aiohttp": "==3.8.5",
+    "ecdsa": "==0.16.1",
+    "grpcio": "==1.53.0",
+    "hexbytes": "==0.3.1",
+    "jsonschema": "==4.3.3",
+    "open-aea-ledger-ethereum": "==1.48.0",
+    "protobuf": "==4.21.6",
+    "py-multibase": "==1.0.3",
+    "py-multicodec": "==0.2.1",
+    "pyyaml": "==6.0.1",
+    "requests": "==2.28.1",
+    "toml": "==0.10.2",
+    "typing-extensions": "==4.5.0",
+    "web3": "==6.1.0",
+}
+
+
+def make_hash(seed: str) -> str:
+    """Make a deterministic string matching the IPFS hash format."""
+    digest = hashlib.sha256(seed.encode("utf-8")).digest()
+    return "bafybei" + base64.b32encode(digest).decode().lower().rstrip("=")
+
+
+class SyntheticRegistry:
+    """A generated package registry."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        root: Path,
+        vendors: int = 2,
+        packages: int = 5,
+        docs: int = 10,
+        mismatches: int = 0,
+        seed: int = 0,
+    ) -> None:
+        """
+        Initialize object.
+
+        :param root: directory the registry is generated in.
+        :param vendors: number of package authors.
+        :param packages: number of packages of each type for each vendor.
+        :param docs: number of markdown files in the docs tree.
+        :param mismatches: number of doc references using an outdated hash.
+        :param seed: seed of the generated content.
+        """
+        self.root = root
+        self.vendors = [f"vendor_{i}" for i in range(vendors)]
+        self.packages = packages
+        self.docs = docs
+        self.mismatches = mismatches
+        self.seed = seed
+        self.hashes: Dict[str, str] = {}
+        self._random = random.Random(seed)
+
+    @property
+    def packages_dir(self) -> Path:
+        """Path to the packages directory."""
+        return self.root / "packages"
+
+    @property
+    def docs_dir(self) -> Path:
+        """Path to the docs directory."""
+        return self.root / "docs"
+
+    def package_ids(self, package_type: str) -> List[Tuple[str, str]]:
+        """Get the author and name of the packages of a type."""
+        return [
+            (vendor, f"{package_type}_{i}")
+            for vendor in self.vendors
+            for i in range(self.packages)
+        ]
+
+    def _pick(self, package_type: str, k: int) -> List[str]:
+        """Pick public ids of packages of a type to depend on."""
+        ids = self.package_ids(package_type)
+        return sorted(
+            f"{author}/{name}:{VERSION}"
+            for author, name in self._random.sample(ids, min(k, len(ids)))
+        )
+
+    def _dependencies(self) -> Dict[str, Dict[str, str]]:
+        """Pick PyPI dependencies, a few of them without a version."""
+        names = self._random.sample(
+            sorted(PYPI_DEPENDENCIES), self._random.randint(0, 3)
+        )
+        return {
+            name: {}
+            if self._random.random() < 0.2
+            else {"version": PYPI_DEPENDENCIES[name]}
+            for name in sorted(names)
+        }
+
+    def _config(self, package_type: str, author: str, name: str) -> Dict:
+        """Make the configuration of a package."""
+        common = {
+            "author": author,
+            "version": VERSION,
+            "type": package_type,
+            "description": f"Synthetic {package_type} {name}.",
+            "license": LICENSE,
+            "aea_version": AEA_VERSION,
+            "fingerprint": {"__init__.py": make_hash(f"{author}/{name}/init")},
+            "fingerprint_ignore_patterns": [],
+        }
+        if package_type == "protocol":
+            return {
+                "name": name,
+                **common,
+                "protocol_specification_id": f"{author}/{name}:{VERSION}",
+                "dependencies": self._dependencies(),
+            }
+        if package_type == "contract":
+            return {
+                "name": name,
+                **common,
+                "class_name": "Contract",
+                "contract_interface_paths": {},
+                "contracts": [],
+                "dependencies": self._dependencies(),
+            }
+        if package_type == "connection":
+            return {
+                "name": name,
+                **common,
+                "class_name": "Connection",
+                "config": {},
+                "connections": [],
+                "protocols": self._pick("protocol", 2),
+                "restricted_to_protocols": [],
+                "excluded_protocols": [],
+                "dependencies": self._dependencies(),
+                "is_abstract": False,
+            }
+        if package_type == "skill":
+            return {
+                "name": name,
+                **common,
+                "connections": self._pick("connection", 1),
+                "contracts": self._pick("contract", 2),
+                "protocols": self._pick("protocol", 3),
+                "skills": [],
+                "behaviours": {},
+                "handlers": {},
+                "models": {},
+                "dependencies": self._dependencies(),
+                "is_abstract": False,
+            }
+        del common["type"]
+        return {
+            "agent_name": name,
+            **common,
+            "connections": self._pick("connection", 2),
+            "contracts": self._pick("contract", 2),
+            "protocols": self._pick("protocol", 3),
+            "skills": self._pick("skill", 2),
+            "default_connection": None,
+            "default_ledger": "ethereum",
+            "required_ledgers": ["ethereum"],
+            "private_key_paths": {},
+            "dependencies": self._dependencies(),
+        }
+
+    def _write_packages(self) -> None:
+        """Write the package configurations and `packages.json`."""
+        for package_type in PACKAGE_TYPES:
+            for author, name in self.package_ids(package_type):
+                path = self.packages_dir / author / f"{package_type}s" / name
+                path.mkdir(parents=True, exist_ok=True)
+                (path / "__init__.py").write_text("", encoding="utf-8")
+                with (path / CONFIG_FILES[package_type]).open(
+                    "w", encoding="utf-8"
+                ) as stream:
+                    # keep the key order of real configurations
+                    yaml_dump(
+                        OrderedDict(self._config(package_type, author, name)), stream
+                    )
+                package_id = f"{package_type}/{author}/{name}/{VERSION}"
+                self.hashes[package_id] = make_hash(f"{self.seed}/{package_id}")
+
+        (self.packages_dir / "packages.json").write_text(
+            json.dumps({"dev": self.hashes, "third_party": {}}, indent=4) + "\n",
+            encoding="utf-8",
+        )
+
+    def _write_tox(self) -> None:
+        """Write a `tox.ini` pinning every PyPI dependency."""
+        deps = "".join(
+            f"    {name}{version}\n" for name, version in PYPI_DEPENDENCIES.items()
+        )
+        (self.root / "tox.ini").write_text(
+            "[tox]\nenvlist = py3\n\n"
+            f"[deps-packages]\ndeps =\n{deps}\n"
+            "[testenv]\ndeps = {[deps-packages]deps}\n",
+            encoding="utf-8",
+        )
+
+    def _reference(self, package_id: str, outdated: bool) -> str:
+        """Make a doc line referencing a package."""
+        package_type, author, name, version = package_id.split("/")
+        package_hash = (
+            make_hash(f"outdated/{package_id}") if outdated else self.hashes[package_id]
+        )
+        if package_type == "agent":
+            return f"autonomy fetch {author}/{name}:{version}:{package_hash}"
+        return f"autonomy add {package_type} {author}/{name}:{version}:{package_hash}"
+
+    def _write_docs(self) -> None:
+        """Write markdown files referencing the package hashes."""
+        self.docs_dir.mkdir(parents=True, exist_ok=True)
+        package_ids = sorted(self.hashes)
+        outdated = self.mismatches
+        for i in range(self.docs):
+            lines = [f"# Guide {i}", "", "Some text describing the guide.", ""]
+            for package_id in self._random.sample(
+                package_ids, min(5, len(package_ids))
+            ):
+                lines += [
+                    "Run the following command:",
+                    "```bash",
+                    self._reference(package_id, outdated > 0),
+                    "```",
+                    "",
+                ]
+                outdated -= 1
+            (self.docs_dir / f"guide_{i}.md").write_text(
+                "\n".join(lines), encoding="utf-8"
+            )
+
+    def generate(self) -> "SyntheticRegistry":
+        """Write the registry to the root directory."""
+        self._write_packages()
+        self._write_tox()
+        self._write_docs()
+        return self
+
+
+class GitRegistry(SyntheticRegistry):
+    """A generated package registry committed to a git repository."""
+
+    def git(self, *args: str) -> None:
+        """Run a git command in the repository."""
+        subprocess.run(  # nosec
+            ["git", "-c", "user.name=test", "-c", "user.email=test@test", *args],
+            cwd=self.root,
+            check=True,
+        )
+
+    def commit(self, message: str) -> None:
+        """Commit all the files of the repository."""
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", message)
+
+    def config_file(self, package_type: str, author: str, name: str) -> Path:
+        """Get the path to the configuration of a package."""
+        return (
+            self.packages_dir
+            / author
+            / f"{package_type}s"
+            / name
+            / CONFIG_FILES[package_type]
+        )
+
+    def set_dependencies(self, config_file: Path, dependencies: Dict) -> None:
+        """Replace the PyPI dependencies of a package configuration, without committing."""
+        config = yaml.safe_load(config_file.read_text(encoding="utf-8"))
+        config["dependencies"] = dependencies
+        with config_file.open("w", encoding="utf-8") as stream:
+            yaml_dump(config, stream)
+
+    def publish(self, package_id: str, seed: str) -> str:
+        """Publish a new hash for a package in `packages.json` and commit it."""
+        packages_file = self.packages_dir / "packages.json"
+        packages = json.loads(packages_file.read_text(encoding="utf-8"))
+        packages["dev"][package_id] = make_hash(seed)
+        packages_file.write_text(json.dumps(packages, indent=4), encoding="utf-8")
+        self.commit(f"publish {seed}")
+        return packages["dev"][package_id]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("root", type=Path)
+    parser.add_argument("--vendors", type=int, default=2)
+    parser.add_argument("--packages", type=int, default=5)
+    parser.add_argument("--docs", type=int, default=10)
+    parser.add_argument("--mismatches", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    registry = SyntheticRegistry(
+        root=args.root,
+        vendors=args.vendors,
+        packages=args.packages,
+        docs=args.docs,
+        mismatches=args.mismatches,
+        seed=args.seed,
+    ).generate()
+    print(f"Generated {len(registry.hashes)} packages in {args.root}")
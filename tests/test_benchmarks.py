@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmarks of the scripts entry points.
+
+Each benchmark records the median wall time of several runs and the peak memory
+of one run, and fails when it regresses beyond the tolerance with respect to
+`tests/benchmarks.json`. Times are stored divided by the time of a fixed
+calibration workload, run between the repeats so both see the same machine
+load, and a baseline recorded on one machine can be compared against another.
+The calibration is pure Python, it does not scale like file I/O and process
+pools, so the benchmarks dominated by them get a wider tolerance and a larger
+absolute floor.
+
+Run with `pytest -m benchmark tests/test_benchmarks.py`, add `--benchmark-update`
+to store the results as the new baseline.
+"""
+
+import itertools
+import json
+import shutil
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, List, Tuple
+
+import pytest
+from aea.configurations.data_types import Dependency
+
+from scripts import bump, check_doc_ipfs_hashes
+from scripts.check_dependencies import ToxFile, load_packages_dependencies
+
+from tests.synthetic_registry import SyntheticRegistry
+
+
+ROOT_DIR = Path(__file__).parent.parent
+BASELINE_FILE = Path(__file__).parent / "benchmarks.json"
+REPEATS = 7
+# regressions smaller than this many seconds are considered noise
+MIN_REGRESSION = 0.005
+# the benchmarks dominated by file I/O, subprocesses and process pools, and their tolerances
+IO_BOUND_BENCHMARKS = {
+    "load_packages_dependencies",
+    "bump_packages",
+}
+IO_BOUND_TOLERANCE = 1.0
+IO_BOUND_MIN_REGRESSION = 0.1
+
+SIZES = {
+    "small": {"vendors": 2, "packages": 2, "docs": 5},
+    "medium": {"vendors": 4, "packages": 5, "docs": 25},
+    "large": {"vendors": 6, "packages": 8, "docs": 60},
+}
+
+Benchmark = Callable[[Path], Callable[[], Any]]
+
+
+def calibrate() -> None:
+    """Run a fixed pure Python workload."""
+    sum(i * i for i in range(200_000))
+
+
+def _timed(run: Callable[[], Any]) -> float:
+    """Time a single run."""
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def measure(run: Callable[[], Any]) -> Tuple[float, float, int]:
+    """
+    Measure an entry point.
+
+    :param run: runs the entry point.
+    :return: the median wall time in seconds, that of the calibration workload
+        and the peak memory in bytes.
+    """
+    times: List[float] = []
+    calibrations: List[float] = []
+    for _ in range(REPEATS):
+        calibrations.append(_timed(calibrate))
+        times.append(_timed(run))
+    seconds, calibration = statistics.median(times), statistics.median(calibrations)
+    # tracing slows allocations down, so memory is measured in a separate run
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, calibration, peak
+
+
+class BenchmarkBaseline:
+    """Benchmark results compared against a stored baseline."""
+
+    def __init__(self, file: Path, tolerance: float) -> None:
+        """Initialize object."""
+        self.file = file
+        self.tolerance = tolerance
+        self.baseline: Dict[str, Dict[str, float]] = (
+            json.loads(file.read_text(encoding="utf-8")) if file.exists() else {}
+        )
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    def record(
+        self, name: str, seconds: float, calibration: float, peak: int
+    ) -> List[str]:
+        """
+        Record a result.
+
+        :param name: the benchmark name.
+        :param seconds: the measured wall time.
+        :param calibration: the wall time of the calibration workload.
+        :param peak: the measured peak memory.
+        :return: the regressions with respect to the baseline.
+        """
+        self.results[name] = {
+            "seconds": round(seconds, 6),
+            "normalized": round(seconds / calibration, 3),
+            "peak_memory": peak,
+        }
+        expected = self.baseline.get(name)
+        if expected is None:
+            return []
+
+        regressions = []
+        io_bound = name.split("/")[-1] in IO_BOUND_BENCHMARKS
+        tolerance = (
+            max(self.tolerance, IO_BOUND_TOLERANCE) if io_bound else self.tolerance
+        )
+        floor = IO_BOUND_MIN_REGRESSION if io_bound else MIN_REGRESSION
+        if (
+            self.results[name]["normalized"] > expected["normalized"] * (1 + tolerance)
+            and seconds - expected["normalized"] * calibration > floor
+        ):
+            regressions.append(
+                f"{name} took {seconds:.4f}s, {self.results[name]['normalized']} "
+                f"calibration units against a baseline of {expected['normalized']}"
+            )
+        if peak > expected["peak_memory"] * (1 + self.tolerance):
+            regressions.append(
+                f"{name} peaked at {peak} bytes against a baseline of "
+                f"{expected['peak_memory']}"
+            )
+        return regressions
+
+    def dump(self) -> None:
+        """Store the results as the new baseline."""
+        data = {**self.baseline, **self.results}
+        self.file.write_text(
+            json.dumps(dict(sorted(data.items())), indent=2) + "\n", encoding="utf-8"
+        )
+
+
+@pytest.fixture(scope="session")
+def baseline(
+    request: pytest.FixtureRequest,
+) -> Generator[BenchmarkBaseline, None, None]:
+    """Benchmark results for the session."""
+    results = BenchmarkBaseline(
+        file=BASELINE_FILE,
+        tolerance=request.config.getoption("--benchmark-tolerance"),
+    )
+    yield results
+    if request.config.getoption("--benchmark-update"):
+        results.dump()
+
+
+@pytest.fixture(scope="session", params=list(SIZES))
+def registry(
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+) -> Tuple[str, SyntheticRegistry]:
+    """A synthetic registry of each size."""
+    return (
+        request.param,
+        SyntheticRegistry(
+            root=tmp_path_factory.mktemp(request.param), **SIZES[request.param]
+        ).generate(),
+    )
+
+
+def _load_packages_dependencies(root: Path) -> Callable[[], Any]:
+    """Load the dependencies of all the packages, without a persistent cache."""
+    return lambda: load_packages_dependencies(packages_dir=root / "packages")
+
+
+def _package_hash_manager(root: Path) -> Callable[[], Any]:
+    """Index packages.json and the package versions."""
+    return check_doc_ipfs_hashes.PackageHashManager
+
+
+def _check_ipfs_hashes(root: Path) -> Callable[[], Any]:
+    """Check the hashes referenced in the docs with a cold cache, which does not read the git history."""
+    return lambda: check_doc_ipfs_hashes.check_ipfs_hashes(
+        paths=[root / "docs"], no_cache=True
+    )
+
+
+def _bump_packages(root: Path) -> Callable[[], Any]:
+    """Bump a dependency in every package using it, to a new version every run."""
+    versions = itertools.count()
+    return lambda: bump.bump_packages(
+        dependencies={
+            "requests": f"==2.31.{next(versions)}",
+            "web3": f"==6.2.{next(versions)}",
+        }
+    )
+
+
+def _tox_parse(root: Path) -> Callable[[], Any]:
+    """Parse tox.ini."""
+    content = (root / "tox.ini").read_text(encoding="utf-8")
+    return lambda: ToxFile.parse(content=content)
+
+
+def _tox_write(root: Path) -> Callable[[], Any]:
+    """Write tox.ini after updating a dependency."""
+    tox = ToxFile.load(root / "tox.ini")
+    tox.update(Dependency(name="toml", version="==0.10.3"))
+    return tox.write
+
+
+def _bump_tox(root: Path) -> Callable[[], Any]:
+    """Bump dependencies in tox.ini, to a new version every run."""
+    versions = itertools.count()
+    return lambda: bump.bump_tox(
+        dependencies={"open-autonomy": f"==0.15.{next(versions)}"}
+    )
+
+
+def _bump_pyproject(root: Path) -> Callable[[], Any]:
+    """Bump dependencies in pyproject.toml, to a new version every run."""
+    versions = itertools.count()
+    return lambda: bump.bump_pipfile_or_pyproject(
+        file=root / "pyproject.toml",
+        dependencies={"open-autonomy": f"==0.15.{next(versions)}"},
+    )
+
+
+REGISTRY_BENCHMARKS: Dict[str, Benchmark] = {
+    "load_packages_dependencies": _load_packages_dependencies,
+    "package_hash_manager": _package_hash_manager,
+    "check_ipfs_hashes": _check_ipfs_hashes,
+    "bump_packages": _bump_packages,
+}
+
+CONFIG_BENCHMARKS: Dict[str, Benchmark] = {
+    "tox_parse": _tox_parse,
+    "tox_write": _tox_write,
+    "bump_tox": _bump_tox,
+    "bump_pyproject": _bump_pyproject,
+}
+
+
+def _run_benchmark(
+    name: str, root: Path, benchmark: Benchmark, baseline: BenchmarkBaseline
+) -> None:
+    """Measure a benchmark and fail on regressions."""
+    seconds, calibration, peak = measure(benchmark(root))
+    regressions = baseline.record(name, seconds, calibration, peak)
+    assert not regressions, "\n".join(regressions)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", list(REGISTRY_BENCHMARKS))
+def test_registry_benchmark(
+    name: str,
+    registry: Tuple[str, SyntheticRegistry],
+    baseline: BenchmarkBaseline,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Benchmark the entry points reading the package registry."""
+    size, generated = registry
+    root = tmp_path / "registry"
+    shutil.copytree(generated.root, root)
+    monkeypatch.chdir(root)
+    monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", root)
+    _run_benchmark(
+        name=f"{size}/{name}",
+        root=root,
+        benchmark=REGISTRY_BENCHMARKS[name],
+        baseline=baseline,
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", list(CONFIG_BENCHMARKS))
+def test_config_benchmark(
+    name: str,
+    baseline: BenchmarkBaseline,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Benchmark the entry points rewriting the repository configs."""
+    for file in ("tox.ini", "pyproject.toml"):
+        shutil.copy(ROOT_DIR / file, tmp_path / file)
+    monkeypatch.setattr(bump, "TOX_INI", tmp_path / "tox.ini")
+    _run_benchmark(
+        name=f"repo/{name}",
+        root=tmp_path,
+        benchmark=CONFIG_BENCHMARKS[name],
+        baseline=baseline,
+    )
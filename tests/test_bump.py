@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests for the resolution of the core dependency versions."""
+
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Generator, Set
+
+import pytest
+
+from scripts import bump
+
+
+TAGS = {bump.OPEN_AEA_REPO: "v1.2.3", bump.OPEN_AUTONOMY_REPO: "v0.4.5"}
+
+
+class _GitHub(ThreadingHTTPServer):
+    """A stand-in for the GitHub endpoints, recording the requests it serves."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        super().__init__(("127.0.0.1", 0), _GitHubHandler)
+        self.requests: Counter = Counter()
+        self.connections: Set[int] = set()
+        self.lock = threading.Lock()
+
+
+class _GitHubHandler(BaseHTTPRequestHandler):
+    """Serve the latest tag of a repo and the version files at a tag."""
+
+    protocol_version = "HTTP/1.1"  # keep connections alive
+    server: _GitHub
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Serve a tags listing or a version file."""
+        with self.server.lock:
+            self.server.requests[self.path] += 1
+            self.server.connections.add(self.client_address[1])
+        _, kind, owner, name, *rest = self.path.split("/")
+        repo = f"{owner}/{name}"
+        if kind == "tags":
+            body = json.dumps([{"name": TAGS[repo]}, {"name": "v0.0.1"}])
+        elif rest[0] == TAGS[repo]:
+            body = f'__version__ = "{TAGS[repo][1:]}"\n'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args: Any) -> None:
+        """Do not log the requests."""
+
+
+@pytest.fixture
+def github(monkeypatch: pytest.MonkeyPatch) -> Generator[_GitHub, None, None]:
+    """Serve the GitHub stand-in and point the bump script to it."""
+    server = _GitHub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(bump, "TAGS_URL", url + "/tags/{repo}")
+    monkeypatch.setattr(bump, "FILE_URL", url + "/files/{repo}/{tag}/{file}")
+    monkeypatch.setattr(bump, "_version_cache", {})
+    monkeypatch.delenv("GITHUB_AUTH", raising=False)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_versions_are_fetched_concurrently_once(github: _GitHub) -> None:
+    """Each tag is fetched once, versions over at most one connection per worker."""
+    dependencies = bump.get_dependencies(workers=2)
+    assert dependencies == {
+        dependency: f"=={TAGS[specs['repo']][1:]}"
+        for dependency, specs in bump.DEPENDENCY_SPECS.items()
+    }
+    assert github.requests == Counter(
+        {
+            **{f"/tags/{repo}": 1 for repo in TAGS},
+            **{
+                f"/files/{specs['repo']}/{TAGS[specs['repo']]}/{specs['file']}": 1
+                for specs in bump.DEPENDENCY_SPECS.values()
+            },
+        }
+    )
+    assert len(github.connections) <= 2
+    assert bump._version_cache[bump.OPEN_AEA_REPO] == TAGS[bump.OPEN_AEA_REPO]
+
+    # cached versions are not fetched again
+    github.requests.clear()
+    assert bump.get_dependencies() == dependencies
+    assert not github.requests
+
+    del bump._version_cache["open-autonomy"]
+    assert bump.get_dependencies() == dependencies
+    assert list(github.requests) == [
+        f"/files/{bump.OPEN_AUTONOMY_REPO}/{TAGS[bump.OPEN_AUTONOMY_REPO]}"
+        "/autonomy/__version__.py"
+    ]
+
+
+def test_failed_fetches_are_raised(github: _GitHub) -> None:
+    """A version file missing at the latest tag fails the resolution."""
+    bump._version_cache[bump.OPEN_AEA_REPO] = "v9.9.9"
+    with pytest.raises(ValueError, match="Fetching packages from"):
+        bump.get_dependencies()
+
+
+def test_sessions_are_not_shared_across_threads() -> None:
+    """Each thread reuses its own session."""
+    session = bump.get_session()
+    assert bump.get_session() is session
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(bump.get_session()))
+    thread.start()
+    thread.join()
+    assert sessions[0] is not session
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests for the dependency checks."""
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Set
+
+import click
+import pytest
+import yaml
+from aea.configurations.data_types import Dependency
+from aea.helpers.yaml_utils import yaml_dump
+
+from scripts.check_dependencies import (
+    ConfigPaths,
+    DependencyIndex,
+    PoetryLock,
+    ToxFile,
+    WatchedDependencies,
+    _check,
+    _compare,
+    _get_packages,
+    _load_entries,
+    get_affected_packages,
+    load_dependency_index,
+    main,
+)
+from scripts.package_cache import PackageConfigCache
+from scripts.report import Report
+
+from tests.synthetic_registry import SyntheticRegistry
+
+
+def _stages(registry: SyntheticRegistry, workers: int) -> List[Dict]:
+    """Compare the dependencies of a registry, loading them with a number of workers."""
+    index = load_dependency_index(
+        packages_dir=registry.packages_dir,
+        workers=workers,
+        cache=PackageConfigCache(file=None),
+    )
+    return [
+        {"stage": stage, "findings": [finding.to_json() for finding in findings]}
+        for stage, findings in _compare(
+            packages_dependencies=index.dependencies(),
+            tox=ToxFile.load(registry.root / "tox.ini"),
+            conflicts=index.report(),
+            packages_dir=registry.packages_dir,
+        )
+    ]
+
+
+def test_parallel_loading_gives_the_serial_output(tmp_path: Path) -> None:
+    """The findings do not depend on the number of workers loading the configs."""
+    registry = SyntheticRegistry(tmp_path, vendors=2, packages=3, docs=0).generate()
+    # pin a dependency differently in two packages so there is a conflict to report
+    for version, (author, name) in zip(
+        ("==2.0.0", "==3.0.0"), registry.package_ids("protocol")
+    ):
+        config_file = (
+            registry.packages_dir / author / "protocols" / name / "protocol.yaml"
+        )
+        config = yaml.safe_load(config_file.read_text(encoding="utf-8"))
+        config["dependencies"]["newlib"] = {"version": version}
+        with config_file.open("w", encoding="utf-8") as stream:
+            yaml_dump(config, stream)
+
+    serial = _stages(registry, workers=1)
+    assert any(
+        finding["message"].startswith("Non-matching dependency versions for newlib")
+        for stage in serial
+        for finding in stage["findings"]
+    )
+    assert _stages(registry, workers=3) == serial
+
+
+def test_affected_packages_of_a_changed_leaf(tmp_path: Path) -> None:
+    """A changed package affects itself and every package depending on it."""
+    registry = SyntheticRegistry(tmp_path, vendors=2, packages=3, docs=0).generate()
+    entries = _load_entries(
+        packages=_get_packages(registry.packages_dir),
+        workers=1,
+        cache=PackageConfigCache(file=None),
+    )
+    author, name = registry.package_ids("protocol")[0]
+    changed = f"protocol/{author}/{name}"
+
+    # a package is affected if it changed or one of its dependencies is affected
+    expected: Set[str] = {changed}
+    while True:
+        dependents = {
+            entry["package_id"].rsplit("/", 1)[0]
+            for entry in entries
+            if any(
+                dependency.rsplit("/", 1)[0] in expected
+                for dependency in entry["package_dependencies"]
+            )
+        }
+        if dependents <= expected:
+            break
+        expected |= dependents
+
+    affected = get_affected_packages(entries, {f"{author}/protocols/{name}"})
+    assert affected == expected
+    assert len(affected) > 1
+    assert f"protocol/{author}/{registry.package_ids('protocol')[1][1]}" not in affected
+    assert get_affected_packages(entries, set()) == set()
+
+
+def test_conflicts_name_the_requiring_packages() -> None:
+    """Conflicts list the packages requiring each specifier, unpinned ones never conflict."""
+    index = DependencyIndex()
+    index.add("protocol/a/p/0.1.0", {"requests": Dependency("requests", "==2.0.0")})
+    index.add("skill/b/s/0.1.0", {"requests": Dependency("requests", "==3.0.0")})
+    index.add("skill/a/s/0.1.0", {"requests": Dependency("requests", "==2.0.0")})
+    index.add("agent/a/g/0.1.0", {"requests": Dependency("requests")})
+    index.add("agent/b/g/0.1.0", {"toml": Dependency("toml", "==0.10.2")})
+    index.add("skill/c/s/0.1.0", {"toml": Dependency("toml")})
+
+    assert index.conflicts() == {
+        "requests": {
+            "requests==2.0.0": ["protocol/a/p/0.1.0", "skill/a/s/0.1.0"],
+            "requests==3.0.0": ["skill/b/s/0.1.0"],
+        }
+    }
+    assert [str(dependency) for dependency in index.dependencies()] == [
+        str(Dependency("requests", "==2.0.0")),
+        str(Dependency("toml", "==0.10.2")),
+    ]
+
+
+def test_warnings_do_not_hide_errors(tmp_path: Path) -> None:
+    """A dependency missing from tox.ini fails the check, whatever comes after it."""
+    registry = SyntheticRegistry(tmp_path, vendors=1, packages=1).generate()
+    lock_file = tmp_path / "poetry.lock"
+    lock_file.write_text(
+        '[[package]]\nname = "requests"\nversion = "2.28.1"\n', encoding="utf-8"
+    )
+
+    report = Report(check="dependencies")
+    with pytest.raises(SystemExit) as exit_info:
+        _check(
+            packages_dependencies=[Dependency("newlib", "==1.0")],
+            tox=ToxFile.load(registry.root / "tox.ini"),
+            report=report,
+            lock=PoetryLock.load(lock_file),
+        )
+    assert exit_info.value.code == 1
+    assert [(finding.level, finding.message) for finding in report.findings] == [
+        (logging.ERROR, "newlib not found in tox.ini"),
+        (logging.WARNING, "newlib not found in poetry.lock"),
+    ]
+
+
+def test_watched_dependencies_drop_deleted_configs(tmp_path: Path) -> None:
+    """A deleted package config or tox.ini is dropped rather than failing the reload."""
+    registry = SyntheticRegistry(tmp_path, vendors=1, packages=2, docs=0).generate()
+    dependencies = WatchedDependencies(
+        packages_dir=registry.packages_dir,
+        paths=ConfigPaths.at(registry.root),
+        cache=PackageConfigCache(file=None),
+    )
+    assert dependencies.check() in (0, logging.WARNING)
+    author, name = registry.package_ids("agent")[0]
+    config_file = registry.packages_dir / author / "agents" / name / "aea-config.yaml"
+    assert config_file in dependencies.entries
+
+    config_file.unlink()
+    dependencies.update({config_file})
+    assert config_file not in dependencies.entries
+    assert config_file not in dependencies.files
+    assert f"agent/{author}/{name}/0.1.0" not in {
+        package_id
+        for requirements in dependencies.index().requirements.values()
+        for package_id, _ in requirements
+    }
+
+    (registry.root / "tox.ini").unlink()
+    dependencies.update({registry.root / "tox.ini"})
+    with pytest.raises(ValueError, match="tox.ini not found"):
+        dependencies.check()
+
+
+def test_repositories_are_checked_separately(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    """Each repository is checked against its own configs, one failing fails the check."""
+    good = SyntheticRegistry(tmp_path / "good", vendors=1, packages=1, docs=0)
+    bad = SyntheticRegistry(tmp_path / "bad", vendors=1, packages=1, docs=0)
+    good.generate()
+    bad.generate()
+    author, name = bad.package_ids("protocol")[0]
+    config_file = bad.packages_dir / author / "protocols" / name / "protocol.yaml"
+    config = yaml.safe_load(config_file.read_text(encoding="utf-8"))
+    config["dependencies"]["newlib"] = {"version": "==1.0"}
+    with config_file.open("w", encoding="utf-8") as stream:
+        yaml_dump(config, stream)
+    manifest = tmp_path / "repos.txt"
+    manifest.write_text("# the repositories\nbad\n", encoding="utf-8")
+
+    with pytest.raises(SystemExit) as exit_info:
+        main.main(
+            [
+                "--check",
+                "--no-cache",
+                "--repo",
+                str(good.root),
+                "--manifest",
+                str(manifest),
+            ],
+            standalone_mode=False,
+        )
+    assert exit_info.value.code == 1
+    output = capsys.readouterr().out
+    assert f"- {good.root}: no issues found" in output
+    assert f"- {bad.root}: dependencies check failed" in output
+
+    with pytest.raises(click.UsageError, match="can not be used with `--repo`"):
+        main.main(
+            ["--check", "--repo", str(good.root), "--tox", str(bad.root / "tox.ini")],
+            standalone_mode=False,
+        )
+
+
+def test_locked_versions_must_satisfy_the_pins(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    """A pin that poetry.lock does not satisfy is an error, wherever it is in the file."""
+    registry = SyntheticRegistry(tmp_path, vendors=1, packages=1, docs=0).generate()
+    lock_file = registry.root / "poetry.lock"
+    lock_file.write_text(
+        '[[package]]\nname = "toml"\nversion = "0.10.2"\n\n'
+        '[package.dependencies]\nsix = "*"\n\n'
+        '[[package]]\nname = "Requests"\nversion = "2.31.0"\n',
+        encoding="utf-8",
+    )
+    lock = PoetryLock.load(lock_file)
+    assert lock.check(Dependency("toml", "==0.10.2")) == (None, 0)
+    assert lock.check(Dependency("requests", ">=2.28")) == (None, 0)
+    assert lock.check(Dependency("requests", "==2.28.1")) == (
+        "in poetry.lock Requests==2.31.0; got requests==2.28.1",
+        logging.ERROR,
+    )
+    assert lock.line("requests") == 8
+
+    monkeypatch.chdir(registry.root)
+    with pytest.raises(SystemExit) as exit_info:
+        main.main(["--check", "--no-cache"], standalone_mode=False)
+    assert exit_info.value.code == 1
+    assert {
+        record.getMessage()
+        for record in caplog.records
+        if record.levelno == logging.ERROR
+    } == {"in poetry.lock Requests==2.31.0; got requests==2.28.1"}
@@ -0,0 +1,471 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests for the doc IPFS hashes check."""
+
+import json
+import os
+import re
+import stat
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import pytest
+from aea.helpers.base import IPFS_HASH_REGEX, SIMPLE_ID_REGEX
+
+from scripts import check_doc_ipfs_hashes
+from scripts.check_doc_ipfs_hashes import (
+    AEA_COMMAND_REGEX,
+    DocScan,
+    PackageHashManager,
+    find_commands,
+    find_package_references,
+    read_version,
+    scan_files,
+    write_edits,
+    write_file,
+)
+from scripts.report import Report
+
+from tests.synthetic_registry import GitRegistry, SyntheticRegistry, make_hash
+
+
+HASH = make_hash("find_commands")
+
+CONTENTS = [
+    "",
+    f"{HASH}",
+    f"autonomy fetch valory/agent:0.1.0:{HASH} --local",
+    f"autonomy fetch valory/agent:0.1.0:{HASH}\n--alias agent\nnext line",
+    f"autonomy fetch valory/agent:0.1.0:{HASH}\n--alias agent",
+    f"text {HASH}\naea add skill valory/skill:0.1.0:{HASH}",
+    f"aea add skill valory/skill:0.1.0:{HASH} and aea add skill valory/other:0.2.0:{HASH}",
+    f"plain valory/skill:0.1.0:{HASH}\n    autonomy deploy build {HASH}",
+    f"```bash\nautonomy   fetch --remote  valory/agent:1.0.0:{HASH}\n```\n",
+]
+
+
+@pytest.mark.parametrize("content", CONTENTS)
+def test_find_commands_matches_full_scan(content: str) -> None:
+    """The prefiltered scan finds the same commands as the full regex scan."""
+    assert [m.groupdict() for m in find_commands(content)] == [
+        m.groupdict() for m in re.finditer(AEA_COMMAND_REGEX, content)
+    ]
+
+
+def test_find_commands_on_generated_docs(tmp_path: Path) -> None:
+    """The prefiltered scan agrees with the full scan on generated docs."""
+    registry = SyntheticRegistry(
+        tmp_path, vendors=2, packages=2, docs=3, mismatches=2
+    ).generate()
+    for doc in registry.docs_dir.glob("*.md"):
+        content = doc.read_text(encoding="utf-8")
+        expected = [
+            (m.span(), m.groupdict()) for m in re.finditer(AEA_COMMAND_REGEX, content)
+        ]
+        assert expected
+        assert [(m.span(), m.groupdict()) for m in find_commands(content)] == expected
+
+
+def test_parallel_scan_matches_serial_scan(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Scanning the docs in several processes gives the same results, in order."""
+    registry = SyntheticRegistry(
+        tmp_path, vendors=2, packages=2, docs=6, mismatches=4
+    ).generate()
+    monkeypatch.chdir(registry.root)
+    monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", registry.root)
+    package_manager = PackageHashManager()
+    md_files = sorted(registry.docs_dir.glob("*.md"))
+
+    def results(workers: int) -> list:
+        return [
+            (
+                scan.file,
+                scan.references.count,
+                scan.output,
+                scan.fixes.content,
+                [finding.to_json() for finding in scan.findings],
+            )
+            for scan in scan_files(
+                files=md_files,
+                package_manager=package_manager,
+                fix=True,
+                workers=workers,
+            )
+        ]
+
+    serial = results(workers=1)
+    assert [file for file, *_ in serial] == md_files
+    assert sum(len(findings) for *_, findings in serial) == 4
+    assert results(workers=2) == serial
+
+
+def test_write_file_replaces_file_atomically(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The file is either fully rewritten or left untouched."""
+    doc = tmp_path / "doc.md"
+    doc.write_text("old", encoding="utf-8")
+    doc.chmod(0o644)
+
+    write_file(str(doc), "new")
+    assert doc.read_text(encoding="utf-8") == "new"
+    assert stat.S_IMODE(doc.stat().st_mode) == 0o644
+    assert [file.name for file in tmp_path.iterdir()] == ["doc.md"]
+
+    def interrupt(*args: object) -> None:
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(check_doc_ipfs_hashes.os, "replace", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        write_file(str(doc), "newer")
+    assert doc.read_text(encoding="utf-8") == "new"
+    assert [file.name for file in tmp_path.iterdir()] == ["doc.md"]
+
+
+@pytest.mark.skipif(
+    not Path("/proc/self/fd").is_dir(), reason="open files are listed from /proc"
+)
+def test_write_edits_closes_the_file_before_replacing_it(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The edited file and its map are closed when it is replaced, as Windows requires."""
+    doc = tmp_path / "doc.md"
+    doc.write_bytes(b"0123456789" * 100)
+    replace = os.replace
+    open_at_replace: List[str] = []
+
+    def check_closed(src: str, dst: str) -> None:
+        for fd in os.listdir("/proc/self/fd"):
+            try:
+                open_at_replace.append(os.readlink(f"/proc/self/fd/{fd}"))
+            except OSError:  # the descriptor of the listing itself
+                continue
+        replace(src, dst)
+
+    monkeypatch.setattr(check_doc_ipfs_hashes.os, "replace", check_closed)
+    write_edits(str(doc), [(10, 20, "edit"), (0, 1, "x")])
+    assert doc.read_bytes() == b"x123456789edit" + b"0123456789" * 98
+    assert str(doc) not in open_at_replace
+
+
+def test_doc_cache_only_rescans_affected_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Only the docs that changed or reference a changed package are rescanned."""
+    registry = SyntheticRegistry(
+        tmp_path / "registry", vendors=2, packages=2, docs=6
+    ).generate()
+    monkeypatch.chdir(registry.root)
+    monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", registry.root)
+    monkeypatch.setattr(check_doc_ipfs_hashes, "DOC_CACHE_FILE", tmp_path / "docs")
+    monkeypatch.setattr(check_doc_ipfs_hashes, "HASH_HISTORY_FILE", tmp_path / "hashes")
+
+    scanned: List[str] = []
+    scan_doc = check_doc_ipfs_hashes.scan_doc
+
+    def scan(md_file: Path, *args: object, **kwargs: object) -> DocScan:
+        scanned.append(md_file.name)
+        return scan_doc(md_file, *args, **kwargs)  # type: ignore
+
+    monkeypatch.setattr(check_doc_ipfs_hashes, "scan_doc", scan)
+
+    def check() -> List[str]:
+        scanned.clear()
+        report = Report(check="doc-ipfs-hashes")
+        try:
+            check_doc_ipfs_hashes.check_ipfs_hashes(
+                paths=[registry.docs_dir], report=report
+            )
+        except SystemExit:
+            pass
+        return [finding.message for finding in report.findings]
+
+    docs = sorted(registry.docs_dir.glob("*.md"))
+    assert check() == []
+    assert scanned == [doc.name for doc in docs]
+    assert check() == []
+    assert scanned == []
+
+    # touched but unchanged files are not rescanned
+    os.utime(docs[0], ns=(0, 0))
+    docs[1].write_text(docs[1].read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    assert check() == []
+    assert scanned == [docs[1].name]
+
+    # a new hash only rescans the docs referencing the package, and the
+    # mismatches found are reported again on the next run
+    packages_file = registry.packages_dir / "packages.json"
+    packages = json.loads(packages_file.read_text(encoding="utf-8"))
+    package_id = next(
+        package_id for package_id in packages["dev"] if package_id.startswith("skill/")
+    )
+    packages["dev"][package_id] = make_hash("new skill hash")
+    packages_file.write_text(json.dumps(packages, indent=4), encoding="utf-8")
+    _, vendor, name, _ = package_id.split("/")
+    referencing = [
+        doc.name for doc in docs if f"{vendor}/{name}:" in doc.read_text("utf-8")
+    ]
+    assert referencing
+    findings = check()
+    assert scanned == referencing
+    assert len(findings) == len(referencing)
+    assert check() == findings
+    assert scanned == []
+
+
+@pytest.mark.parametrize(
+    "content,version",
+    [
+        ("name: a\nversion: 0.1.0\n", "0.1.0"),
+        (
+            "dependencies:\n  a:\n    version: ==1.0\n  b: {version: '2'}\n"
+            "protocols:\n- version\nversion: 0.2.0\n---\nversion: 9.9.9\n",
+            "0.2.0",
+        ),
+        ("public_id: a\n---\nversion: 0.3.0\n", "0.3.0"),
+        ("name: a\n", None),
+    ],
+)
+def test_read_version(tmp_path: Path, content: str, version: str) -> None:
+    """The version is read from the first document defining one."""
+    yaml_file = tmp_path / "skill.yaml"
+    yaml_file.write_text(content, encoding="utf-8")
+    assert read_version(yaml_file) == version
+
+
+def test_package_versions_are_read_on_first_access(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Building the package index does not read the package configurations."""
+    registry = SyntheticRegistry(tmp_path, vendors=1, packages=1).generate()
+    monkeypatch.chdir(registry.root)
+    monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", registry.root)
+    read: List[Path] = []
+
+    def read_version_(yaml_file: Path) -> Optional[str]:
+        read.append(yaml_file)
+        return read_version(yaml_file)
+
+    monkeypatch.setattr(check_doc_ipfs_hashes, "read_version", read_version_)
+    package = PackageHashManager().packages[0]
+    assert read == []
+    assert package.last_version == "0.1.0"
+    assert package.last_version == "0.1.0"
+    assert read == [package.yaml_file]
+
+
+def test_python_string_literals_are_checked_and_fixed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Stale package ids in string literals are fixed, comments are left alone."""
+    registry = SyntheticRegistry(tmp_path, vendors=1, packages=1, docs=0).generate()
+    monkeypatch.chdir(registry.root)
+    monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", registry.root)
+    package_id = next(p for p in registry.hashes if p.startswith("skill/"))
+    _, vendor, name, version = package_id.split("/")
+    current = f"{vendor}/{name}:{version}:{registry.hashes[package_id]}"
+    stale = f"{vendor}/{name}:{version}:{make_hash('stale')}"
+    source = (
+        f'CURRENT = "{current}"\n'
+        f"# the previous id was {stale}\n"
+        f"STALE = ('{stale}', {stale!r})\n"
+        f'DOC = """\nUses\n    {stale}\n"""\n'
+    )
+    py_file = registry.packages_dir / vendor / "skills" / name / "behaviours.py"
+    py_file.write_text(source, encoding="utf-8")
+    assert [m.group("full_package") for _, m in find_package_references(source)] == [
+        current,
+        stale,
+        stale,
+        stale,
+    ]
+
+    report = Report(check="doc-ipfs-hashes")
+    with pytest.raises(SystemExit):
+        check_doc_ipfs_hashes.check_ipfs_hashes(
+            paths=[registry.docs_dir], no_cache=True, report=report
+        )
+    relative = py_file.relative_to(registry.root)
+    assert [(finding.file, finding.line) for finding in report.findings] == [
+        (relative, 3),
+        (relative, 3),
+        (relative, 6),
+    ]
+
+    check_doc_ipfs_hashes.check_ipfs_hashes(
+        paths=[registry.docs_dir], fix=True, no_cache=True
+    )
+    assert py_file.read_text(encoding="utf-8") == source.replace(
+        f"'{stale}'", f"'{current}'"
+    ).replace(f'"{stale}"', f'"{current}"').replace(
+        f"    {stale}\n", f"    {current}\n"
+    )
+
+
+def test_python_strings_without_package_ids_are_ignored(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Bare CIDs and hex strings containing a CID-like run are not package ids."""
+    registry = SyntheticRegistry(tmp_path, vendors=1, packages=1, docs=0).generate()
+    monkeypatch.chdir(registry.root)
+    monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", registry.root)
+    package_id = next(p for p in registry.hashes if p.startswith("skill/"))
+    _, vendor, name, version = package_id.split("/")
+    tx_hash = "0x5fbad2b8b7a5" + make_hash("tx")[:57].replace("bafybei", "ba5") + "ff"
+    source = (
+        f'TX_HASH = "{tx_hash}"\n'
+        f'CID = "{make_hash("bare")}"\n'
+        f'URL = "https://gateway/{make_hash("url")}/file"\n'
+        f'SUFFIXED = "{vendor}/{name}:{version}:{make_hash("stale")}0"\n'
+    )
+    assert re.search(check_doc_ipfs_hashes.IPFS_HASH_REGEX, tx_hash)
+    assert list(find_package_references(source)) == []
+
+    (registry.root / "scripts").mkdir()
+    (registry.root / "scripts" / "consts.py").write_text(source, encoding="utf-8")
+    report = Report(check="doc-ipfs-hashes")
+    check_doc_ipfs_hashes.check_ipfs_hashes(
+        paths=[registry.docs_dir], no_cache=True, report=report
+    )
+    assert report.findings == []
+
+
+def _check_docs(registry: SyntheticRegistry, fix: bool = False) -> List[dict]:
+    """Check the docs of a registry, returning the findings."""
+    report = Report(check="doc-ipfs-hashes")
+    try:
+        check_doc_ipfs_hashes.check_ipfs_hashes(
+            paths=[registry.docs_dir], fix=fix, no_cache=True, report=report
+        )
+    except SystemExit:
+        pass
+    return [finding.to_json() for finding in report.findings]
+
+
+def test_memory_mapped_docs_match_read_docs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Memory-mapped docs give the same findings and fixes as read ones."""
+    results = []
+    for threshold in (check_doc_ipfs_hashes.MMAP_THRESHOLD, 1):
+        registry = SyntheticRegistry(
+            tmp_path / str(threshold), vendors=2, packages=2, docs=4, mismatches=5
+        ).generate()
+        for doc in registry.docs_dir.glob("*.md"):
+            content = doc.read_text(encoding="utf-8")
+            doc.write_text(f"Ünïcode ✓\n{content}", encoding="utf-8")
+        monkeypatch.chdir(registry.root)
+        monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", registry.root)
+        monkeypatch.setattr(check_doc_ipfs_hashes, "MMAP_THRESHOLD", threshold)
+        monkeypatch.setattr(check_doc_ipfs_hashes, "MMAP_CHUNK_SIZE", 7)
+        findings = _check_docs(registry)
+        _check_docs(registry, fix=True)
+        results.append(
+            (
+                [
+                    {**finding, "file": Path(finding["file"]).name}
+                    for finding in findings
+                ],
+                {
+                    doc.name: doc.read_text(encoding="utf-8")
+                    for doc in registry.docs_dir.glob("*.md")
+                },
+                _check_docs(registry),
+            )
+        )
+    assert len(results[0][0]) == 5
+    assert results[0][2] == []
+    assert results[1] == results[0]
+
+
+def test_large_docs_are_scanned_in_constant_memory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Scanning and fixing a large doc does not load it in memory."""
+    registry = SyntheticRegistry(
+        tmp_path, vendors=1, packages=1, docs=1, mismatches=1
+    ).generate()
+    monkeypatch.chdir(registry.root)
+    monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", registry.root)
+    doc = next(registry.docs_dir.glob("*.md"))
+    content = doc.read_text(encoding="utf-8")
+    filler = "Some generated reference text.\n" * 2**16
+    with doc.open("w", encoding="utf-8") as stream:
+        for _ in range(8):
+            stream.write(filler)
+        stream.write(content)
+    size = doc.stat().st_size
+    assert size > 8 * check_doc_ipfs_hashes.MMAP_THRESHOLD
+
+    tracemalloc.start()
+    try:
+        findings = _check_docs(registry)
+        _check_docs(registry, fix=True)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(findings) == 1
+    assert (
+        findings[0]["line"]
+        == 8 * 2**16
+        + 1
+        + content[: content.index("```bash\nautonomy")].count("\n")
+        + 1
+    )
+    assert _check_docs(registry) == []
+    assert doc.stat().st_size == size
+    assert peak < 4 * 2**20
+
+
+def test_regexes_match_aea() -> None:
+    """The local copies of the `aea` regexes are up to date."""
+    assert check_doc_ipfs_hashes.IPFS_HASH_REGEX == IPFS_HASH_REGEX
+    assert check_doc_ipfs_hashes.SIMPLE_ID_REGEX == SIMPLE_ID_REGEX
+
+
+def test_staged_docs_are_checked_from_the_index(
+    git_registry: Callable[..., GitRegistry]
+) -> None:
+    """The staged content of the docs is checked, not the working tree."""
+    registry = git_registry(vendors=1, packages=1, docs=1)
+    doc = sorted(registry.docs_dir.glob("*.md"))[0]
+    fixed = doc.read_text(encoding="utf-8")
+
+    # a stale hash is staged, while the working tree has the current one
+    package_id = next(p for p in registry.hashes if p.startswith("skill/"))
+    _, vendor, name, version = package_id.split("/")
+    stale = f"autonomy fetch {vendor}/{name}:{version}:{make_hash('staged')}"
+    doc.write_text(fixed + f"\n```bash\n{stale}\n```\n", encoding="utf-8")
+    registry.git("add", str(doc))
+    doc.write_text(fixed, encoding="utf-8")
+    report = Report(check="doc-ipfs-hashes")
+    with pytest.raises(SystemExit):
+        check_doc_ipfs_hashes.check_staged_hashes(paths=[Path("docs")], report=report)
+    assert [(finding.file, finding.actual) for finding in report.findings] == [
+        (doc.relative_to(registry.root), make_hash("staged"))
+    ]
+
+    # the reverse, a current hash staged and a stale one in the working tree
+    registry.git("add", str(doc))
+    doc.write_text(fixed + f"\n```bash\n{stale}\n```\n", encoding="utf-8")
+    check_doc_ipfs_hashes.check_staged_hashes(paths=[Path("docs")])
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests for the round-trip editing of the dependency configs."""
+
+import difflib
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+from aea.configurations.data_types import Dependency
+
+from scripts.check_dependencies import Pipfile, PyProjectToml, ToxFile
+from scripts.config_tokenizer import (
+    ConfigDocument,
+    PIPFILE_FORMAT,
+    PYPROJECT_FORMAT,
+    TOX_FORMAT,
+)
+
+
+PIPFILE = """\
+[[source]]
+url = "https://pypi.org/simple"
+verify_ssl = true
+name = "pypi"
+
+# runtime dependencies
+[packages]
+requests = "==2.28.1"  # pinned for the ledger plugins
+toml = "==0.10.2"
+
+[dev-packages]
+# tools
+pytest = "==7.2.1"
+open-aea-ledger-ethereum = "==1.48.0"
+
+[requires]
+python_version = "3.10"
+"""
+
+TOX_INI = """\
+[tox]
+envlist = py3
+
+[deps-packages]
+deps =
+    {[deps-tests]deps}
+    # the ledger plugins
+    requests==2.28.1
+    toml==0.10.2
+    open-aea-ledger-ethereum==1.48.0
+
+[testenv]
+deps = {[deps-packages]deps}
+commands = pytest
+"""
+
+PYPROJECT_TOML = """\
+[build-system]
+requires = ["poetry-core"]
+
+[tool.poetry]
+name = "package"
+version = "0.1.0"
+
+# runtime dependencies
+[tool.poetry.dependencies]
+python = ">=3.8,<4.0"
+requests = "==2.28.1"
+toml = "==0.10.2"
+
+[tool.poetry.group.dev.dependencies]
+pytest = "==7.2.1"
+"""
+
+CONFIGS = [
+    ("Pipfile", PIPFILE, PIPFILE_FORMAT, Pipfile.load, Pipfile.dump),
+    ("tox.ini", TOX_INI, TOX_FORMAT, ToxFile.load, ToxFile.write),
+    (
+        "pyproject.toml",
+        PYPROJECT_TOML,
+        PYPROJECT_FORMAT,
+        PyProjectToml.load,
+        PyProjectToml.dump,
+    ),
+]
+
+
+def _changed_lines(before: str, after: str) -> List[str]:
+    """Get the lines removed and added between two contents."""
+    return [
+        line
+        for line in difflib.unified_diff(
+            before.splitlines(), after.splitlines(), lineterm="", n=0
+        )
+        if line[:1] in "+-" and line[:3] not in ("---", "+++")
+    ]
+
+
+@pytest.mark.parametrize("file_name,content,file_format,load,dump", CONFIGS)
+def test_unchanged_configs_are_written_back_as_is(  # pylint: disable=too-many-arguments
+    tmp_path: Path,
+    file_name: str,
+    content: str,
+    file_format: str,
+    load: Callable,
+    dump: Callable,
+) -> None:
+    """Parsing a config and writing it back gives the same bytes."""
+    document = ConfigDocument.parse(content=content, file_format=file_format)
+    assert document.patch(replacements=[]) == content
+
+    file = tmp_path / file_name
+    file.write_bytes(content.encode("utf-8"))
+    dump(load(file))
+    assert file.read_bytes() == content.encode("utf-8")
+
+
+@pytest.mark.parametrize("file_name,content,file_format,load,dump", CONFIGS)
+def test_an_edit_only_changes_its_line(  # pylint: disable=too-many-arguments
+    tmp_path: Path,
+    file_name: str,
+    content: str,
+    file_format: str,  # pylint: disable=unused-argument
+    load: Callable,
+    dump: Callable,
+) -> None:
+    """Updating a dependency rewrites its entry and nothing else."""
+    file = tmp_path / file_name
+    file.write_text(content, encoding="utf-8")
+    config = load(file)
+    config.update(Dependency("requests", "==2.31.0"))
+    dump(config)
+
+    changed = _changed_lines(content, file.read_text(encoding="utf-8"))
+    assert len(changed) == 2
+    assert changed[0].startswith("-") and "requests" in changed[0]
+    assert changed[1].startswith("+") and "2.31.0" in changed[1]
+    # comments on the same line are kept
+    if file_name == "Pipfile":
+        assert changed[1].endswith("  # pinned for the ledger plugins")
+
+
+def test_pipfile_comments_are_kept(tmp_path: Path) -> None:
+    """Comments and other sections of a Pipfile survive an update with a new entry."""
+    file = tmp_path / "Pipfile"
+    file.write_text(PIPFILE, encoding="utf-8")
+    pipfile = Pipfile.load(file)
+    pipfile.update(Dependency("toml", "==0.10.3"))
+    pipfile.update(Dependency("web3", "==6.1.0"))
+    pipfile.dump()
+
+    content = file.read_text(encoding="utf-8")
+    for line in PIPFILE.splitlines():
+        if line.startswith("#") or "# pinned" in line or line.startswith("[requires"):
+            assert line in content.splitlines()
+    assert _changed_lines(PIPFILE, content) == [
+        '-toml = "==0.10.2"',
+        '+toml = "==0.10.3"',
+        '+web3 = "==6.1.0"',
+    ]
+
+
+def test_tox_entries_with_extras_and_local_versions(tmp_path: Path) -> None:
+    """An entry with extras and a local version is rewritten in place."""
+    file = tmp_path / "tox.ini"
+    file.write_text(
+        TOX_INI.replace("    toml==0.10.2\n", "    package[extra]==1.0+local\n"),
+        encoding="utf-8",
+    )
+    before = file.read_text(encoding="utf-8")
+    tox = ToxFile.load(file)
+    assert tox.get("package") == Dependency("package", "==1.0+local", extras=["extra"])
+
+    tox.update(Dependency("package", "==1.1+local", extras=["extra"]))
+    tox.write()
+    assert _changed_lines(before, file.read_text(encoding="utf-8")) == [
+        "-    package[extra]==1.0+local",
+        "+    package[extra]==1.1+local",
+    ]
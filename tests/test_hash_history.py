@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests for the historical hash index."""
+
+import subprocess  # nosec
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from scripts import check_doc_ipfs_hashes, hash_history
+from scripts.hash_history import HashHistory
+from scripts.report import Report
+
+from tests.synthetic_registry import GitRegistry, make_hash
+
+
+@pytest.fixture
+def registry(git_registry: Callable[..., GitRegistry]) -> GitRegistry:
+    """A synthetic registry in a git repository."""
+    return git_registry(vendors=1, packages=1, docs=0)
+
+
+def test_history_is_updated_incrementally(
+    registry: GitRegistry, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Only the commits made since the last update are read."""
+    package_id = next(p for p in registry.hashes if p.startswith("skill/"))
+    original = registry.hashes[package_id]
+    index_file = tmp_path / "index"
+    history = HashHistory(file=index_file)
+    history.update()
+    history.dump()
+    assert history.hashes == {h: p for p, h in registry.hashes.items()}
+
+    published = registry.publish(package_id, "second")
+    ranges: List[str] = []
+    git = hash_history._git  # pylint: disable=protected-access
+
+    def record(root: Path, *args: str) -> subprocess.CompletedProcess:
+        if args[0] == "log":
+            ranges.append(args[-3])
+        return git(root, *args)
+
+    monkeypatch.setattr(hash_history, "_git", record)
+    history = HashHistory(file=index_file)
+    history.update()
+    history.update()
+    assert len(ranges) == 1 and ".." in ranges[0]
+    assert history.get(original) == history.get(published) == package_id
+
+
+def test_stale_hashes_are_described_and_fixed(
+    registry: GitRegistry, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Commands using an outdated hash only are fixed from the history."""
+    monkeypatch.setattr(check_doc_ipfs_hashes, "DOC_CACHE_FILE", tmp_path / ".doccache")
+    monkeypatch.setattr(
+        check_doc_ipfs_hashes, "HASH_HISTORY_FILE", tmp_path / ".hashhistory"
+    )
+    package_id = next(p for p in registry.hashes if p.startswith("agent/"))
+    _, vendor, name, version = package_id.split("/")
+    original = registry.hashes[package_id]
+    current = registry.publish(package_id, "current")
+    unknown = make_hash("unknown")
+    doc = registry.docs_dir / "guide.md"
+    doc.write_text(
+        f"autonomy fetch {original} --alias agent\nautonomy fetch {unknown}\n",
+        encoding="utf-8",
+    )
+
+    report = Report(check="doc-ipfs-hashes")
+    with pytest.raises(SystemExit):
+        check_doc_ipfs_hashes.check_ipfs_hashes(
+            paths=[registry.docs_dir], report=report
+        )
+    assert [finding.message for finding in report.findings] == [
+        f"IPFS hash mismatch in 'autonomy fetch {original} --alias agent': "
+        f"stale hash for {vendor}/{name}:{version}, current is {current}",
+        f"Could not resolve the package of 'autonomy fetch {unknown}'",
+    ]
+
+    with pytest.raises(ValueError):
+        check_doc_ipfs_hashes.check_ipfs_hashes(paths=[registry.docs_dir], fix=True)
+    assert doc.read_text(encoding="utf-8") == (
+        f"autonomy fetch {current} --alias agent\nautonomy fetch {unknown}\n"
+    )
+
+
+@pytest.mark.parametrize("no_cache", [True, False])
+def test_history_is_only_read_for_unknown_hashes(
+    registry: GitRegistry,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    no_cache: bool,
+) -> None:
+    """The git history is not read without the cache or when all hashes are current."""
+    monkeypatch.setattr(check_doc_ipfs_hashes, "DOC_CACHE_FILE", tmp_path / ".doccache")
+    monkeypatch.setattr(
+        check_doc_ipfs_hashes, "HASH_HISTORY_FILE", tmp_path / ".hashhistory"
+    )
+    package_id = next(p for p in registry.hashes if p.startswith("agent/"))
+    original = registry.hashes[package_id]
+    doc = registry.docs_dir / "guide.md"
+    doc.write_text(f"autonomy fetch {original} --alias agent\n", encoding="utf-8")
+    commands: List[str] = []
+    git = hash_history._git  # pylint: disable=protected-access
+
+    def record(root: Path, *args: str) -> subprocess.CompletedProcess:
+        commands.append(args[0])
+        return git(root, *args)
+
+    monkeypatch.setattr(hash_history, "_git", record)
+    check_doc_ipfs_hashes.check_ipfs_hashes(
+        paths=[registry.docs_dir], no_cache=no_cache
+    )
+    assert commands == []
+
+    registry.publish(package_id, "current")
+    with pytest.raises(SystemExit):
+        check_doc_ipfs_hashes.check_ipfs_hashes(
+            paths=[registry.docs_dir], no_cache=no_cache
+        )
+    assert ("log" in commands) is not no_cache
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests for the JSON cache files."""
+
+from pathlib import Path
+
+import pytest
+
+from scripts.json_cache import dump_json_cache, load_json_cache
+
+
+def test_caches_of_another_format_are_ignored(tmp_path: Path) -> None:
+    """A cache is read back only with the format it was written with."""
+    file = tmp_path / "cache" / ".cache"
+    dump_json_cache(file, 2, {"entries": {"a": 1}})
+    assert load_json_cache(file, 2) == {"format": 2, "entries": {"a": 1}}
+    assert load_json_cache(file, 1) == {}
+
+    file.write_text("{", encoding="utf-8")
+    assert load_json_cache(file, 2) == {}
+    assert load_json_cache(None, 2) == {}
+
+
+def test_failed_writes_leave_no_files(tmp_path: Path) -> None:
+    """The temporary file is removed and the previous cache kept when writing fails."""
+    file = tmp_path / ".cache"
+    dump_json_cache(file, 1, {"entries": {}})
+    with pytest.raises(TypeError):
+        dump_json_cache(file, 1, {"entries": {"a": object()}})
+    assert list(tmp_path.iterdir()) == [file]
+    assert load_json_cache(file, 1) == {"format": 1, "entries": {}}
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests for the cache of parsed package configurations."""
+
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pytest
+from aea.exceptions import AEAValidationError
+
+from scripts import bump, package_cache
+from scripts.check_dependencies import load_packages_dependencies
+from scripts.package_cache import PackageConfigCache
+
+from tests.synthetic_registry import GitRegistry
+
+
+@pytest.fixture
+def registry(git_registry: Callable[..., GitRegistry]) -> GitRegistry:
+    """A synthetic registry."""
+    return git_registry(vendors=1, packages=1, docs=0)
+
+
+@pytest.fixture
+def parsed(monkeypatch: pytest.MonkeyPatch) -> List[Path]:
+    """The configuration files read from disk."""
+    files: List[Path] = []
+    read_config_file = package_cache.read_config_file
+
+    def record(config_file: Path) -> List[Dict[str, Any]]:
+        files.append(config_file.resolve())
+        return read_config_file(config_file)
+
+    monkeypatch.setattr(package_cache, "read_config_file", record)
+    monkeypatch.setattr(bump, "read_config_file", record)
+    return files
+
+
+def test_configs_are_read_again_when_they_change(
+    registry: GitRegistry, tmp_path: Path, parsed: List[Path]
+) -> None:
+    """Entries are reused until the content of their configuration changes."""
+    cache_file = tmp_path / ".configcache"
+    config_file = registry.config_file("skill", registry.vendors[0], "skill_0")
+    cache = PackageConfigCache(file=cache_file)
+    cache.get_or_parse(config_file)
+    cache.dump()
+    assert parsed == [config_file]
+
+    # a hit, also when only the modification time changed
+    os.utime(config_file, ns=(0, 0))
+    cache = PackageConfigCache(file=cache_file)
+    cache.get_or_parse(config_file)
+    assert parsed == [config_file]
+
+    # a miss after the content changed, once the digest is invalidated
+    registry.set_dependencies(config_file, {"requests": {"version": "==2.31.0"}})
+    cache.invalidate(config_file)
+    entry = cache.get_or_parse(config_file)
+    assert parsed == [config_file] * 2
+    assert entry["dependencies"] == {"requests": {"version": "==2.31.0"}}
+    assert PackageConfigCache(file=cache_file).get(config_file) is None
+
+
+def test_invalid_configs_are_not_cached(registry: GitRegistry, tmp_path: Path) -> None:
+    """Configurations failing the validation of `load_configuration` are not cached."""
+    config_file = registry.config_file("skill", registry.vendors[0], "skill_0")
+    config_file.write_text(
+        config_file.read_text(encoding="utf-8").replace(
+            "version: 0.1.0", "version: not a version"
+        ),
+        encoding="utf-8",
+    )
+    cache = PackageConfigCache(file=tmp_path / ".configcache")
+    with pytest.raises(AEAValidationError):
+        cache.get_or_parse(config_file)
+    assert cache.get(config_file) is None
+
+
+def test_bump_reads_each_config_once(
+    registry: GitRegistry, tmp_path: Path, parsed: List[Path]
+) -> None:
+    """Bumping reads a configuration at most once, and not at all when it is cached."""
+    config_file = registry.config_file("skill", registry.vendors[0], "skill_0")
+    registry.set_dependencies(config_file, {"requests": {"version": "==2.28.1"}})
+    cache = PackageConfigCache(file=tmp_path / ".configcache")
+    bump.bump_packages(dependencies={"requests": "==2.31.0"}, config_cache=cache)
+    assert parsed.count(config_file) == 1
+    assert "==2.31.0" in config_file.read_text(encoding="utf-8")
+    # the configurations read by bump are not validated, so they are not cached
+    assert cache.get(config_file) is None
+
+    load_packages_dependencies(packages_dir=registry.packages_dir, cache=cache)
+    parsed.clear()
+    bump.bump_packages(dependencies={"requests": "==2.31.0"}, config_cache=cache)
+    assert parsed == []
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests for the registry daemon."""
+
+import threading
+from pathlib import Path
+from typing import Callable, Generator, Tuple
+
+import pytest
+
+from scripts import check_doc_ipfs_hashes
+from scripts.package_cache import PackageConfigCache
+from scripts.registry_client import query
+
+from tests.synthetic_registry import GitRegistry, make_hash
+
+
+try:
+    from scripts.registry_daemon import (
+        RegistryServer,
+        RegistryState,
+        remove_stale_socket,
+    )
+except ImportError:  # pragma: nocover  # the daemon listens on a Unix domain socket
+    pytest.skip("Unix domain sockets are not available", allow_module_level=True)
+
+
+@pytest.fixture
+def daemon(
+    git_registry: Callable[..., GitRegistry],
+) -> Generator[Tuple[GitRegistry, RegistryState, Path], None, None]:
+    """A synthetic registry in a git repository, served on a socket."""
+    registry = git_registry(vendors=1, packages=2, docs=0)
+    state = RegistryState(
+        root=registry.root, cache=PackageConfigCache(file=None), history_file=None
+    )
+    path = registry.root / "registry.sock"
+    with RegistryServer(path, state) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield registry, state, path
+        server.shutdown()
+        thread.join()
+
+
+def test_queries_are_answered(daemon: Tuple[GitRegistry, RegistryState, Path]) -> None:
+    """Hashes are resolved and buffers checked against the served registry."""
+    registry, _, path = daemon
+    package_id = next(p for p in registry.hashes if p.startswith("skill/"))
+    _, vendor, name, version = package_id.split("/")
+    package_hash = registry.hashes[package_id]
+
+    assert query({"query": "resolve_hash", "hash": package_hash}, path=path) == {
+        "package_id": package_id,
+        "current": True,
+        "hash": package_hash,
+    }
+    assert (
+        query({"query": "resolve_hash", "hash": make_hash("unknown")}, path=path)
+        is None
+    )
+    assert (
+        query({"query": "expected_hash", "package": f"{vendor}/{name}"}, path=path)
+        == package_hash
+    )
+
+    stale = f"autonomy add skill {vendor}/{name}:{version}:{make_hash('stale')}"
+    findings = query(
+        {"query": "check", "file": "docs/guide.md", "content": f"```\n{stale}\n```\n"},
+        path=path,
+    )
+    assert [(f["file"], f["line"], f["expected"]) for f in findings] == [
+        ("docs/guide.md", 2, package_hash)
+    ]
+
+    with pytest.raises(ValueError, match="Unknown package"):
+        query({"query": "expected_hash", "package": f"{vendor}/missing"}, path=path)
+    with pytest.raises(ValueError, match="Unknown query"):
+        query({"query": "publish"}, path=path)
+    with pytest.raises(ValueError, match="already listening"):
+        remove_stale_socket(path)
+
+
+def test_packages_are_read_from_the_served_root(
+    git_registry: Callable[..., GitRegistry], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Package configs are located under the served root, not the scripts' root."""
+    registry = git_registry(vendors=1, packages=1, docs=0)
+    monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", registry.root / "other")
+    state = RegistryState(
+        root=registry.root, cache=PackageConfigCache(file=None), history_file=None
+    )
+    for package in state.package_manager.packages:
+        assert package.yaml_file is not None and package.yaml_file.is_file()
+        assert registry.root.resolve() in package.yaml_file.parents
+        assert package.last_version == "0.1.0"
+
+
+def test_changes_are_reloaded_incrementally(
+    daemon: Tuple[GitRegistry, RegistryState, Path]
+) -> None:
+    """Changed configurations and `packages.json` are reloaded in place."""
+    registry, state, path = daemon
+    configs = {
+        package_type: registry.config_file(package_type, author, name)
+        for package_type in ("protocol", "skill")
+        for author, name in registry.package_ids(package_type)[:1]
+    }
+    registry.set_dependencies(configs["protocol"], {"requests": {"version": "==2.0.0"}})
+    registry.set_dependencies(configs["skill"], {"requests": {"version": "==3.0.0"}})
+    assert query({"query": "conflicts", "dependency": "requests"}, path=path) == {}
+
+    state.update(set(configs.values()))
+    conflicts = query({"query": "conflicts", "dependency": "requests"}, path=path)
+    assert sorted(conflicts) == ["requests==2.0.0", "requests==3.0.0"]
+
+    package_id = next(p for p in registry.hashes if p.startswith("skill/"))
+    old_hash = registry.hashes[package_id]
+    registry.publish(package_id, "published")
+    state.update({state.dependencies.packages_json})
+    _, vendor, name, _ = package_id.split("/")
+    assert query(
+        {"query": "expected_hash", "package": f"{vendor}/{name}", "type": "skill"},
+        path=path,
+    ) == make_hash("published")
+    # the previous hash is in the git history, it resolves to the current one
+    assert query({"query": "resolve_hash", "hash": old_hash}, path=path) == {
+        "package_id": package_id,
+        "current": False,
+        "hash": make_hash("published"),
+    }
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests for the outdated hash rewrite."""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from scripts import check_doc_ipfs_hashes
+from scripts.report import Report
+from scripts.rewrite_hashes import load_hash_map, rewrite_hashes
+
+from tests.synthetic_registry import SyntheticRegistry, make_hash
+
+
+def test_load_hash_map_follows_chains(tmp_path: Path) -> None:
+    """Hashes updated several times map to the last hash."""
+    first, second, third, other = (make_hash(str(i)) for i in range(4))
+    hash_map = tmp_path / "hashes.json"
+    hash_map.write_text(
+        json.dumps({first: second, second: third, other: other}), encoding="utf-8"
+    )
+    assert load_hash_map(hash_map) == {first: third, second: third}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_exported_hash_map_rewrites_other_trees(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, workers: int
+) -> None:
+    """The outdated hashes found in the docs are replaced in any file."""
+    registry = SyntheticRegistry(
+        tmp_path / "registry", vendors=2, packages=2, docs=4, mismatches=3
+    ).generate()
+    other = tmp_path / "other"
+    shutil.copytree(registry.docs_dir, other / "docs")
+    monkeypatch.chdir(registry.root)
+    monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", registry.root)
+    hash_map_file = tmp_path / "hashes.json"
+    with pytest.raises(SystemExit):
+        check_doc_ipfs_hashes.check_ipfs_hashes(
+            paths=[registry.docs_dir], no_cache=True, hash_map=hash_map_file
+        )
+    hash_map = load_hash_map(hash_map_file)
+    assert len(hash_map) == 3
+
+    old_hash, new_hash = sorted(hash_map.items())[0]
+    config = (
+        f"dependencies:\n  valory/skill:0.1.0:{old_hash}\n" f"not_a_hash: x{old_hash}\n"
+    )
+    (other / "aea-config.yaml").write_text(config, encoding="utf-8")
+    (other / "image.png").write_bytes(b"\0" + old_hash.encode())
+    (other / ".git").mkdir()
+    (other / ".git" / "config").write_text(old_hash, encoding="utf-8")
+
+    report = Report(check="rewrite-hashes")
+    assert (
+        rewrite_hashes(paths=[other], hash_map=hash_map, check=True, report=report) == 4
+    )
+    assert (str(report.findings[0].file), report.findings[0].line) == (
+        str(other / "aea-config.yaml"),
+        2,
+    )
+    assert rewrite_hashes(paths=[other], hash_map=hash_map, workers=workers) == 4
+    assert rewrite_hashes(paths=[other], hash_map=hash_map, check=True) == 0
+
+    assert (other / "aea-config.yaml").read_text(encoding="utf-8") == config.replace(
+        f":{old_hash}\n", f":{new_hash}\n"
+    )
+    assert (other / "image.png").read_bytes() == b"\0" + old_hash.encode()
+    assert (other / ".git" / "config").read_text(encoding="utf-8") == old_hash
+    monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", registry.root)
+    report = Report(check="doc-ipfs-hashes")
+    check_doc_ipfs_hashes.check_ipfs_hashes(
+        paths=[other / "docs"], no_cache=True, report=report
+    )
+    assert report.findings == []
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests for the synthetic registry generator."""
+
+from pathlib import Path
+
+import pytest
+
+from scripts import check_doc_ipfs_hashes
+from scripts.check_dependencies import ToxFile, _check, load_dependency_index
+from scripts.report import Report
+
+from tests.synthetic_registry import PYPI_DEPENDENCIES, SyntheticRegistry
+
+
+def test_generated_registry_is_deterministic(tmp_path: Path) -> None:
+    """The same parameters generate the same registry."""
+    first = SyntheticRegistry(tmp_path / "first", vendors=2, packages=2).generate()
+    second = SyntheticRegistry(tmp_path / "second", vendors=2, packages=2).generate()
+    assert first.hashes == second.hashes
+    assert len(first.hashes) == 2 * 2 * 5
+    for file in first.root.rglob("*.*"):
+        assert (
+            file.read_bytes()
+            == (second.root / file.relative_to(first.root)).read_bytes()
+        )
+
+
+def test_generated_registry_passes_dependency_check(tmp_path: Path) -> None:
+    """The generated packages and tox.ini agree on the dependencies."""
+    registry = SyntheticRegistry(tmp_path, vendors=2, packages=3).generate()
+    index = load_dependency_index(packages_dir=registry.packages_dir)
+    assert set(index.requirements) <= set(PYPI_DEPENDENCIES)
+    assert index.conflicts() == {}
+
+    report = Report(check="dependencies")
+    _check(
+        packages_dependencies=index.dependencies(),
+        tox=ToxFile.load(registry.root / "tox.ini"),
+        report=report,
+    )
+    assert report.findings == []
+
+
+@pytest.mark.parametrize("mismatches", [0, 3])
+def test_generated_docs_reference_package_hashes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mismatches: int
+) -> None:
+    """The generated docs reference the hashes in packages.json."""
+    registry = SyntheticRegistry(
+        tmp_path, vendors=2, packages=3, docs=4, mismatches=mismatches
+    ).generate()
+    monkeypatch.chdir(registry.root)
+    monkeypatch.setattr(check_doc_ipfs_hashes, "ROOT_DIR", registry.root)
+
+    report = Report(check="doc-ipfs-hashes")
+    if mismatches:
+        with pytest.raises(SystemExit):
+            check_doc_ipfs_hashes.check_ipfs_hashes(
+                paths=[registry.docs_dir], no_cache=True, report=report
+            )
+    else:
+        check_doc_ipfs_hashes.check_ipfs_hashes(
+            paths=[registry.docs_dir], no_cache=True, report=report
+        )
+    assert len(report.findings) == mismatches